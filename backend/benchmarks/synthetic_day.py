@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import argparse
+from contextlib import contextmanager
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Iterator
+import wave
+
+import numpy as np
+
+from office_recorder.audio import WHISPER_SAMPLE_RATE
+from office_recorder.config import AppConfig, load_config
+from office_recorder.metrics import (
+    CONVERSATION_BLOCKS,
+    LLM_PROMPT_CHARS,
+    LLM_RESPONSE_CHARS,
+    LLM_SECONDS,
+    TRANSCRIBE_SECONDS,
+    Histogram,
+)
+from office_recorder.storage import Storage
+from office_recorder.summarization import Summarizer, summarize_day
+from office_recorder.transcript_store import transcript_path_for, write_transcript
+from office_recorder.transcription import Transcriber, TranscriptResult, transcribe_day
+
+DATE = "2026-01-05"
+_WORDS = (
+    "budget review launch customer roadmap deadline design hiring pricing migration "
+    "outage invoice contract demo feedback sprint metrics onboarding vendor release"
+).split()
+
+
+def _speech_like(rng: np.random.Generator, samples: int) -> np.ndarray:
+    # Voiced harmonics under a ~4 Hz syllable envelope, plus breath noise.
+    t = np.arange(samples) / WHISPER_SAMPLE_RATE
+    pitch = 110 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / WHISPER_SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 4.0 * t + rng.uniform(0, 6.28)), 0, None) ** 2
+    return 0.25 * voiced * envelope + 0.01 * rng.standard_normal(samples)
+
+
+def write_audio_day(storage: Storage, segments: int, segment_seconds: int, speech_ratio: float, seed: int) -> float:
+    rng = np.random.default_rng(seed)
+    audio_dir = storage.get_day(DATE).audio_dir
+    samples = segment_seconds * WHISPER_SAMPLE_RATE
+    for index in range(segments):
+        audio = 0.0003 * rng.standard_normal(samples)
+        # One contiguous talk stretch per segment; some segments stay silent.
+        if rng.random() < speech_ratio:
+            length = int(samples * rng.uniform(0.3, 1.0))
+            start = int(rng.integers(0, samples - length + 1))
+            audio[start : start + length] += _speech_like(rng, length)
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+        with wave.open(str(audio_dir / f"segment_{index:05d}.wav"), "wb") as handle:
+            handle.setnchannels(1)
+            handle.setsampwidth(2)
+            handle.setframerate(WHISPER_SAMPLE_RATE)
+            handle.writeframes(pcm.tobytes())
+    return float(segments * segment_seconds)
+
+
+def _fake_segments(rng: np.random.Generator, duration: float, words_per_second: float = 2.5) -> list[dict[str, Any]]:
+    segments: list[dict[str, Any]] = []
+    start = 0.0
+    while start < duration:
+        end = min(duration, start + float(rng.uniform(2.0, 6.0)))
+        count = max(1, int((end - start) * words_per_second))
+        text = " ".join(rng.choice(_WORDS, size=count))
+        segments.append({"start": round(start, 2), "end": round(end, 2), "text": text})
+        start = end + float(rng.uniform(0.0, 1.5))
+    return segments
+
+
+def write_transcript_day(storage: Storage, config: AppConfig, segments: int, speech_ratio: float, seed: int) -> float:
+    rng = np.random.default_rng(seed)
+    day = storage.get_day(DATE)
+    for index in range(segments):
+        stem = f"segment_{index:05d}"
+        talk = rng.random() < speech_ratio
+        parts = _fake_segments(rng, config.segment_seconds * float(rng.uniform(0.3, 1.0))) if talk else []
+        payload = {
+            "audio_path": str(day.audio_dir / f"{stem}.wav"),
+            "language": "en",
+            "duration": float(config.segment_seconds),
+            "segments": parts,
+            "text": " ".join(part["text"] for part in parts),
+        }
+        path = transcript_path_for(day.transcripts_dir, stem, config.transcript_format)
+        write_transcript(path, payload, config.transcript_compression)
+    return float(segments * config.segment_seconds)
+
+
+class StubTranscriber(Transcriber):
+    # Emits plausible segments over the decoded audio, optionally sleeping to mimic
+    # a model running at `speed` times real time.
+    def __init__(self, config: AppConfig, speed: float = 0.0, seed: int = 0) -> None:
+        super().__init__(config)
+        self._speed = speed
+        self._rng = np.random.default_rng(seed)
+
+    def warm(self) -> None:
+        return None
+
+    def transcribe_file(self, audio_path: Path, audio: Any | None = None) -> TranscriptResult:
+        duration = len(audio) / WHISPER_SAMPLE_RATE if audio is not None else float(self.config.segment_seconds)
+        if self._speed > 0:
+            time.sleep(duration / self._speed)
+        segments = _fake_segments(self._rng, duration)
+        return TranscriptResult(
+            audio_path=str(audio_path),
+            language="en",
+            duration=duration,
+            segments=segments,
+            text=" ".join(segment["text"] for segment in segments),
+        )
+
+
+class _StubLLMHandler(BaseHTTPRequestHandler):
+    server: _StubLLMServer
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        request = json.loads(body)
+        time.sleep(self.server.latency)
+        prompt = request["messages"][-1]["content"]
+        topics = sorted({word for word in _WORDS if word in prompt})[:5]
+        # One document that satisfies both the block and the rollup schema.
+        content = {
+            "summary": f"Discussion of {', '.join(topics) or 'nothing in particular'}.",
+            "overview": f"The day covered {len(topics)} recurring topics.",
+            "topics": topics,
+            "top_topics": topics,
+            "decisions": [],
+            "action_items": [{"item": f"Follow up on {topic}", "owner": "", "due": ""} for topic in topics[:2]],
+            "questions": [],
+            "risks": [],
+            "follow_ups": [],
+        }
+        payload = json.dumps({"choices": [{"message": {"role": "assistant", "content": json.dumps(content)}}]})
+        encoded = payload.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return None
+
+
+class _StubLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), _StubLLMHandler)
+        self.latency = latency
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+def _peak_rss_bytes(who: int) -> int:
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _histogram(metric: Histogram) -> dict[str, Any]:
+    return {
+        ",".join(labels) or "all": {"count": count, "sum": round(total, 6)}
+        for labels, (total, count) in metric.totals().items()
+    }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, check=True, text=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class _Stages:
+    def __init__(self) -> None:
+        self.results: dict[str, dict[str, Any]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict[str, Any]]:
+        extra: dict[str, Any] = {}
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        yield extra
+        self.results[name] = {
+            "wall_seconds": round(time.perf_counter() - wall, 4),
+            "cpu_seconds": round(time.process_time() - cpu, 4),
+            "peak_rss_bytes": _peak_rss_bytes(resource.RUSAGE_SELF),
+            **extra,
+        }
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    stages = _Stages()
+    with tempfile.TemporaryDirectory(prefix="office-recorder-bench-") as data_dir, _serve_llm(args.llm_latency) as llm:
+        config = replace(
+            load_config(),
+            data_dir=Path(data_dir),
+            segment_seconds=args.segment_seconds,
+            transcribe_workers=args.workers,
+            transcript_format=args.transcript_format,
+            llm_base_url=llm.url,
+            llm_api_key=None,
+            llm_max_concurrency=args.llm_concurrency,
+            llm_cache_enabled=False,
+            diarization_enabled=False,
+        )
+        storage = Storage(config.data_dir)
+        started = time.perf_counter()
+
+        with stages.stage("generate") as info:
+            if args.input == "audio":
+                info["audio_seconds"] = write_audio_day(
+                    storage, args.segments, args.segment_seconds, args.speech_ratio, args.seed
+                )
+            else:
+                info["audio_seconds"] = write_transcript_day(storage, config, args.segments, args.speech_ratio, args.seed)
+        audio_seconds = stages.results["generate"]["audio_seconds"]
+
+        pooled = False
+        if args.input == "audio":
+            if args.transcriber == "stub":
+                transcriber: Transcriber = StubTranscriber(config, speed=args.stub_speed, seed=args.seed)
+                # The pool builds real models in its workers; the stub runs in-process.
+                workers = 1
+            else:
+                config = replace(config, transcribe_model=args.model)
+                transcriber = Transcriber(config)
+                workers = args.workers
+                pooled = workers > 1
+            with stages.stage("transcribe") as info:
+                written = transcribe_day(storage, transcriber, DATE, None, workers)
+                info["files"] = len(written)
+            transcribe_wall = stages.results["transcribe"]["wall_seconds"]
+            stages.results["transcribe"]["realtime_factor"] = (
+                round(audio_seconds / transcribe_wall, 2) if transcribe_wall > 0 else None
+            )
+
+        summarizer = Summarizer(config)
+        with stages.stage("summarize") as info:
+            summary = summarize_day(storage, summarizer, DATE)
+            info["blocks"] = len(summary.get("blocks", []))
+            info["llm_calls"] = sum(count for _, count in LLM_SECONDS.totals().values())
+
+        total_wall = time.perf_counter() - started
+
+    return {
+        "benchmark": "synthetic_day",
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {key: value for key, value in vars(args).items() if key != "output"},
+        "wall_seconds": round(total_wall, 4),
+        "audio_seconds": audio_seconds,
+        "throughput_audio_x": round(audio_seconds / total_wall, 2) if total_wall > 0 else None,
+        "peak_rss_bytes": _peak_rss_bytes(resource.RUSAGE_SELF),
+        # Only meaningful with a worker pool: Linux carries a forked child's inherited
+        # RSS into its high-water mark, so short helper processes would read as large.
+        "peak_rss_children_bytes": _peak_rss_bytes(resource.RUSAGE_CHILDREN) if pooled else None,
+        "stages": stages.results,
+        "metrics": {
+            "transcribe_seconds": _histogram(TRANSCRIBE_SECONDS),
+            "llm_request_seconds": _histogram(LLM_SECONDS),
+            "llm_prompt_chars": _histogram(LLM_PROMPT_CHARS),
+            "llm_response_chars": _histogram(LLM_RESPONSE_CHARS),
+            "conversation_blocks": _histogram(CONVERSATION_BLOCKS),
+        },
+    }
+
+
+@contextmanager
+def _serve_llm(latency: float) -> Iterator[_StubLLMServer]:
+    server = _StubLLMServer(latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the pipeline over a synthetic day and print JSON timings.")
+    parser.add_argument("--input", choices=("audio", "transcripts"), default="audio")
+    parser.add_argument("--segments", type=int, default=24)
+    parser.add_argument("--segment-seconds", type=int, default=60)
+    parser.add_argument("--speech-ratio", type=float, default=0.7, help="share of segments with talk")
+    parser.add_argument("--transcriber", choices=("stub", "model"), default="stub")
+    parser.add_argument("--model", default="tiny", help="faster-whisper model for --transcriber model")
+    parser.add_argument("--stub-speed", type=float, default=0.0, help="stub speed in x real time (0 = no sleep)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--transcript-format", choices=("json", "columnar"), default="json")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="stub LLM seconds per call")
+    parser.add_argument("--llm-concurrency", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    result = json.dumps(run(args), indent=2)
+    if args.output:
+        args.output.write_text(result + "\n", encoding="utf-8")
+    else:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
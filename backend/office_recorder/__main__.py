@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import uvicorn
+import argparse
 
 from .config import load_config
 
 
-def main() -> None:
+def serve() -> None:
+    import uvicorn
+
     config = load_config()
     uvicorn.run(
         "office_recorder.main:app",
@@ -15,5 +17,39 @@ def main() -> None:
     )
 
 
+def worker(args: argparse.Namespace) -> None:
+    from .remote_worker import RemoteWorker
+
+    config = load_config()
+    remote = RemoteWorker(
+        config,
+        args.server,
+        worker_id=args.worker_id,
+        token=args.token or config.worker_token,
+        date_str=args.date,
+    )
+    completed = remote.run(exit_when_idle=args.once, poll_seconds=args.poll)
+    print(f"[worker] completed {completed} segment(s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="office_recorder")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("serve", help="run the API server (default)")
+    worker_parser = commands.add_parser("worker", help="transcribe segments leased from a server")
+    worker_parser.add_argument("--server", required=True, help="e.g. http://studio.local:8787")
+    worker_parser.add_argument("--date", help="only lease segments from this YYYY-MM-DD")
+    worker_parser.add_argument("--worker-id")
+    worker_parser.add_argument("--token", help="defaults to OFFICE_RECORDER_WORKER_TOKEN")
+    worker_parser.add_argument("--once", action="store_true", help="exit when no segment is available")
+    worker_parser.add_argument("--poll", type=float, default=30.0, help="idle poll interval in seconds")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        worker(args)
+    else:
+        serve()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from .config import AppConfig
+from .recording import RecorderManager
+from .storage import Storage
+from .transcription import pending_transcripts, transcribe_pool
+
+Progress = Callable[[int, int, str | None], None]
+
+_POLL_SECONDS = 15.0
+# faster-whisper's CPU thread count when OFFICE_RECORDER_TRANSCRIBE_THREADS=0.
+_DEFAULT_WORKER_THREADS = 4
+
+
+def load_aware_workers(max_workers: int, threads_per_worker: int, running: int = 0) -> int:
+    # Size the pool to the CPU headroom left by everything except our own workers.
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return max_workers
+    cpus = os.cpu_count() or 1
+    threads = max(1, threads_per_worker)
+    spare = cpus - max(0.0, load - running * threads)
+    return max(1, min(max_workers, int(spare // threads)))
+
+
+# Background processing for days whose recording window has closed. The shared
+# transcription pool is throttled so the worker count tracks system load, and
+# nothing new is started while a recording is active. Progress lives in the
+# transcript files themselves, so an interrupted run resumes by skipping them.
+class AfterHoursProcessor:
+    def __init__(self, config: AppConfig, storage: Storage, recorder: RecorderManager) -> None:
+        self._config = config
+        self._storage = storage
+        self._recorder = recorder
+        self._lock = threading.Lock()
+        self._state: dict[str, Any] = {"date": None, "workers": 0, "paused": False}
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {"enabled": self._config.after_hours_enabled, **self._state}
+
+    def _set_state(self, **changes: Any) -> None:
+        with self._lock:
+            self._state.update(changes)
+
+    def wait_while_recording(self, progress: Progress, done: int, total: int) -> None:
+        while self._recorder.active_state() is not None:
+            self._set_state(paused=True, workers=0)
+            # progress() raises if the job was cancelled while paused.
+            progress(done, total, "paused: recording active")
+            time.sleep(_POLL_SECONDS)
+        self._set_state(paused=False)
+
+    def _limit(self, running: int) -> int:
+        if self._recorder.active_state() is not None:
+            return 0
+        threads = self._config.transcribe_cpu_threads or _DEFAULT_WORKER_THREADS
+        workers = load_aware_workers(self._config.transcribe_workers, threads, running=running)
+        self._set_state(workers=workers)
+        return workers
+
+    def transcribe_day(self, date_str: str, diarize: bool, progress: Progress, skip: Iterable[Path] = ()) -> list[Path]:
+        jobs = pending_transcripts(self._storage, date_str, self._config.transcript_format, skip)
+        self._set_state(date=date_str)
+        progress(0, len(jobs), "transcribing")
+        try:
+            return transcribe_pool(
+                self._config,
+                jobs,
+                self._config.transcribe_workers,
+                diarize,
+                progress=lambda done, total: progress(done, total, "transcribing"),
+                limit=self._limit,
+                paused=lambda done, total: self.wait_while_recording(progress, done, total),
+                niceness=self._config.after_hours_nice,
+                low_io=True,
+            )
+        finally:
+            self._set_state(date=None, workers=0, paused=False)
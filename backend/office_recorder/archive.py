@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+import multiprocessing
+import os
+from pathlib import Path
+import subprocess
+import threading
+from typing import Any, Callable
+
+from .audio import probe_duration, read_wav_info
+from .config import AppConfig
+from .storage import Storage
+from .transcript_store import find_transcript, read_transcript, write_transcript
+from .utils import lower_io_priority
+
+Progress = Callable[[int, int, str | None], None]
+
+_CODECS: dict[str, tuple[str, list[str]]] = {
+    "flac": (".flac", ["-c:a", "flac", "-compression_level", "8", "-f", "flac"]),
+    "opus": (".opus", ["-c:a", "libopus", "-application", "voip", "-f", "ogg"]),
+}
+# Allowed drift between the WAV header and the encoded stream.
+_DURATION_TOLERANCE = 0.5
+
+
+def transcode_segment(
+    audio_file: Path,
+    codec: str,
+    ffmpeg_bin: str = "ffmpeg",
+    ffprobe_bin: str = "ffprobe",
+    opus_bitrate: str = "32k",
+) -> tuple[int, int, float]:
+    # Returns (WAV bytes, encoded bytes, probed duration of the encoded file).
+    info = read_wav_info(audio_file)
+    if info is None:
+        raise ValueError(f"{audio_file.name} is not a WAV file")
+    suffix, codec_args = _CODECS[codec]
+    target = audio_file.with_suffix(suffix)
+    # The catalog ignores *.tmp, so a half-written file never shows up as a segment.
+    tmp_path = target.with_name(target.name + ".tmp")
+    cmd = [ffmpeg_bin, "-nostdin", "-y", "-v", "error", "-i", str(audio_file), *codec_args]
+    if codec == "opus":
+        cmd += ["-b:a", opus_bitrate]
+    cmd.append(str(tmp_path))
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+        duration = probe_duration(tmp_path, ffprobe_bin)
+        if abs(duration - info.duration) > max(_DURATION_TOLERANCE, info.duration * 0.01):
+            raise RuntimeError(f"{target.name}: duration {duration:.2f}s does not match {info.duration:.2f}s")
+    except subprocess.CalledProcessError as exc:
+        tmp_path.unlink(missing_ok=True)
+        raise RuntimeError(f"Failed to transcode {audio_file}: {exc.stderr.decode(errors='replace')[-500:]}") from exc
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    before = audio_file.stat().st_size
+    os.replace(tmp_path, target)
+    audio_file.unlink()
+    return before, target.stat().st_size, duration
+
+
+def _init_archive_worker(niceness: int) -> None:
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+    # ffmpeg children inherit both the niceness and the IO policy.
+    lower_io_priority()
+
+
+def _clear_dir(directory: Path) -> tuple[int, int]:
+    count = freed = 0
+    for entry in directory.iterdir():
+        if entry.is_file():
+            freed += entry.stat().st_size
+            entry.unlink()
+            count += 1
+    return count, freed
+
+
+# Transcodes transcribed WAV segments and prunes days past their retention age.
+# Audio only goes once its transcript exists; expiring a day's transcripts also
+# expires all of its audio so the segments are not picked up for re-transcription.
+class Archiver:
+    def __init__(
+        self,
+        config: AppConfig,
+        storage: Storage,
+        open_segment: Callable[[str], str | None] | None = None,
+    ) -> None:
+        self._config = config
+        self._storage = storage
+        self._open_segment = open_segment
+        self._lock = threading.Lock()
+        self._totals: dict[str, Any] = {"transcoded": 0, "failed": 0, "bytes_saved": 0, "last_error": None}
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            totals = dict(self._totals)
+        return {
+            "codec": self._config.archive_codec,
+            "retain_days": {
+                "audio": self._config.retain_audio_days,
+                "transcripts": self._config.retain_transcripts_days,
+                "summaries": self._config.retain_summaries_days,
+            },
+            **totals,
+        }
+
+    def pending(self, date_str: str) -> list[Path]:
+        transcripts_dir = self._storage.get_day(date_str).transcripts_dir
+        open_stem = self._open_segment(date_str) if self._open_segment is not None else None
+        return [
+            audio_file
+            for audio_file in self._storage.list_audio_files(date_str)
+            if audio_file.suffix.lower() == ".wav"
+            and audio_file.stem != open_stem
+            and find_transcript(transcripts_dir, audio_file.stem) is not None
+        ]
+
+    def archive_day(self, date_str: str, progress: Progress | None = None) -> int:
+        codec = self._config.archive_codec
+        pending = self.pending(date_str) if codec else []
+        if not pending:
+            return 0
+        done = 0
+        with ProcessPoolExecutor(
+            max_workers=min(self._config.archive_workers, len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_archive_worker,
+            initargs=(self._config.after_hours_nice,),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    transcode_segment,
+                    audio_file,
+                    codec,
+                    self._config.ffmpeg_bin,
+                    self._config.ffprobe_bin,
+                    self._config.archive_opus_bitrate,
+                ): audio_file
+                for audio_file in pending
+            }
+            suffix = _CODECS[codec][0]
+            for future in as_completed(futures):
+                try:
+                    before, after, duration = future.result()
+                except Exception as exc:
+                    # The WAV is kept; the next archive run retries it.
+                    with self._lock:
+                        self._totals["failed"] += 1
+                        self._totals["last_error"] = str(exc)
+                else:
+                    target = futures[future].with_suffix(suffix)
+                    # Catalog inspection does not probe flac/opus; keep the duration
+                    # already verified against the WAV.
+                    self._storage.catalog.record(date_str, "audio", target, duration, "recorded")
+                    self._repoint_transcript(date_str, target)
+                    done += 1
+                    with self._lock:
+                        self._totals["transcoded"] += 1
+                        self._totals["bytes_saved"] += before - after
+                if progress is not None:
+                    progress(done, len(pending), "archiving")
+        return done
+
+    def _repoint_transcript(self, date_str: str, target: Path) -> None:
+        path = find_transcript(self._storage.get_day(date_str).transcripts_dir, target.stem)
+        if path is None:
+            return
+        payload = read_transcript(path)
+        if payload.get("audio_path") == str(target):
+            return
+        stat = path.stat()
+        write_transcript(path, {**payload, "audio_path": str(target)}, self._config.transcript_compression)
+        # Only the audio pointer changed: keep the mtime so search and summary
+        # freshness do not treat it as new text. The size still changes, so the
+        # merged transcript (keyed on mtime and size) rebuilds the day once.
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    def apply_retention(self, today: date | None = None) -> dict[str, Any]:
+        today = today or date.today()
+        config = self._config
+        removed = {"audio": 0, "transcripts": 0, "summaries": 0, "bytes": 0, "days": []}
+        for date_str in self._storage.list_days():
+            try:
+                age = (today - date.fromisoformat(date_str)).days
+            except ValueError:
+                continue
+            audio_expired = bool(config.retain_audio_days) and age > config.retain_audio_days
+            transcripts_expired = bool(config.retain_transcripts_days) and age > config.retain_transcripts_days
+            summaries_expired = bool(config.retain_summaries_days) and age > config.retain_summaries_days
+            if not (audio_expired or transcripts_expired or summaries_expired):
+                continue
+            day = self._storage.get_day(date_str)
+            if transcripts_expired:
+                count, freed = _clear_dir(day.audio_dir)
+                removed["audio"] += count
+                removed["bytes"] += freed
+                count, freed = _clear_dir(day.transcripts_dir)
+                for derived in (self._storage.merged_transcript_path(date_str), self._storage.merged_index_path(date_str)):
+                    if derived.exists():
+                        freed += derived.stat().st_size
+                        derived.unlink()
+                if count:
+                    removed["transcripts"] += count
+                    removed["days"].append(date_str)
+                removed["bytes"] += freed
+            elif audio_expired:
+                for audio_file in self._storage.list_audio_files(date_str):
+                    if find_transcript(day.transcripts_dir, audio_file.stem) is None or not audio_file.exists():
+                        continue
+                    removed["bytes"] += audio_file.stat().st_size
+                    audio_file.unlink()
+                    removed["audio"] += 1
+            if summaries_expired:
+                count, freed = _clear_dir(day.summaries_dir)
+                removed["summaries"] += count
+                removed["bytes"] += freed
+        return removed
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import struct
+import subprocess
+
+import numpy as np
+
+WHISPER_SAMPLE_RATE = 16000
+
+_PCM_FORMAT_TAGS = {0x0001, 0xFFFE}
+
+
+@dataclass(frozen=True)
+class WavInfo:
+    sample_rate: int
+    channels: int
+    bits_per_sample: int
+    format_tag: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def duration(self) -> float:
+        frame_bytes = self.channels * self.bits_per_sample // 8
+        if frame_bytes <= 0 or self.sample_rate <= 0:
+            return 0.0
+        return self.data_size / frame_bytes / self.sample_rate
+
+
+def read_wav_info(path: Path) -> WavInfo | None:
+    file_size = path.stat().st_size
+    with path.open("rb") as handle:
+        header = handle.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        fmt: tuple[int, int, int, int] | None = None
+        while True:
+            chunk = handle.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+            if chunk_id == b"fmt ":
+                body = handle.read(chunk_size)
+                format_tag, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                fmt = (format_tag, channels, sample_rate, bits)
+                if chunk_size % 2:
+                    handle.seek(1, 1)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    return None
+                offset = handle.tell()
+                # A segment still being written may carry a placeholder size.
+                size = min(chunk_size, file_size - offset)
+                format_tag, channels, sample_rate, bits = fmt
+                return WavInfo(
+                    sample_rate=sample_rate,
+                    channels=channels,
+                    bits_per_sample=bits,
+                    format_tag=format_tag,
+                    data_offset=offset,
+                    data_size=size,
+                )
+            else:
+                handle.seek(chunk_size + (chunk_size % 2), 1)
+
+
+def memmap_pcm16(path: Path, info: WavInfo) -> np.ndarray:
+    frame_count = info.data_size // (2 * info.channels)
+    if frame_count == 0:
+        return np.zeros((0, info.channels), dtype="<i2")
+    return np.memmap(path, dtype="<i2", mode="r", offset=info.data_offset, shape=(frame_count, info.channels))
+
+
+def probe_duration(path: Path, ffprobe_bin: str = "ffprobe") -> float:
+    cmd = [
+        ffprobe_bin,
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        str(path),
+    ]
+    try:
+        output = subprocess.run(cmd, capture_output=True, check=True, text=True).stdout
+        return float(output.strip())
+    except subprocess.CalledProcessError as exc:
+        raise RuntimeError(f"Failed to probe {path}: {exc.stderr[-500:]}") from exc
+    except ValueError as exc:
+        raise RuntimeError(f"Failed to probe {path}: no duration") from exc
+
+
+def _decode_ffmpeg(path: Path, sample_rate: int, ffmpeg_bin: str) -> np.ndarray:
+    cmd = [
+        ffmpeg_bin,
+        "-nostdin",
+        "-threads",
+        "0",
+        "-i",
+        str(path),
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-acodec",
+        "pcm_s16le",
+        "-ar",
+        str(sample_rate),
+        "-",
+    ]
+    try:
+        output = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as exc:
+        raise RuntimeError(f"Failed to decode {path}: {exc.stderr.decode(errors='replace')[-500:]}") from exc
+    return np.frombuffer(output, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def load_audio(path: Path, sample_rate: int = WHISPER_SAMPLE_RATE, ffmpeg_bin: str = "ffmpeg") -> np.ndarray:
+    # Our own recordings are pcm_s16le at the Whisper rate, so map them and convert
+    # once; anything else goes through a single ffmpeg decode.
+    info = read_wav_info(path)
+    if (
+        info is not None
+        and info.format_tag in _PCM_FORMAT_TAGS
+        and info.bits_per_sample == 16
+        and info.sample_rate == sample_rate
+    ):
+        pcm = memmap_pcm16(path, info)
+        if info.channels == 1:
+            samples = pcm[:, 0].astype(np.float32)
+        else:
+            samples = pcm.mean(axis=1, dtype=np.float32)
+        samples /= 32768.0
+        return samples
+    return _decode_ffmpeg(path, sample_rate, ffmpeg_bin)
+
+
+@dataclass
+class ActivityScan:
+    active: bool
+    duration: float
+    active_seconds: float
+    regions: list[tuple[float, float]]
+    rms_dbfs: float
+    peak_dbfs: float
+    threshold_dbfs: float
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "active": self.active,
+            "duration": round(self.duration, 3),
+            "active_seconds": round(self.active_seconds, 3),
+            "regions": [[round(start, 2), round(end, 2)] for start, end in self.regions],
+            "rms_dbfs": round(self.rms_dbfs, 1),
+            "peak_dbfs": round(self.peak_dbfs, 1),
+            "threshold_dbfs": self.threshold_dbfs,
+        }
+
+
+def _to_dbfs(value: float) -> float:
+    return float(20.0 * np.log10(max(value, 1e-10)))
+
+
+def scan_activity(
+    samples: np.ndarray,
+    sample_rate: int,
+    threshold_dbfs: float,
+    min_active_seconds: float,
+    frame_seconds: float = 0.1,
+    pad_seconds: float = 0.5,
+    merge_gap_seconds: float = 1.0,
+) -> ActivityScan:
+    duration = len(samples) / sample_rate if sample_rate else 0.0
+    frame_len = max(1, int(sample_rate * frame_seconds))
+    frame_count = len(samples) // frame_len
+    if frame_count == 0:
+        return ActivityScan(False, duration, 0.0, [], _to_dbfs(0.0), _to_dbfs(0.0), threshold_dbfs)
+
+    frames = np.asarray(samples[: frame_count * frame_len], dtype=np.float32).reshape(frame_count, frame_len)
+    energy = np.einsum("ij,ij->i", frames, frames) / frame_len
+    frame_dbfs = 10.0 * np.log10(np.maximum(energy, 1e-20))
+    loud = frame_dbfs > threshold_dbfs
+    active_seconds = float(loud.sum()) * frame_seconds
+
+    regions: list[tuple[float, float]] = []
+    if loud.any():
+        edges = np.diff(np.concatenate(([0], loud.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1) * frame_seconds
+        ends = np.flatnonzero(edges == -1) * frame_seconds
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            start = max(0.0, start - pad_seconds)
+            end = min(duration, end + pad_seconds)
+            if regions and start - regions[-1][1] <= merge_gap_seconds:
+                regions[-1] = (regions[-1][0], end)
+            else:
+                regions.append((start, end))
+
+    return ActivityScan(
+        active=active_seconds >= min_active_seconds,
+        duration=duration,
+        active_seconds=active_seconds,
+        regions=regions,
+        rms_dbfs=_to_dbfs(float(np.sqrt(energy.mean()))),
+        peak_dbfs=_to_dbfs(float(np.abs(frames).max())),
+        threshold_dbfs=threshold_dbfs,
+    )
+
+
+def crop_regions(
+    samples: np.ndarray,
+    regions: list[tuple[float, float]],
+    sample_rate: int,
+) -> tuple[np.ndarray, list[tuple[float, float, float]]]:
+    # Returns the concatenated regions plus (cropped_start, original_start, length)
+    # spans for mapping timestamps back onto the original segment.
+    pieces: list[np.ndarray] = []
+    spans: list[tuple[float, float, float]] = []
+    cursor = 0.0
+    for start, end in regions:
+        piece = samples[int(start * sample_rate) : int(end * sample_rate)]
+        if len(piece) == 0:
+            continue
+        length = len(piece) / sample_rate
+        pieces.append(piece)
+        spans.append((cursor, start, length))
+        cursor += length
+    if not pieces:
+        return samples[:0], []
+    return np.concatenate(pieces), spans
+
+
+def uncrop_time(value: float, spans: list[tuple[float, float, float]]) -> float:
+    for cropped_start, original_start, length in spans:
+        if value <= cropped_start + length:
+            return original_start + max(0.0, value - cropped_start)
+    if not spans:
+        return value
+    cropped_start, original_start, length = spans[-1]
+    return original_start + (value - cropped_start)
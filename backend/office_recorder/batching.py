@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+from .metrics import CONVERSATION_BLOCKS
 
 
 @dataclass
@@ -17,44 +19,103 @@ def _segment_text(segment: dict[str, Any]) -> str:
     return " ".join(text.split())
 
 
-def group_segments(
-    segments: list[dict[str, Any]],
-    gap_seconds: int,
-    max_words: int,
-) -> list[ConversationBlock]:
-    blocks: list[ConversationBlock] = []
-    current_segments: list[dict[str, Any]] = []
-    current_words = 0
-
-    def flush() -> None:
-        nonlocal current_segments, current_words
-        if not current_segments:
-            return
-        start = float(current_segments[0].get("start", 0.0))
-        end = float(current_segments[-1].get("end", start))
-        text = " ".join(_segment_text(seg) for seg in current_segments).strip()
-        blocks.append(ConversationBlock(start=start, end=end, text=text, segments=current_segments))
-        current_segments = []
-        current_words = 0
-
-    last_end: float | None = None
-    for segment in segments:
+class BlockBuilder:
+    def __init__(self, gap_seconds: int, max_words: int, retain: bool = True) -> None:
+        self.gap_seconds = gap_seconds
+        self.max_words = max_words
+        # Streaming callers hand flushed blocks off immediately; not retaining them
+        # keeps memory bounded by the open block.
+        self.retain = retain
+        self.blocks: list[ConversationBlock] = []
+        self._current_segments: list[dict[str, Any]] = []
+        self._current_words = 0
+        self._last_end: float | None = None
+
+    def flush(self) -> ConversationBlock | None:
+        if not self._current_segments:
+            return None
+        start = float(self._current_segments[0].get("start", 0.0))
+        end = float(self._current_segments[-1].get("end", start))
+        text = " ".join(_segment_text(seg) for seg in self._current_segments).strip()
+        block = ConversationBlock(start=start, end=end, text=text, segments=self._current_segments)
+        if self.retain:
+            self.blocks.append(block)
+        self._current_segments = []
+        self._current_words = 0
+        return block
+
+    def add(self, segment: dict[str, Any]) -> ConversationBlock | None:
         start = float(segment.get("start", 0.0))
         end = float(segment.get("end", start))
         text = _segment_text(segment)
         word_count = len(text.split())
 
-        if last_end is not None:
-            gap = start - last_end
-            if gap >= gap_seconds:
-                flush()
+        flushed: ConversationBlock | None = None
+        if self._last_end is not None:
+            gap = start - self._last_end
+            if gap >= self.gap_seconds:
+                flushed = self.flush()
+
+        if self._current_words + word_count > self.max_words and self._current_segments:
+            flushed = self.flush()
+
+        self._current_segments.append({**segment, "text": text})
+        self._current_words += word_count
+        self._last_end = end
+        return flushed
+
+    def extend(self, segments: Iterable[dict[str, Any]]) -> list[ConversationBlock]:
+        flushed: list[ConversationBlock] = []
+        for segment in segments:
+            block = self.add(segment)
+            if block is not None:
+                flushed.append(block)
+        return flushed
 
-        if current_words + word_count > max_words and current_segments:
-            flush()
+    def open_block(self) -> ConversationBlock | None:
+        if not self._current_segments:
+            return None
+        start = float(self._current_segments[0].get("start", 0.0))
+        end = float(self._current_segments[-1].get("end", start))
+        text = " ".join(_segment_text(seg) for seg in self._current_segments).strip()
+        return ConversationBlock(start=start, end=end, text=text, segments=list(self._current_segments))
 
-        current_segments.append({**segment, "text": text})
-        current_words += word_count
-        last_end = end
+    def closed_blocks(self, horizon: float) -> list[ConversationBlock]:
+        # Flushed blocks can no longer grow. The open block is closed once audio
+        # covering more than gap_seconds past its end has been transcribed.
+        closed = list(self.blocks)
+        current = self.open_block()
+        if current is not None and horizon - current.end >= self.gap_seconds:
+            closed.append(current)
+        return closed
 
-    flush()
-    return blocks
+    def finish(self) -> list[ConversationBlock]:
+        self.flush()
+        return self.blocks
+
+
+def iter_blocks(
+    segments: Iterable[dict[str, Any]],
+    gap_seconds: int,
+    max_words: int,
+) -> Iterator[ConversationBlock]:
+    builder = BlockBuilder(gap_seconds=gap_seconds, max_words=max_words, retain=False)
+    count = 0
+    for segment in segments:
+        block = builder.add(segment)
+        if block is not None:
+            count += 1
+            yield block
+    block = builder.flush()
+    if block is not None:
+        count += 1
+        yield block
+    CONVERSATION_BLOCKS.observe(count)
+
+
+def group_segments(
+    segments: list[dict[str, Any]],
+    gap_seconds: int,
+    max_words: int,
+) -> list[ConversationBlock]:
+    return list(iter_blocks(segments, gap_seconds=gap_seconds, max_words=max_words))
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from .transcript_store import read_transcript_meta
+from .utils import segment_index
+
+# Directory listings are cached against the directory's mtime. A directory touched
+# within this window is rescanned anyway, since coarse mtimes can hide a second write.
+# Files rewritten in place (a growing segment, a rewritten WAV header, an
+# overwritten transcript) leave the directory mtime alone, so each listed file is
+# still stat'ed and re-inspected when its size or mtime moved.
+_MTIME_SETTLE_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS days (
+    date TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS files (
+    date TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    segment_index INTEGER NOT NULL,
+    duration REAL,
+    state TEXT,
+    PRIMARY KEY (date, kind, name)
+);
+"""
+
+FileInspector = Callable[[Path], tuple[float | None, str | None]]
+
+
+class Catalog:
+    def __init__(self, path: Path) -> None:
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _is_fresh(self, directory: Path) -> tuple[bool, int]:
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False, -1
+        row = self._conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (str(directory),)).fetchone()
+        settled = time.time_ns() - mtime_ns > _MTIME_SETTLE_NS
+        return bool(row and row["mtime_ns"] == mtime_ns and settled), mtime_ns
+
+    def _mark(self, directory: Path, mtime_ns: int) -> None:
+        self._conn.execute(
+            "INSERT INTO dirs (path, mtime_ns) VALUES (?, ?) ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns",
+            (str(directory), mtime_ns),
+        )
+
+    def days(self, base_dir: Path, is_day: Callable[[str], bool]) -> list[str]:
+        with self._lock:
+            fresh, mtime_ns = self._is_fresh(base_dir)
+            if not fresh and mtime_ns >= 0:
+                names = [p.name for p in base_dir.iterdir() if p.is_dir() and is_day(p.name)]
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM days")
+                self._conn.executemany("INSERT INTO days (date) VALUES (?)", [(name,) for name in names])
+                self._mark(base_dir, mtime_ns)
+                self._conn.execute("COMMIT")
+            rows = self._conn.execute("SELECT date FROM days ORDER BY date").fetchall()
+        return [row["date"] for row in rows]
+
+    def add_day(self, date_str: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO days (date) VALUES (?)", (date_str,))
+
+    def files(
+        self, date_str: str, kind: str, directory: Path, inspect: FileInspector | None = None, restat: bool = True
+    ) -> list[Path]:
+        # restat=False trusts the directory mtime alone: names are current, sizes
+        # and durations of files rewritten in place may not be.
+        with self._lock:
+            fresh, mtime_ns = self._is_fresh(directory)
+            if not fresh and mtime_ns >= 0:
+                self._sync(date_str, kind, directory, mtime_ns, inspect)
+            elif fresh and restat:
+                self._restat(date_str, kind, directory, inspect)
+            rows = self._conn.execute(
+                "SELECT name FROM files WHERE date = ? AND kind = ? ORDER BY name",
+                (date_str, kind),
+            ).fetchall()
+        return [directory / row["name"] for row in rows]
+
+    def record(self, date_str: str, kind: str, path: Path, duration: float | None, state: str | None) -> None:
+        # For writers that already know what inspect() would compute; the next
+        # listing sees a matching size and mtime and keeps these values.
+        stat = path.stat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (date, kind, name, size, mtime_ns, segment_index, duration, state) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (date_str, kind, path.name, stat.st_size, stat.st_mtime_ns, segment_index(path.stem), duration, state),
+            )
+
+    def _sync(self, date_str: str, kind: str, directory: Path, mtime_ns: int, inspect: FileInspector | None) -> None:
+        known = {
+            row["name"]: (row["size"], row["mtime_ns"])
+            for row in self._conn.execute(
+                "SELECT name, size, mtime_ns FROM files WHERE date = ? AND kind = ?",
+                (date_str, kind),
+            )
+        }
+        seen: set[str] = set()
+        updates: list[tuple[Any, ...]] = []
+        for entry in directory.iterdir():
+            if not entry.is_file() or entry.name.endswith(".tmp"):
+                continue
+            stat = entry.stat()
+            seen.add(entry.name)
+            if known.get(entry.name) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            duration, state = inspect(entry) if inspect is not None else (None, None)
+            updates.append(
+                (date_str, kind, entry.name, stat.st_size, stat.st_mtime_ns, segment_index(entry.stem), duration, state)
+            )
+        removed = [(date_str, kind, name) for name in known if name not in seen]
+
+        self._conn.execute("BEGIN")
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO files (date, kind, name, size, mtime_ns, segment_index, duration, state) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            updates,
+        )
+        self._conn.executemany("DELETE FROM files WHERE date = ? AND kind = ? AND name = ?", removed)
+        self._mark(directory, mtime_ns)
+        self._conn.execute("COMMIT")
+
+    def _restat(self, date_str: str, kind: str, directory: Path, inspect: FileInspector | None) -> None:
+        updates: list[tuple[Any, ...]] = []
+        removed: list[tuple[str, str, str]] = []
+        for row in self._conn.execute(
+            "SELECT name, size, mtime_ns FROM files WHERE date = ? AND kind = ?",
+            (date_str, kind),
+        ).fetchall():
+            path = directory / row["name"]
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                removed.append((date_str, kind, row["name"]))
+                continue
+            if (row["size"], row["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            duration, state = inspect(path) if inspect is not None else (None, None)
+            updates.append((stat.st_size, stat.st_mtime_ns, duration, state, date_str, kind, row["name"]))
+        if not updates and not removed:
+            return
+        self._conn.execute("BEGIN")
+        self._conn.executemany(
+            "UPDATE files SET size = ?, mtime_ns = ?, duration = ?, state = ? WHERE date = ? AND kind = ? AND name = ?",
+            updates,
+        )
+        self._conn.executemany("DELETE FROM files WHERE date = ? AND kind = ? AND name = ?", removed)
+        self._conn.execute("COMMIT")
+
+    def day_stats(self, date_str: str) -> dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, COUNT(*) AS count, SUM(size) AS bytes, SUM(duration) AS duration "
+                "FROM files WHERE date = ? GROUP BY kind",
+                (date_str,),
+            ).fetchall()
+            states = self._conn.execute(
+                "SELECT state, COUNT(*) AS count FROM files WHERE date = ? AND kind = 'transcript' GROUP BY state",
+                (date_str,),
+            ).fetchall()
+        stats: dict[str, Any] = {"date": date_str}
+        for row in rows:
+            stats[row["kind"]] = {
+                "count": row["count"],
+                "bytes": row["bytes"] or 0,
+                "duration": row["duration"],
+            }
+        stats["transcript_states"] = {row["state"] or "unknown": row["count"] for row in states}
+        return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM days")
+            self._conn.execute("DELETE FROM dirs")
+            self._conn.execute("COMMIT")
+
+
+def inspect_transcript(path: Path) -> tuple[float | None, str | None]:
+    try:
+        meta, count = read_transcript_meta(path)
+    except (OSError, ValueError, KeyError, RuntimeError):
+        return None, "invalid"
+    duration = meta.get("duration")
+    state = meta.get("skipped") or ("transcribed" if count else "empty")
+    return (float(duration) if duration is not None else None), state
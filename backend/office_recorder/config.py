@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import importlib.util
 from pathlib import Path
 import os
 import platform
@@ -79,17 +80,34 @@ class AppConfig:
     port: int
 
     ffmpeg_bin: str
+    ffprobe_bin: str
     audio_backend: str
     audio_input: str
     audio_format: str
     sample_rate: int
     channels: int
     segment_seconds: int
+    capture_telemetry_enabled: bool
+    capture_level_interval: float
+    capture_dead_dbfs: float
+    capture_alert_seconds: float
 
     transcribe_model: str
     transcribe_device: str
     transcribe_compute: str
+    transcribe_workers: int
+    transcribe_cpu_threads: int
     vad_filter: bool
+    silence_skip_enabled: bool
+    silence_threshold_dbfs: float
+    silence_min_active_seconds: float
+    live_transcribe_enabled: bool
+    live_poll_seconds: int
+    live_transcribe_threads: int
+    live_transcribe_nice: int
+    live_summarize_enabled: bool
+    transcript_format: str
+    transcript_compression: str
     language: str | None
 
     conversation_gap_seconds: int
@@ -99,6 +117,13 @@ class AppConfig:
     llm_api_key: str | None
     llm_model: str
     llm_timeout_seconds: float
+    llm_max_concurrency: int
+    llm_rollup_token_budget: int
+    llm_cache_enabled: bool
+    llm_cache_max_mb: int
+    llm_cache_max_age_days: int
+
+    job_workers: int
 
     schedule_enabled: bool
     schedule_start: str
@@ -106,12 +131,30 @@ class AppConfig:
     schedule_days: list[int]
     schedule_timezone: str | None
     schedule_auto_stop: bool
+    nightly_pipeline_time: str | None
+    after_hours_enabled: bool
+    after_hours_nice: int
+    model_idle_seconds: float
+    model_memory_mb: int
+    model_prewarm: str
+    trace_enabled: bool
+    trace_sample_rate: float
+    worker_lease_seconds: float
+    worker_max_attempts: int
+    worker_token: str | None
+    archive_codec: str | None
+    archive_opus_bitrate: str
+    archive_workers: int
+    retain_audio_days: int
+    retain_transcripts_days: int
+    retain_summaries_days: int
 
     diarization_enabled: bool
     diarization_backend: str
     diarization_device: str
     diarization_model: str
     diarization_hf_token: str | None
+    diarization_split_segments: bool
 
     openclaw_hook_url: str | None
     openclaw_hook_token: str | None
@@ -133,17 +176,41 @@ def load_config() -> AppConfig:
     port = _env_int("OFFICE_RECORDER_PORT", 8787)
 
     ffmpeg_bin = os.getenv("OFFICE_RECORDER_FFMPEG_BIN", "ffmpeg")
+    ffprobe_bin = os.getenv("OFFICE_RECORDER_FFPROBE_BIN", "ffprobe")
     audio_backend = os.getenv("OFFICE_RECORDER_AUDIO_BACKEND", _default_audio_backend())
     audio_input = os.getenv("OFFICE_RECORDER_AUDIO_INPUT", ":0")
     audio_format = os.getenv("OFFICE_RECORDER_AUDIO_FORMAT", "wav")
     sample_rate = _env_int("OFFICE_RECORDER_SAMPLE_RATE", 16000)
     channels = _env_int("OFFICE_RECORDER_CHANNELS", 1)
     segment_seconds = _env_int("OFFICE_RECORDER_SEGMENT_SECONDS", 300)
+    capture_telemetry_enabled = _env_bool("OFFICE_RECORDER_CAPTURE_TELEMETRY", True)
+    capture_level_interval = max(0.1, _env_float("OFFICE_RECORDER_CAPTURE_LEVEL_INTERVAL", 1.0))
+    capture_dead_dbfs = _env_float("OFFICE_RECORDER_CAPTURE_DEAD_DBFS", -80.0)
+    capture_alert_seconds = max(2.0, _env_float("OFFICE_RECORDER_CAPTURE_ALERT_SECONDS", 10.0))
 
     transcribe_model = os.getenv("OFFICE_RECORDER_TRANSCRIBE_MODEL", "small")
     transcribe_device = os.getenv("OFFICE_RECORDER_TRANSCRIBE_DEVICE", "auto")
     transcribe_compute = os.getenv("OFFICE_RECORDER_TRANSCRIBE_COMPUTE", "int8")
+    transcribe_workers = max(1, _env_int("OFFICE_RECORDER_TRANSCRIBE_WORKERS", 1))
+    transcribe_cpu_threads = max(0, _env_int("OFFICE_RECORDER_TRANSCRIBE_THREADS", 0))
     vad_filter = _env_bool("OFFICE_RECORDER_VAD_FILTER", True)
+    silence_skip_enabled = _env_bool("OFFICE_RECORDER_SILENCE_SKIP", True)
+    silence_threshold_dbfs = _env_float("OFFICE_RECORDER_SILENCE_THRESHOLD_DBFS", -45.0)
+    silence_min_active_seconds = _env_float("OFFICE_RECORDER_SILENCE_MIN_ACTIVE_SECONDS", 1.0)
+    live_transcribe_enabled = _env_bool("OFFICE_RECORDER_LIVE_TRANSCRIBE", False)
+    live_poll_seconds = max(1, _env_int("OFFICE_RECORDER_LIVE_POLL_SECONDS", 15))
+    live_transcribe_threads = max(1, _env_int("OFFICE_RECORDER_LIVE_THREADS", 2))
+    live_transcribe_nice = max(0, _env_int("OFFICE_RECORDER_LIVE_NICE", 10))
+    live_summarize_enabled = _env_bool("OFFICE_RECORDER_LIVE_SUMMARIZE", False)
+    transcript_format = os.getenv("OFFICE_RECORDER_TRANSCRIPT_FORMAT", "json").strip().lower()
+    if transcript_format not in {"json", "columnar"}:
+        transcript_format = "json"
+    transcript_compression = os.getenv("OFFICE_RECORDER_TRANSCRIPT_COMPRESSION", "none").strip().lower()
+    if transcript_compression not in {"none", "zstd"}:
+        transcript_compression = "none"
+    if transcript_compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+        # Fail at startup rather than after a segment's transcription is done.
+        raise RuntimeError("zstandard is not installed")
     language = os.getenv("OFFICE_RECORDER_LANGUAGE")
     if language == "":
         language = None
@@ -157,6 +224,13 @@ def load_config() -> AppConfig:
         llm_api_key = None
     llm_model = os.getenv("OFFICE_RECORDER_LLM_MODEL", "llama3.1:70b")
     llm_timeout_seconds = _env_float("OFFICE_RECORDER_LLM_TIMEOUT", 120.0)
+    llm_max_concurrency = max(1, _env_int("OFFICE_RECORDER_LLM_CONCURRENCY", 2))
+    llm_rollup_token_budget = max(512, _env_int("OFFICE_RECORDER_LLM_ROLLUP_TOKENS", 6000))
+    llm_cache_enabled = _env_bool("OFFICE_RECORDER_LLM_CACHE_ENABLED", True)
+    llm_cache_max_mb = _env_int("OFFICE_RECORDER_LLM_CACHE_MAX_MB", 256)
+    llm_cache_max_age_days = _env_int("OFFICE_RECORDER_LLM_CACHE_MAX_AGE_DAYS", 30)
+
+    job_workers = max(1, _env_int("OFFICE_RECORDER_JOB_WORKERS", 1))
 
     schedule_enabled = _env_bool("OFFICE_RECORDER_SCHEDULE_ENABLED", False)
     schedule_start = os.getenv("OFFICE_RECORDER_SCHEDULE_START", "09:00")
@@ -166,6 +240,31 @@ def load_config() -> AppConfig:
     if schedule_timezone in (None, "", "local"):
         schedule_timezone = None
     schedule_auto_stop = _env_bool("OFFICE_RECORDER_SCHEDULE_AUTO_STOP", True)
+    nightly_pipeline_time = os.getenv("OFFICE_RECORDER_NIGHTLY_PIPELINE")
+    if nightly_pipeline_time in (None, "", "off"):
+        nightly_pipeline_time = None
+    after_hours_enabled = _env_bool("OFFICE_RECORDER_AFTER_HOURS", False)
+    after_hours_nice = max(0, _env_int("OFFICE_RECORDER_AFTER_HOURS_NICE", 10))
+    model_idle_seconds = max(0.0, _env_float("OFFICE_RECORDER_MODEL_IDLE_SECONDS", 900.0))
+    model_memory_mb = max(0, _env_int("OFFICE_RECORDER_MODEL_MEMORY_MB", 0))
+    model_prewarm = os.getenv("OFFICE_RECORDER_MODEL_PREWARM", "off").strip().lower()
+    if model_prewarm not in {"off", "startup", "schedule"}:
+        model_prewarm = "off"
+    trace_enabled = _env_bool("OFFICE_RECORDER_TRACE", True)
+    trace_sample_rate = min(1.0, max(0.0, _env_float("OFFICE_RECORDER_TRACE_SAMPLE", 1.0)))
+    worker_lease_seconds = max(30.0, _env_float("OFFICE_RECORDER_WORKER_LEASE_SECONDS", 600.0))
+    worker_max_attempts = max(1, _env_int("OFFICE_RECORDER_WORKER_MAX_ATTEMPTS", 3))
+    worker_token = os.getenv("OFFICE_RECORDER_WORKER_TOKEN")
+    if worker_token == "":
+        worker_token = None
+    archive_codec = os.getenv("OFFICE_RECORDER_ARCHIVE_CODEC", "off").strip().lower()
+    if archive_codec not in {"flac", "opus"}:
+        archive_codec = None
+    archive_opus_bitrate = os.getenv("OFFICE_RECORDER_ARCHIVE_OPUS_BITRATE", "32k")
+    archive_workers = max(1, _env_int("OFFICE_RECORDER_ARCHIVE_WORKERS", 1))
+    retain_audio_days = max(0, _env_int("OFFICE_RECORDER_RETAIN_AUDIO_DAYS", 0))
+    retain_transcripts_days = max(0, _env_int("OFFICE_RECORDER_RETAIN_TRANSCRIPTS_DAYS", 0))
+    retain_summaries_days = max(0, _env_int("OFFICE_RECORDER_RETAIN_SUMMARIES_DAYS", 0))
 
     diarization_enabled = _env_bool("OFFICE_RECORDER_DIARIZATION_ENABLED", False)
     diarization_backend = os.getenv("OFFICE_RECORDER_DIARIZATION_BACKEND", "whisperx")
@@ -174,6 +273,7 @@ def load_config() -> AppConfig:
     diarization_hf_token = os.getenv("OFFICE_RECORDER_DIARIZATION_HF_TOKEN")
     if diarization_hf_token == "":
         diarization_hf_token = None
+    diarization_split_segments = _env_bool("OFFICE_RECORDER_DIARIZATION_SPLIT", False)
 
     openclaw_hook_url = os.getenv("OPENCLAW_HOOK_URL")
     if openclaw_hook_url == "":
@@ -190,16 +290,33 @@ def load_config() -> AppConfig:
         host=host,
         port=port,
         ffmpeg_bin=ffmpeg_bin,
+        ffprobe_bin=ffprobe_bin,
         audio_backend=audio_backend,
         audio_input=audio_input,
         audio_format=audio_format,
         sample_rate=sample_rate,
         channels=channels,
         segment_seconds=segment_seconds,
+        capture_telemetry_enabled=capture_telemetry_enabled,
+        capture_level_interval=capture_level_interval,
+        capture_dead_dbfs=capture_dead_dbfs,
+        capture_alert_seconds=capture_alert_seconds,
         transcribe_model=transcribe_model,
         transcribe_device=transcribe_device,
         transcribe_compute=transcribe_compute,
+        transcribe_workers=transcribe_workers,
+        transcribe_cpu_threads=transcribe_cpu_threads,
         vad_filter=vad_filter,
+        silence_skip_enabled=silence_skip_enabled,
+        silence_threshold_dbfs=silence_threshold_dbfs,
+        silence_min_active_seconds=silence_min_active_seconds,
+        live_transcribe_enabled=live_transcribe_enabled,
+        live_poll_seconds=live_poll_seconds,
+        live_transcribe_threads=live_transcribe_threads,
+        live_transcribe_nice=live_transcribe_nice,
+        live_summarize_enabled=live_summarize_enabled,
+        transcript_format=transcript_format,
+        transcript_compression=transcript_compression,
         language=language,
         conversation_gap_seconds=conversation_gap_seconds,
         conversation_max_words=conversation_max_words,
@@ -207,17 +324,41 @@ def load_config() -> AppConfig:
         llm_api_key=llm_api_key,
         llm_model=llm_model,
         llm_timeout_seconds=llm_timeout_seconds,
+        llm_max_concurrency=llm_max_concurrency,
+        llm_rollup_token_budget=llm_rollup_token_budget,
+        llm_cache_enabled=llm_cache_enabled,
+        llm_cache_max_mb=llm_cache_max_mb,
+        llm_cache_max_age_days=llm_cache_max_age_days,
+        job_workers=job_workers,
         schedule_enabled=schedule_enabled,
         schedule_start=schedule_start,
         schedule_end=schedule_end,
         schedule_days=schedule_days,
         schedule_timezone=schedule_timezone,
         schedule_auto_stop=schedule_auto_stop,
+        nightly_pipeline_time=nightly_pipeline_time,
+        after_hours_enabled=after_hours_enabled,
+        after_hours_nice=after_hours_nice,
+        model_idle_seconds=model_idle_seconds,
+        model_memory_mb=model_memory_mb,
+        model_prewarm=model_prewarm,
+        trace_enabled=trace_enabled,
+        trace_sample_rate=trace_sample_rate,
+        worker_lease_seconds=worker_lease_seconds,
+        worker_max_attempts=worker_max_attempts,
+        worker_token=worker_token,
+        archive_codec=archive_codec,
+        archive_opus_bitrate=archive_opus_bitrate,
+        archive_workers=archive_workers,
+        retain_audio_days=retain_audio_days,
+        retain_transcripts_days=retain_transcripts_days,
+        retain_summaries_days=retain_summaries_days,
         diarization_enabled=diarization_enabled,
         diarization_backend=diarization_backend,
         diarization_device=diarization_device,
         diarization_model=diarization_model,
         diarization_hf_token=diarization_hf_token,
+        diarization_split_segments=diarization_split_segments,
         openclaw_hook_url=openclaw_hook_url,
         openclaw_hook_token=openclaw_hook_token,
         openclaw_hook_to=openclaw_hook_to,
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Iterable
+from pathlib import Path
+import time
+from typing import Any, Iterable, Iterator
 
+from . import tracing
 from .config import AppConfig
+from .metrics import DIARIZE_SECONDS
+from .model_manager import DIARIZATION_ESTIMATE_BYTES, ModelManager
+
+DIARIZATION_MODEL = "diarization"
 
 
 @dataclass
@@ -13,16 +21,15 @@ class DiarizationResult:
 
 
 class Diarizer:
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(self, config: AppConfig, models: ModelManager | None = None) -> None:
         self._config = config
         self._pipeline = None
         self._whisperx = None
+        self._models = models
+        if models is not None and config.diarization_enabled:
+            models.register(DIARIZATION_MODEL, self._create_pipeline, DIARIZATION_ESTIMATE_BYTES)
 
-    def _load_pipeline(self) -> None:
-        if not self._config.diarization_enabled:
-            return
-        if self._pipeline is not None:
-            return
+    def _create_pipeline(self) -> tuple[Any, Any]:
         if self._config.diarization_backend != "whisperx":
             raise RuntimeError(f"Unsupported diarization backend: {self._config.diarization_backend}")
         try:
@@ -30,25 +37,60 @@ class Diarizer:
         except ImportError as exc:
             raise RuntimeError("whisperx is not installed") from exc
 
-        self._whisperx = whisperx
-        self._pipeline = whisperx.DiarizationPipeline(
+        pipeline = whisperx.DiarizationPipeline(
             use_auth_token=self._config.diarization_hf_token,
             device=self._config.diarization_device,
         )
+        return whisperx, pipeline
+
+    def _load_pipeline(self) -> None:
+        if not self._config.diarization_enabled:
+            return
+        if self._pipeline is not None:
+            return
+        with tracing.span("model.load", model=DIARIZATION_MODEL):
+            self._whisperx, self._pipeline = self._create_pipeline()
 
-    def diarize(self, audio_path: str, segments: list[dict[str, Any]]) -> DiarizationResult:
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        # Keeps the pipeline loaded across several diarize() calls.
+        if self._models is not None and self._config.diarization_enabled:
+            with self._models.use(DIARIZATION_MODEL):
+                yield
+            return
+        yield
+
+    def diarize(self, audio_path: str, segments: list[dict[str, Any]], audio: Any | None = None) -> DiarizationResult:
         if not self._config.diarization_enabled:
             return DiarizationResult(segments=segments, meta={"enabled": False})
 
+        if self._models is not None:
+            with self._models.use(DIARIZATION_MODEL) as (whisperx, pipeline):
+                return self._diarize(whisperx, pipeline, audio_path, segments, audio)
+
         self._load_pipeline()
         if self._pipeline is None or self._whisperx is None:
             return DiarizationResult(segments=segments, meta={"enabled": False})
+        return self._diarize(self._whisperx, self._pipeline, audio_path, segments, audio)
 
-        audio = self._whisperx.load_audio(audio_path)
-        diarization = self._pipeline(audio)
+    def _diarize(
+        self,
+        whisperx: Any,
+        pipeline: Any,
+        audio_path: str,
+        segments: list[dict[str, Any]],
+        audio: Any | None,
+    ) -> DiarizationResult:
+        started = time.perf_counter()
+        with tracing.span("diarize", file=Path(audio_path).name) as span:
+            if audio is None:
+                audio = whisperx.load_audio(audio_path)
+            diarization = pipeline(audio)
+            diarization_segments = _normalize_diarization(diarization)
+            span.set(turns=len(diarization_segments))
+        DIARIZE_SECONDS.observe(time.perf_counter() - started)
 
-        diarization_segments = _normalize_diarization(diarization)
-        labeled = _assign_speakers(segments, diarization_segments)
+        labeled = _assign_speakers(segments, diarization_segments, split=self._config.diarization_split_segments)
 
         meta = {
             "enabled": True,
@@ -68,27 +110,169 @@ def _normalize_diarization(diarization: Any) -> list[dict[str, Any]]:
     return []
 
 
-def _assign_speakers(
+# Above this many segment x turn pairs the NumPy path wins over the Python sweep.
+_VECTORIZE_MIN_PAIRS = 20_000
+_MIN_SPLIT_SECONDS = 0.5
+
+
+def _speaker_turns(diarization_segments: Iterable[dict[str, Any]]) -> list[tuple[float, float, str]]:
+    by_speaker: dict[str, list[tuple[float, float]]] = {}
+    for diar in diarization_segments:
+        d_start = float(diar.get("start", 0.0))
+        d_end = float(diar.get("end", d_start))
+        if d_end <= d_start:
+            continue
+        by_speaker.setdefault(diar.get("speaker", "unknown"), []).append((d_start, d_end))
+
+    # Merge overlapping turns of the same speaker so overlap totals are not double counted.
+    turns: list[tuple[float, float, str]] = []
+    for speaker, spans in by_speaker.items():
+        spans.sort()
+        cur_start, cur_end = spans[0]
+        for d_start, d_end in spans[1:]:
+            if d_start <= cur_end:
+                cur_end = max(cur_end, d_end)
+                continue
+            turns.append((cur_start, cur_end, speaker))
+            cur_start, cur_end = d_start, d_end
+        turns.append((cur_start, cur_end, speaker))
+    turns.sort(key=lambda turn: (turn[0], turn[1]))
+    return turns
+
+
+def _split_segment(
+    segment: dict[str, Any],
+    start: float,
+    end: float,
+    active: list[tuple[float, float, str]],
+) -> list[dict[str, Any]]:
+    changes: list[tuple[float, str]] = []
+    for d_start, d_end, speaker in active:
+        if min(end, d_end) - max(start, d_start) <= 0:
+            continue
+        piece_start = max(start, d_start)
+        if changes and changes[-1][1] == speaker:
+            continue
+        if changes and piece_start - changes[-1][0] < _MIN_SPLIT_SECONDS:
+            # The previous piece is too short to stand alone; hand it to this speaker.
+            changes[-1] = (changes[-1][0], speaker)
+            if len(changes) > 1 and changes[-2][1] == speaker:
+                changes.pop()
+            continue
+        changes.append((piece_start, speaker))
+    if changes and end - changes[-1][0] < _MIN_SPLIT_SECONDS:
+        changes.pop()
+    if len(changes) <= 1:
+        return []
+
+    bounds = [start] + [piece_start for piece_start, _ in changes[1:]] + [end]
+    # Whisper segments carry no word timings; share words out by piece duration.
+    words = str(segment.get("text", "")).split()
+    duration = end - start
+    split: list[dict[str, Any]] = []
+    taken = 0
+    for index, (_, speaker) in enumerate(changes):
+        piece_start, piece_end = bounds[index], bounds[index + 1]
+        upto = len(words) if index == len(changes) - 1 else round(len(words) * (piece_end - start) / duration)
+        piece_words = words[taken:max(taken, upto)]
+        taken += len(piece_words)
+        split.append({**segment, "start": piece_start, "end": piece_end, "text": " ".join(piece_words), "speaker": speaker})
+    return split
+
+
+def _assign_speakers_sweep(
     segments: list[dict[str, Any]],
-    diarization_segments: Iterable[dict[str, Any]],
+    turns: list[tuple[float, float, str]],
+    split: bool,
 ) -> list[dict[str, Any]]:
-    labeled: list[dict[str, Any]] = []
-    diarization_list = list(diarization_segments)
+    labeled: list[list[dict[str, Any]]] = [[] for _ in segments]
+    order = sorted(range(len(segments)), key=lambda i: float(segments[i].get("start", 0.0)))
+    active: list[tuple[float, float, str]] = []
+    next_turn = 0
 
-    for segment in segments:
+    for index in order:
+        segment = segments[index]
         start = float(segment.get("start", 0.0))
         end = float(segment.get("end", start))
+        while next_turn < len(turns) and turns[next_turn][0] < end:
+            active.append(turns[next_turn])
+            next_turn += 1
+        # Segments are visited by start time, so turns ending before this start are done.
+        active = [turn for turn in active if turn[1] > start]
+
+        overlaps: dict[str, float] = {}
+        for d_start, d_end, speaker in active:
+            overlap = min(end, d_end) - max(start, d_start)
+            if overlap > 0:
+                overlaps[speaker] = overlaps.get(speaker, 0.0) + overlap
+
+        if split and len(overlaps) > 1:
+            pieces = _split_segment(segment, start, end, active)
+            if pieces:
+                labeled[index] = pieces
+                continue
+
         best_speaker = "unknown"
         best_overlap = 0.0
-
-        for diar in diarization_list:
-            d_start = float(diar.get("start", 0.0))
-            d_end = float(diar.get("end", d_start))
-            overlap = max(0.0, min(end, d_end) - max(start, d_start))
+        for speaker, overlap in overlaps.items():
             if overlap > best_overlap:
                 best_overlap = overlap
-                best_speaker = diar.get("speaker", "unknown")
+                best_speaker = speaker
+        labeled[index] = [{**segment, "speaker": best_speaker}]
+
+    return [piece for pieces in labeled for piece in pieces]
 
-        labeled.append({**segment, "speaker": best_speaker})
 
+def _assign_speakers_numpy(
+    segments: list[dict[str, Any]],
+    turns: list[tuple[float, float, str]],
+) -> list[dict[str, Any]]:
+    import numpy as np
+
+    starts = np.fromiter((float(seg.get("start", 0.0)) for seg in segments), dtype=np.float64, count=len(segments))
+    ends = np.fromiter(
+        (float(seg.get("end", seg.get("start", 0.0))) for seg in segments),
+        dtype=np.float64,
+        count=len(segments),
+    )
+    ends = np.maximum(ends, starts)
+
+    speakers: list[str] = []
+    for _, _, speaker in turns:
+        if speaker not in speakers:
+            speakers.append(speaker)
+
+    # Per speaker, cumulative talk time C(t) is piecewise linear over its merged
+    # turns, so the overlap with [s, e] is C(e) - C(s) via np.interp.
+    overlaps = np.zeros((len(segments), len(speakers)), dtype=np.float64)
+    for column, speaker in enumerate(speakers):
+        spans = np.array([(d_start, d_end) for d_start, d_end, name in turns if name == speaker], dtype=np.float64)
+        lengths = spans[:, 1] - spans[:, 0]
+        covered_before = np.concatenate(([0.0], np.cumsum(lengths)[:-1]))
+        xs = spans.reshape(-1)
+        ys = np.column_stack((covered_before, covered_before + lengths)).reshape(-1)
+        overlaps[:, column] = np.interp(ends, xs, ys) - np.interp(starts, xs, ys)
+
+    best = overlaps.argmax(axis=1)
+    best_overlap = overlaps[np.arange(len(segments)), best]
+    labeled: list[dict[str, Any]] = []
+    for segment, column, overlap in zip(segments, best.tolist(), best_overlap.tolist()):
+        speaker = speakers[column] if overlap > 1e-9 else "unknown"
+        labeled.append({**segment, "speaker": speaker})
     return labeled
+
+
+def _assign_speakers(
+    segments: list[dict[str, Any]],
+    diarization_segments: Iterable[dict[str, Any]],
+    split: bool = False,
+) -> list[dict[str, Any]]:
+    turns = _speaker_turns(diarization_segments)
+    if not turns:
+        return [{**segment, "speaker": "unknown"} for segment in segments]
+    if not split and len(segments) * len(turns) >= _VECTORIZE_MIN_PAIRS:
+        try:
+            return _assign_speakers_numpy(segments, turns)
+        except ImportError:
+            pass
+    return _assign_speakers_sweep(segments, turns, split)
@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Iterator
+import uuid
+
+ACTIVE_STATES = ("queued", "running")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    date: str
+    stage: str
+    priority: int
+    state: str
+    params: dict[str, Any]
+    progress_done: int
+    progress_total: int
+    message: str | None
+    error: str | None
+    cancel_requested: bool
+    created_at: float
+    started_at: float | None
+    finished_at: float | None
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        now = time.time()
+        payload["queued_seconds"] = (self.started_at or self.finished_at or now) - self.created_at
+        payload["run_seconds"] = (self.finished_at or now) - self.started_at if self.started_at is not None else None
+        return payload
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL,
+    params TEXT NOT NULL DEFAULT '{}',
+    progress_done INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER NOT NULL DEFAULT 0,
+    message TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state_idx ON jobs (state, priority, created_at);
+CREATE INDEX IF NOT EXISTS jobs_day_stage_idx ON jobs (date, stage, state);
+CREATE TABLE IF NOT EXISTS day_holds (
+    date TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL
+);
+"""
+
+
+def _merge_params(existing: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    # Flags such as send_to_openclaw are requests for extra work, so either
+    # submission asking for it wins; other values keep the first submission's.
+    merged = dict(existing)
+    for key, value in new.items():
+        if isinstance(value, bool):
+            merged[key] = bool(merged.get(key)) or value
+        else:
+            merged.setdefault(key, value)
+    return merged
+
+
+def _row_to_job(row: sqlite3.Row) -> Job:
+    return Job(
+        id=row["id"],
+        date=row["date"],
+        stage=row["stage"],
+        priority=row["priority"],
+        state=row["state"],
+        params=json.loads(row["params"] or "{}"),
+        progress_done=row["progress_done"],
+        progress_total=row["progress_total"],
+        message=row["message"],
+        error=row["error"],
+        cancel_requested=bool(row["cancel_requested"]),
+        created_at=row["created_at"],
+        started_at=row["started_at"],
+        finished_at=row["finished_at"],
+    )
+
+
+class JobStore:
+    def __init__(self, path: Path) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def _get_locked(self, job_id: str) -> Job:
+        return _row_to_job(self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list(self, state: str | None = None, limit: int = 100) -> list[Job]:
+        query = "SELECT * FROM jobs"
+        args: tuple[Any, ...] = ()
+        if state:
+            query += " WHERE state = ?"
+            args = (state,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, args + (limit,)).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def count(self, state: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE state = ?", (state,)).fetchone()
+        return int(row[0])
+
+    def create(
+        self,
+        date_str: str,
+        stage: str,
+        priority: int,
+        params: dict[str, Any],
+        same_work: tuple[str, ...] = (),
+    ) -> tuple[Job, bool]:
+        # same_work: other stages whose active jobs already cover this submission.
+        stages = (stage, *same_work)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    f"SELECT * FROM jobs WHERE date = ? AND stage IN ({', '.join('?' * len(stages))}) "
+                    "AND state IN (?, ?) ORDER BY created_at",
+                    (date_str, *stages) + ACTIVE_STATES,
+                ).fetchall()
+                # A queued job absorbs the new params; a running one only covers
+                # submissions that ask for nothing it is not already doing.
+                existing = next((row for row in rows if row["state"] == "queued"), None)
+                if existing is not None:
+                    current = json.loads(existing["params"] or "{}")
+                    merged = _merge_params(current, params)
+                    self._conn.execute(
+                        "UPDATE jobs SET priority = MAX(priority, ?), params = ? WHERE id = ?",
+                        (priority, json.dumps(merged), existing["id"]),
+                    )
+                    self._conn.execute("COMMIT")
+                    return self._get_locked(existing["id"]), False
+                for row in rows:
+                    current = json.loads(row["params"] or "{}")
+                    if _merge_params(current, params) == current:
+                        self._conn.execute("COMMIT")
+                        return _row_to_job(row), False
+                job_id = uuid.uuid4().hex[:12]
+                self._conn.execute(
+                    "INSERT INTO jobs (id, date, stage, priority, state, params, created_at) "
+                    "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                    (job_id, date_str, stage, priority, json.dumps(params), time.time()),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = self.get(job_id)
+        assert job is not None
+        return job, True
+
+    def claim_next(self, exclusive: tuple[str, ...] = ()) -> Job | None:
+        # Jobs in an exclusive stage never run alongside another exclusive job for
+        # the same day; they stay queued until it finishes.
+        query = "SELECT id FROM jobs AS candidate WHERE state = 'queued'"
+        if exclusive:
+            marks = ", ".join("?" * len(exclusive))
+            query += (
+                f" AND NOT (stage IN ({marks}) AND EXISTS (SELECT 1 FROM jobs AS other WHERE other.state = 'running'"
+                f" AND other.date = candidate.date AND other.stage IN ({marks})))"
+                f" AND NOT (stage IN ({marks}) AND EXISTS (SELECT 1 FROM day_holds WHERE day_holds.date = candidate.date))"
+            )
+        query += " ORDER BY priority DESC, created_at LIMIT 1"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(query, exclusive * 3).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET state = 'running', started_at = ?, finished_at = NULL, error = NULL WHERE id = ?",
+                    (time.time(), row["id"]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def hold_day(self, date_str: str, job_id: str, exclusive: tuple[str, ...]) -> bool:
+        # Lets a job outside the exclusive stages (a range rollup) write one day's
+        # artifacts: granted only while no exclusive job runs for that day, and
+        # exclusive jobs for the day are not claimed until it is released.
+        marks = ", ".join("?" * len(exclusive)) or "NULL"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                busy = self._conn.execute(
+                    f"SELECT 1 FROM jobs WHERE state = 'running' AND date = ? AND stage IN ({marks})",
+                    (date_str, *exclusive),
+                ).fetchone()
+                held = busy is None and (
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO day_holds (date, job_id) VALUES (?, ?)", (date_str, job_id)
+                    ).rowcount
+                    == 1
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return held
+
+    def release_day(self, date_str: str, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM day_holds WHERE date = ? AND job_id = ?", (date_str, job_id))
+
+    def update_progress(self, job_id: str, done: int, total: int, message: str | None) -> bool:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET progress_done = ?, progress_total = ?, message = COALESCE(?, message) WHERE id = ?",
+                (done, total, message, job_id),
+            )
+            row = self._conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def finish(self, job_id: str, state: str, error: str | None = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, finished_at = ? WHERE id = ?",
+                (state, error, time.time(), job_id),
+            )
+
+    def request_cancel(self, job_id: str) -> Job | None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = 'cancelled', finished_at = ?, cancel_requested = 1 "
+                "WHERE id = ? AND state = 'queued'",
+                (time.time(), job_id),
+            )
+            self._conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND state = 'running'",
+                (job_id,),
+            )
+        return self.get(job_id)
+
+    def requeue_interrupted(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = 'queued', started_at = NULL, message = 'resumed after restart' "
+                "WHERE state = 'running' AND cancel_requested = 0"
+            )
+            self._conn.execute(
+                "UPDATE jobs SET state = 'cancelled', finished_at = ? WHERE state = 'running'",
+                (time.time(),),
+            )
+            self._conn.execute("DELETE FROM day_holds")
+        return cursor.rowcount
+
+
+class JobContext:
+    def __init__(self, store: JobStore, job: Job, exclusive: tuple[str, ...] = ()) -> None:
+        self._store = store
+        self._exclusive = exclusive
+        self.job = job
+
+    @contextmanager
+    def hold_day(self, date_str: str) -> Iterator[bool]:
+        # Yields False, without waiting, when an exclusive job has the day.
+        held = self._store.hold_day(date_str, self.job.id, self._exclusive)
+        try:
+            yield held
+        finally:
+            if held:
+                self._store.release_day(date_str, self.job.id)
+
+    def progress(self, done: int, total: int, message: str | None = None) -> None:
+        if self._store.update_progress(self.job.id, done, total, message):
+            raise JobCancelled(self.job.id)
+
+
+JobHandler = Callable[[Job, JobContext], None]
+
+
+class JobQueue:
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: dict[str, JobHandler],
+        concurrency: int = 1,
+        exclusive_stages: tuple[str, ...] = (),
+        equivalent_stages: tuple[tuple[str, ...], ...] = (),
+    ) -> None:
+        self._store = store
+        self._handlers = handlers
+        self._concurrency = max(1, concurrency)
+        self._exclusive_stages = exclusive_stages
+        # Stages in one group do the same work for a day (e.g. the nightly and
+        # after-hours pipelines), so they deduplicate against each other.
+        self._same_work = {
+            stage: tuple(other for other in group if other != stage) for group in equivalent_stages for stage in group
+        }
+        self._wakeup = threading.Condition()
+        self._stop_event = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def store(self) -> JobStore:
+        return self._store
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._store.requeue_interrupted()
+        self._stop_event.clear()
+        for index in range(self._concurrency):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+
+    def submit(
+        self,
+        date_str: str,
+        stage: str,
+        priority: int = 0,
+        params: dict[str, Any] | None = None,
+    ) -> tuple[Job, bool]:
+        if stage not in self._handlers:
+            raise ValueError(f"Unknown job stage: {stage}")
+        job, created = self._store.create(date_str, stage, priority, params or {}, self._same_work.get(stage, ()))
+        if created:
+            self._wake()
+        return job, created
+
+    def _wake(self) -> None:
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def cancel(self, job_id: str) -> Job | None:
+        return self._store.request_cancel(job_id)
+
+    def _worker(self) -> None:
+        while not self._stop_event.is_set():
+            job = self._store.claim_next(self._exclusive_stages)
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(timeout=5)
+                continue
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        context = JobContext(self._store, job, self._exclusive_stages)
+        try:
+            self._handlers[job.stage](job, context)
+        except JobCancelled:
+            self._store.finish(job.id, "cancelled")
+        except Exception as exc:
+            self._store.finish(job.id, "failed", error=str(exc))
+        else:
+            self._store.finish(job.id, "succeeded")
+        finally:
+            # Jobs held back by this one's day lock can run now.
+            self._wake()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+import uuid
+
+from .storage import Storage
+from .transcript_store import find_transcript, transcript_path_for, write_transcript
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    date TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    token TEXT,
+    worker TEXT,
+    expires_at REAL,
+    error TEXT,
+    PRIMARY KEY (date, segment)
+);
+CREATE TABLE IF NOT EXISTS leases (
+    token TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class Lease:
+    token: str
+    date: str
+    segment: str
+    audio_name: str
+    worker: str
+    expires_at: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class LeaseError(Exception):
+    pass
+
+
+# Hands out untranscribed, closed audio segments to remote workers. A lease is
+# only a claim: it expires unless renewed, and an expired segment goes back into
+# the pool until max_attempts is reached. Commits are keyed by segment, so a late
+# commit from a worker whose lease expired is still accepted exactly once.
+class LeaseManager:
+    def __init__(
+        self,
+        path: Path,
+        storage: Storage,
+        lease_seconds: float = 600.0,
+        max_attempts: int = 3,
+        open_segment: Callable[[str], str | None] | None = None,
+        local_in_flight: Callable[[], set[Path]] | None = None,
+    ) -> None:
+        self._storage = storage
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        # Returns the stem still being written by the recorder for a day, if any.
+        self._open_segment = open_segment
+        # Audio files this process is already transcribing (live, jobs, after hours).
+        self._local_in_flight = local_in_flight
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _candidates(self, date_str: str | None) -> list[tuple[str, Path]]:
+        days = [date_str] if date_str else self._storage.list_days()
+        busy = self._local_in_flight() if self._local_in_flight is not None else set()
+        candidates: list[tuple[str, Path]] = []
+        for day in days:
+            pending = self._storage.pending_audio(day)
+            if not pending:
+                continue
+            open_stem = self._open_segment(day) if self._open_segment is not None else None
+            for audio_file in pending:
+                if audio_file.stem == open_stem or audio_file in busy:
+                    continue
+                candidates.append((day, audio_file))
+        return candidates
+
+    def acquire(self, worker: str, date_str: str | None = None) -> Lease | None:
+        candidates = self._candidates(date_str)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for day, audio_file in candidates:
+                    row = self._conn.execute(
+                        "SELECT state, attempts, expires_at FROM segments WHERE date = ? AND segment = ?",
+                        (day, audio_file.stem),
+                    ).fetchone()
+                    if row is not None:
+                        if row["state"] == "committed" or row["attempts"] >= self._max_attempts:
+                            continue
+                        if row["state"] == "leased" and row["expires_at"] > now:
+                            continue
+                    token = uuid.uuid4().hex
+                    expires_at = now + self._lease_seconds
+                    self._conn.execute(
+                        "INSERT INTO segments (date, segment, state, attempts, token, worker, expires_at) "
+                        "VALUES (?, ?, 'leased', 1, ?, ?, ?) "
+                        "ON CONFLICT(date, segment) DO UPDATE SET state = 'leased', attempts = attempts + 1, "
+                        "token = excluded.token, worker = excluded.worker, expires_at = excluded.expires_at",
+                        (day, audio_file.stem, token, worker, expires_at),
+                    )
+                    self._conn.execute(
+                        "INSERT INTO leases (token, date, segment, worker, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (token, day, audio_file.stem, worker, now),
+                    )
+                    self._conn.execute("COMMIT")
+                    return Lease(token, day, audio_file.stem, audio_file.name, worker, expires_at)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return None
+
+    def _lookup(self, token: str) -> sqlite3.Row:
+        row = self._conn.execute("SELECT date, segment FROM leases WHERE token = ?", (token,)).fetchone()
+        if row is None:
+            raise LeaseError("unknown_lease")
+        return row
+
+    def audio_path(self, token: str) -> Path:
+        with self._lock:
+            row = self._lookup(token)
+        for audio_file in self._storage.list_audio_files(row["date"]):
+            if audio_file.stem == row["segment"]:
+                return audio_file
+        raise LeaseError("audio_not_found")
+
+    def renew(self, token: str) -> float:
+        expires_at = time.time() + self._lease_seconds
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE segments SET expires_at = ? WHERE token = ? AND state = 'leased'",
+                (expires_at, token),
+            )
+        if cursor.rowcount == 0:
+            raise LeaseError("lease_lost")
+        return expires_at
+
+    def fail(self, token: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE segments SET state = 'failed', expires_at = NULL, error = ? WHERE token = ? AND state = 'leased'",
+                (error[:2000], token),
+            )
+
+    def commit(self, token: str, payload: dict[str, Any], transcript_format: str, compression: str) -> tuple[str, bool]:
+        with self._lock:
+            row = self._lookup(token)
+            date_str, segment = row["date"], row["segment"]
+            transcripts_dir = self._storage.get_day(date_str).transcripts_dir
+            created = find_transcript(transcripts_dir, segment) is None
+            if created:
+                audio_dir = self._storage.get_day(date_str).audio_dir
+                payload = {**payload, "audio_path": str(audio_dir / Path(str(payload.get("audio_path", segment))).name)}
+                write_transcript(transcript_path_for(transcripts_dir, segment, transcript_format), payload, compression)
+            self._conn.execute(
+                "UPDATE segments SET state = 'committed', expires_at = NULL, error = NULL WHERE date = ? AND segment = ?",
+                (date_str, segment),
+            )
+        return date_str, created
+
+    def status(self) -> dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, segment, state, attempts, worker, expires_at, error FROM segments "
+                "WHERE state != 'committed' ORDER BY date, segment"
+            ).fetchall()
+        leases = []
+        for row in rows:
+            entry = dict(row)
+            if entry["state"] == "leased" and (entry["expires_at"] or 0) <= now:
+                entry["state"] = "expired"
+            leases.append(entry)
+        return {"lease_seconds": self._lease_seconds, "max_attempts": self._max_attempts, "segments": leases}
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import replace
+import multiprocessing
+from pathlib import Path
+import threading
+from typing import Any, Callable
+
+from .config import AppConfig
+from .recording import RecorderManager, RecorderState
+from .storage import Storage
+from .transcript_store import find_transcript, transcript_path_for
+from .transcription import WorkerResult, claimed_audio, init_transcribe_worker, transcribe_in_worker, worker_result
+from .utils import segment_index
+
+
+# A segment is closed once ffmpeg has rotated to a higher-numbered file, or once
+# the recording has stopped. Closed segments are transcribed by a single niced
+# worker process with its own thread budget so ffmpeg capture is never starved.
+class LiveTranscriber:
+    def __init__(
+        self,
+        config: AppConfig,
+        storage: Storage,
+        recorder: RecorderManager,
+        diarize: bool,
+        on_transcribed: Callable[[str], None] | None = None,
+    ) -> None:
+        self._config = config
+        self._on_transcribed = on_transcribed
+        self._storage = storage
+        self._recorder = recorder
+        self._diarize = diarize
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending: dict[Path, Future[WorkerResult]] = {}
+        self._failed: set[Path] = set()
+        self._date: str | None = None
+        self._completed = 0
+        self._last_error: str | None = None
+
+    def on_recording_start(self, state: RecorderState) -> None:
+        self.start()
+
+    def start(self) -> None:
+        if not self._config.live_transcribe_enabled:
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self._shutdown_executor(wait=False)
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            pending = sorted(path.name for path in self._pending)
+        return {
+            "enabled": self._config.live_transcribe_enabled,
+            "running": bool(self._thread and self._thread.is_alive()),
+            "date": self._date,
+            "pending": pending,
+            "completed": self._completed,
+            "last_error": self._last_error,
+        }
+
+    def in_flight(self) -> set[Path]:
+        with self._lock:
+            return set(self._pending)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            worker_config = replace(self._config, transcribe_cpu_threads=self._config.live_transcribe_threads)
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_transcribe_worker,
+                initargs=(worker_config, self._diarize, self._config.live_transcribe_nice),
+            )
+        return self._executor
+
+    def _shutdown_executor(self, wait: bool) -> None:
+        executor = self._executor
+        self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _notify(self, seen: int) -> int:
+        completed = self._completed
+        if completed != seen and self._date is not None and self._on_transcribed is not None:
+            self._on_transcribed(self._date)
+        return completed
+
+    def _loop(self) -> None:
+        seen = self._completed
+        while not self._stop_event.is_set():
+            state = self._recorder.active_state()
+            if state is None:
+                # Recording stopped: the final segment is closed as well.
+                if self._date is not None:
+                    self._queue_closed(self._date, include_last=True)
+                break
+            self._date = state.date
+            self._queue_closed(state.date, include_last=False)
+            seen = self._notify(seen)
+            self._stop_event.wait(self._config.live_poll_seconds)
+
+        if not self._stop_event.is_set():
+            self._shutdown_executor(wait=True)
+            self._notify(seen)
+
+    def _queue_closed(self, date_str: str, include_last: bool) -> None:
+        day = self._storage.get_day(date_str)
+        audio_files = sorted(self._storage.list_audio_files(date_str), key=lambda path: segment_index(path.stem))
+        closed = audio_files if include_last else audio_files[:-1]
+        claimed = claimed_audio()
+        for audio_file in closed:
+            with self._lock:
+                if audio_file in self._pending or audio_file in self._failed or audio_file in claimed:
+                    continue
+                if find_transcript(day.transcripts_dir, audio_file.stem) is not None:
+                    continue
+                transcript_path = transcript_path_for(day.transcripts_dir, audio_file.stem, self._config.transcript_format)
+                future = self._get_executor().submit(transcribe_in_worker, audio_file, transcript_path)
+                self._pending[audio_file] = future
+            future.add_done_callback(lambda fut, path=audio_file: self._on_done(path, fut))
+
+    def _on_done(self, audio_file: Path, future: Future[WorkerResult]) -> None:
+        with self._lock:
+            self._pending.pop(audio_file, None)
+            if future.cancelled():
+                return
+            exc = future.exception()
+            if exc is not None:
+                self._failed.add(audio_file)
+                self._last_error = f"{audio_file.name}: {exc}"
+            else:
+                worker_result(future.result())
+                self._completed += 1
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+from .utils import ensure_dir
+
+
+def cache_key(model: str, messages: list[dict[str, str]], temperature: float, max_tokens: int | None) -> str:
+    payload = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Content-addressed LLM completions: one JSON file per key, fanned out by the first
+# two hex chars. File mtime doubles as the LRU clock and is bumped on every hit.
+class ResponseCache:
+    def __init__(self, directory: Path, max_bytes: int, max_age_seconds: float) -> None:
+        self._dir = ensure_dir(directory)
+        self._max_bytes = max_bytes
+        self._max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> Path:
+        return self._dir / key[:2] / f"{key}.json"
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        entries: list[tuple[Path, int, float]] = []
+        for path in self._dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return self._max_age_seconds > 0 and now - mtime > self._max_age_seconds
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        now = time.time()
+        try:
+            stat = path.stat()
+            if self._expired(stat.st_mtime, now):
+                raise FileNotFoundError(path)
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path, (now, now))
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return payload.get("content")
+
+    def put(self, key: str, content: str, request: dict[str, Any]) -> None:
+        path = self._path(key)
+        ensure_dir(path.parent)
+        data = json.dumps({**request, "key": key, "content": content, "created_at": time.time()}, ensure_ascii=False)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        previous = path.stat().st_size if path.exists() else 0
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._writes += 1
+            self._total_bytes += path.stat().st_size - previous
+            over_budget = self._max_bytes > 0 and self._total_bytes > self._max_bytes
+        if over_budget:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                return
+            self._total_bytes -= size
+
+    def evict(self) -> int:
+        now = time.time()
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for path, size, mtime in entries:
+                if not self._expired(mtime, now) and (self._max_bytes <= 0 or total <= self._max_bytes):
+                    continue
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            self._total_bytes = total
+            self._evictions += removed
+            return removed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "directory": str(self._dir),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "writes": self._writes,
+                "evictions": self._evictions,
+                "bytes": self._total_bytes,
+                "max_bytes": self._max_bytes,
+                "max_age_seconds": self._max_age_seconds,
+            }
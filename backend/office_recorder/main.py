@@ -1,29 +1,316 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import date, datetime, timedelta
+import json
 from pathlib import Path
-from fastapi import BackgroundTasks, FastAPI, HTTPException
-from fastapi.responses import FileResponse
+import time
+from typing import Any, AsyncIterator, Callable
+from fastapi import Body, Depends, FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
+from .after_hours import AfterHoursProcessor
+from .archive import Archiver
 from .config import load_config
-from .models import StartRecordingRequest, SummarizeRequest
+from .leases import LeaseError, LeaseManager
+from .models import StartRecordingRequest, SummarizeRequest, WorkerFailRequest, WorkerLeaseRequest
 from .openclaw import send_hook_message
 from .recording import RecorderManager
 from .diarization import Diarizer
+from .jobs import Job, JobContext, JobHandler, JobQueue, JobStore
+from .live import LiveTranscriber
+from .llm_cache import ResponseCache
+from .merged import MergedTranscripts
+from .model_manager import ModelManager
+from .metrics import DISK_BYTES, QUEUE_DEPTH, RECORDER_UPTIME, REGISTRY
 from .scheduler import ScheduleRunner
+from .search import SearchIndex
 from .storage import Storage
-from .transcription import Transcriber, transcribe_day
-from .summarization import Summarizer, summarize_day
-from .utils import read_json, today_str
+from .transcript_store import read_transcript_meta
+from .transcription import Transcriber, claimed_audio, transcribe_day
+from .summarization import RollingSummarizer, Summarizer, summarize_day, summarize_range
+from .tracing import trace_run
+from .utils import now_local, read_json, segment_index, today_str
 
 
 config = load_config()
 storage = Storage(config.data_dir)
 recorder = RecorderManager(config, storage)
-transcriber = Transcriber(config)
-diarizer = Diarizer(config)
-summarizer = Summarizer(config)
+models = ModelManager(budget_bytes=config.model_memory_mb * 1024 * 1024, idle_seconds=config.model_idle_seconds)
+transcriber = Transcriber(config, models=models)
+diarizer = Diarizer(config, models=models)
+llm_cache = (
+    ResponseCache(
+        storage.cache_dir("llm"),
+        max_bytes=config.llm_cache_max_mb * 1024 * 1024,
+        max_age_seconds=config.llm_cache_max_age_days * 86400,
+    )
+    if config.llm_cache_enabled
+    else None
+)
+summarizer = Summarizer(config, cache=llm_cache)
 scheduler = ScheduleRunner(config, recorder)
+search_index = SearchIndex(storage.search_db_path())
+merged_transcripts = MergedTranscripts(storage, config.segment_seconds)
+rolling_summarizer = RollingSummarizer(storage, summarizer)
+
+
+def _index_transcripts(date_str: str) -> None:
+    search_index.sync_day(storage, date_str, config.segment_seconds)
+    merged_transcripts.sync(date_str)
+
+
+def _on_live_transcribed(date_str: str) -> None:
+    _index_transcripts(date_str)
+    if config.live_summarize_enabled:
+        rolling_summarizer.notify(date_str)
+
+
+live_transcriber = LiveTranscriber(
+    config,
+    storage,
+    recorder,
+    diarize=config.diarization_enabled,
+    on_transcribed=_on_live_transcribed,
+)
+recorder.add_start_listener(live_transcriber.on_recording_start)
+after_hours = AfterHoursProcessor(config, storage, recorder)
+
+
+def _open_segment(date_str: str) -> str | None:
+    state = recorder.active_state()
+    if state is None or state.date != date_str:
+        return None
+    audio_files = storage.list_audio_files(date_str)
+    if not audio_files:
+        return None
+    return max(audio_files, key=lambda path: segment_index(path.stem)).stem
+
+
+def _busy_audio(date_str: str) -> set[Path]:
+    # Audio local jobs must leave alone: the live worker's queue and the segment
+    # ffmpeg is still writing.
+    busy = live_transcriber.in_flight()
+    open_stem = _open_segment(date_str)
+    if open_stem is not None:
+        busy.update(path for path in storage.list_audio_files(date_str) if path.stem == open_stem)
+    return busy
+
+
+def _local_in_flight() -> set[Path]:
+    return live_transcriber.in_flight() | claimed_audio()
+
+
+leases = LeaseManager(
+    storage.leases_db_path(),
+    storage,
+    lease_seconds=config.worker_lease_seconds,
+    max_attempts=config.worker_max_attempts,
+    open_segment=_open_segment,
+    local_in_flight=_local_in_flight,
+)
+archiver = Archiver(config, storage, open_segment=_open_segment)
+
+
+def _notify_openclaw(summary: dict[str, object], job: Job) -> None:
+    if job.params.get("send_to_openclaw"):
+        daily = summary.get("daily_summary", {})
+        text = (daily.get("overview") if isinstance(daily, dict) else None) or "Daily summary ready."
+        send_hook_message(config, text)
+
+
+def _queue_archive(date_str: str) -> None:
+    if config.archive_codec or config.retain_audio_days or config.retain_transcripts_days or config.retain_summaries_days:
+        job_queue.submit(date_str, "archive", priority=-20)
+
+
+def _run_transcribe_job(job: Job, context: JobContext) -> None:
+    transcribe_day(
+        storage,
+        transcriber,
+        job.date,
+        diarizer,
+        config.transcribe_workers,
+        progress=context.progress,
+        skip=_busy_audio(job.date),
+    )
+    _index_transcripts(job.date)
+    _queue_archive(job.date)
+
+
+def _summarize_progress(context: JobContext) -> Callable[[int, int], None]:
+    # Block-level progress doubles as the cancellation check during summarization.
+    def progress(done: int, total: int) -> None:
+        context.progress(done, total, "summarizing")
+
+    return progress
+
+
+def _run_summarize_job(job: Job, context: JobContext) -> None:
+    context.progress(0, 1, "summarizing")
+    summary = summarize_day(storage, summarizer, job.date, progress=_summarize_progress(context))
+    context.progress(1, 1, "summarized")
+    _notify_openclaw(summary, job)
+
+
+def _run_pipeline_job(job: Job, context: JobContext) -> None:
+    def _transcribe_progress(done: int, total: int) -> None:
+        context.progress(done, total + 1, "transcribing")
+
+    transcribe_day(
+        storage,
+        transcriber,
+        job.date,
+        diarizer,
+        config.transcribe_workers,
+        progress=_transcribe_progress,
+        skip=_busy_audio(job.date),
+    )
+    _index_transcripts(job.date)
+    summary = summarize_day(storage, summarizer, job.date, progress=_summarize_progress(context))
+    context.progress(1, 1, "summarized")
+    _notify_openclaw(summary, job)
+    _queue_archive(job.date)
+
+
+def _run_rollup_job(job: Job, context: JobContext) -> None:
+    summarize_range(
+        storage,
+        summarizer,
+        str(job.params["date_from"]),
+        str(job.params["date_to"]),
+        progress=lambda done, total: context.progress(done, total, "rolling up"),
+        hold_day=context.hold_day,
+    )
+
+
+def _run_after_hours_job(job: Job, context: JobContext) -> None:
+    def _transcribe_progress(done: int, total: int, message: str | None) -> None:
+        context.progress(done, total + 1, message)
+
+    after_hours.transcribe_day(
+        job.date, diarize=config.diarization_enabled, progress=_transcribe_progress, skip=_busy_audio(job.date)
+    )
+    _index_transcripts(job.date)
+    after_hours.wait_while_recording(context.progress, 0, 1)
+    context.progress(0, 1, "summarizing")
+    summary = summarize_day(storage, summarizer, job.date, progress=_summarize_progress(context))
+    context.progress(1, 1, "summarized")
+    _notify_openclaw(summary, job)
+    _queue_archive(job.date)
+
+
+def _run_archive_job(job: Job, context: JobContext) -> None:
+    archiver.archive_day(job.date, progress=context.progress)
+    removed = archiver.apply_retention()
+    for date_str in removed["days"]:
+        _index_transcripts(date_str)
+    context.progress(1, 1, f"archived; pruned {removed['bytes']} bytes")
+
+
+def _queue_unsummarized_days(stage: str, since: date, priority: int = 0) -> None:
+    # Queue every recent day with audio still to transcribe or a summary older
+    # than its transcripts (or none yet); the job store deduplicates against
+    # anything already queued or running.
+    recording = recorder.active_state()
+    for date_str in storage.list_days():
+        if date_str < since.isoformat() or (recording is not None and recording.date == date_str):
+            continue
+        if not storage.pending_audio(date_str) and (
+            storage.summary_is_current(date_str) or not storage.list_transcript_files(date_str)
+        ):
+            continue
+        job_queue.submit(date_str, stage, priority=priority, params={"send_to_openclaw": False})
+
+
+def _nightly_pipeline(fired_at: datetime) -> None:
+    _queue_unsummarized_days("pipeline", fired_at.date() - timedelta(days=7))
+
+
+def _on_schedule_transition(active: bool) -> None:
+    if not active and config.after_hours_enabled:
+        # Low priority so anything queued by hand runs first.
+        _queue_unsummarized_days("after_hours", date.today() - timedelta(days=7), priority=-10)
+
+
+def _traced(handler: JobHandler) -> JobHandler:
+    # Day-scoped jobs append their spans to that day's trace.json.
+    def run(job: Job, context: JobContext) -> None:
+        with trace_run(
+            storage.trace_path(job.date),
+            f"job.{job.stage}",
+            enabled=config.trace_enabled,
+            sample_rate=config.trace_sample_rate,
+            job_id=job.id,
+            date=job.date,
+        ):
+            handler(job, context)
+
+    return run
+
+
+job_queue = JobQueue(
+    JobStore(storage.jobs_db_path()),
+    handlers={
+        "transcribe": _traced(_run_transcribe_job),
+        "summarize": _traced(_run_summarize_job),
+        "pipeline": _traced(_run_pipeline_job),
+        "rollup": _run_rollup_job,
+        "after_hours": _traced(_run_after_hours_job),
+        "archive": _run_archive_job,
+    },
+    concurrency=config.job_workers,
+    # Stages that write a day's transcripts, summaries or audio take turns per day.
+    exclusive_stages=("transcribe", "summarize", "pipeline", "after_hours", "archive"),
+    equivalent_stages=(("pipeline", "after_hours"),),
+)
+
+
+def _collect_metrics() -> None:
+    state = recorder.active_state()
+    uptime = (now_local() - datetime.fromisoformat(state.started_at)).total_seconds() if state is not None else 0.0
+    RECORDER_UPTIME.set(max(0.0, uptime))
+    DISK_BYTES.clear()
+    for date_str in storage.list_days():
+        stats = storage.day_stats(date_str)
+        for kind in ("audio", "transcript", "summary"):
+            if kind in stats:
+                DISK_BYTES.set(stats[kind]["bytes"], date_str, kind)
+    for state_name in ("queued", "running"):
+        QUEUE_DEPTH.set(job_queue.store.count(state_name), "jobs", state_name)
+    QUEUE_DEPTH.set(len(live_transcriber.status()["pending"]), "live", "running")
+
+
+REGISTRY.add_collector(_collect_metrics)
+
+
+def _prewarm_time(at: str, minutes: int = 5) -> str:
+    hour, minute = (int(part) for part in at.split(":"))
+    total = (hour * 60 + minute - minutes) % (24 * 60)
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+def _prewarm_status() -> dict[str, object]:
+    # Only the in-process path uses these models; with several transcription
+    # workers, pool processes load their own copies and a pre-warm is skipped.
+    status: dict[str, object] = {"mode": config.model_prewarm, "effective": config.model_prewarm != "off"}
+    if config.model_prewarm != "off" and config.transcribe_workers > 1:
+        status["effective"] = False
+        status["detail"] = "skipped: TRANSCRIBE_WORKERS > 1 loads models in pool worker processes"
+    return status
+
+
+def _prewarm_models(fired_at: datetime | None = None) -> None:
+    if _prewarm_status()["effective"]:
+        models.warm()
+
+
+if config.nightly_pipeline_time:
+    scheduler.add_job("nightly-pipeline", config.nightly_pipeline_time, _nightly_pipeline)
+    if config.model_prewarm == "schedule":
+        scheduler.add_job("model-prewarm", _prewarm_time(config.nightly_pipeline_time), _prewarm_models)
+scheduler.add_transition_listener(_on_schedule_transition)
 
 app = FastAPI(title="Office Recorder", version="0.1.0")
 
@@ -33,12 +320,25 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 @app.on_event("startup")
 def _startup() -> None:
+    models.start()
+    if config.model_prewarm == "startup":
+        _prewarm_models()
+    job_queue.start()
     scheduler.start()
+    if recorder.active_state() is not None:
+        recorder.resume_telemetry()
+        live_transcriber.start()
 
 
 @app.on_event("shutdown")
 def _shutdown() -> None:
     scheduler.stop()
+    job_queue.stop()
+    live_transcriber.stop()
+    rolling_summarizer.shutdown()
+    recorder.telemetry.detach()
+    leases.close()
+    models.stop()
 
 
 @app.get("/")
@@ -56,6 +356,35 @@ def recording_status() -> dict[str, object]:
     return recorder.status()
 
 
+@app.get("/api/recording/telemetry")
+def recording_telemetry(seconds: float = Query(default=60, gt=0, le=3600)) -> dict[str, object]:
+    return {**recorder.telemetry.snapshot(), "history": recorder.telemetry.history(seconds)}
+
+
+async def _telemetry_events() -> AsyncIterator[str]:
+    # Pushes a snapshot on every update, and at least every couple of seconds so
+    # time-based alerts (stalled/silent) reach the client without new samples.
+    # Polls on the event loop so an open tab does not pin a threadpool thread.
+    seq = -1
+    sent_at = 0.0
+    while True:
+        current = recorder.telemetry.seq
+        now = time.monotonic()
+        if current != seq or now - sent_at >= 2.0:
+            seq, sent_at = current, now
+            yield f"data: {json.dumps(recorder.telemetry.snapshot())}\n\n"
+        await asyncio.sleep(0.25)
+
+
+@app.get("/api/recording/telemetry/stream")
+def recording_telemetry_stream() -> StreamingResponse:
+    return StreamingResponse(
+        _telemetry_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @app.get("/api/schedule/status")
 def schedule_status() -> dict[str, object]:
     status = scheduler.status()
@@ -66,18 +395,132 @@ def schedule_status() -> dict[str, object]:
         "end": status.end,
         "days": status.days,
         "timezone": status.timezone,
+        "next_change": status.next_change,
     }
 
 
+@app.get("/api/after-hours/status")
+def after_hours_status() -> dict[str, object]:
+    return after_hours.status()
+
+
+def _require_worker_token(authorization: str | None = Header(default=None)) -> None:
+    if config.worker_token and authorization != f"Bearer {config.worker_token}":
+        raise HTTPException(status_code=401, detail="unauthorized")
+
+
+def _lease_error(exc: LeaseError) -> HTTPException:
+    status_code = 404 if str(exc) in ("unknown_lease", "audio_not_found") else 409
+    return HTTPException(status_code=status_code, detail=str(exc))
+
+
+@app.post("/api/worker/lease", dependencies=[Depends(_require_worker_token)], response_model=None)
+def worker_lease(payload: WorkerLeaseRequest) -> dict[str, object] | Response:
+    lease = leases.acquire(payload.worker, payload.date)
+    if lease is None:
+        return Response(status_code=204)
+    return {"lease": lease.to_dict()}
+
+
+@app.get("/api/worker/lease/{token}/audio", dependencies=[Depends(_require_worker_token)])
+def worker_lease_audio(token: str) -> FileResponse:
+    try:
+        path = leases.audio_path(token)
+    except LeaseError as exc:
+        raise _lease_error(exc) from exc
+    return FileResponse(path, filename=path.name)
+
+
+@app.post("/api/worker/lease/{token}/heartbeat", dependencies=[Depends(_require_worker_token)])
+def worker_lease_heartbeat(token: str) -> dict[str, object]:
+    try:
+        return {"expires_at": leases.renew(token)}
+    except LeaseError as exc:
+        raise _lease_error(exc) from exc
+
+
+@app.post("/api/worker/lease/{token}/commit", dependencies=[Depends(_require_worker_token)])
+def worker_lease_commit(token: str, payload: dict[str, Any] = Body(...)) -> dict[str, object]:
+    try:
+        date_str, created = leases.commit(token, payload, config.transcript_format, config.transcript_compression)
+    except LeaseError as exc:
+        raise _lease_error(exc) from exc
+    if created:
+        _index_transcripts(date_str)
+    return {"committed": True, "created": created, "date": date_str}
+
+
+@app.post("/api/worker/lease/{token}/fail", dependencies=[Depends(_require_worker_token)])
+def worker_lease_fail(token: str, payload: WorkerFailRequest) -> dict[str, object]:
+    leases.fail(token, payload.error)
+    return {"failed": True}
+
+
+@app.get("/api/worker/status", dependencies=[Depends(_require_worker_token)])
+def worker_status() -> dict[str, object]:
+    return leases.status()
+
+
+@app.get("/api/archive/status")
+def archive_status() -> dict[str, object]:
+    return archiver.status()
+
+
+@app.post("/api/archive/run")
+def archive_run(priority: int = -20) -> dict[str, object]:
+    # Every day with transcribed WAVs; with none left, one job still applies retention.
+    dates = [date_str for date_str in storage.list_days() if archiver.pending(date_str)] or [today_str()]
+    jobs = [job_queue.submit(date_str, "archive", priority=priority)[0].to_dict() for date_str in dates]
+    return {"queued": True, "jobs": jobs}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/models")
+def models_status() -> dict[str, object]:
+    return {**models.status(), "prewarm": _prewarm_status()}
+
+
+@app.post("/api/models/warm")
+def models_warm() -> dict[str, object]:
+    models.warm()
+    return {"warming": models.names()}
+
+
+@app.post("/api/models/{name}/unload")
+def models_unload(name: str) -> dict[str, object]:
+    if name not in models.names():
+        raise HTTPException(status_code=404, detail="model_not_found")
+    return {"unloaded": models.unload(name)}
+
+
+@app.get("/api/live/status")
+def live_status() -> dict[str, object]:
+    return live_transcriber.status()
+
+
+@app.get("/api/llm/cache")
+def llm_cache_status() -> dict[str, object]:
+    if llm_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **llm_cache.stats()}
+
+
 @app.post("/api/recording/start")
 def recording_start(payload: StartRecordingRequest) -> dict[str, object]:
     state = recorder.start(payload.date)
+    scheduler.wake()
     return {"running": True, "state": state.__dict__}
 
 
 @app.post("/api/recording/stop")
 def recording_stop() -> dict[str, object]:
-    return recorder.stop()
+    result = recorder.stop()
+    scheduler.wake()
+    return result
 
 
 @app.get("/api/days")
@@ -85,41 +528,139 @@ def list_days() -> dict[str, list[str]]:
     return {"days": storage.list_days()}
 
 
-@app.post("/api/day/{date_str}/transcribe")
-def transcribe(date_str: str, background_tasks: BackgroundTasks) -> dict[str, object]:
-    background_tasks.add_task(transcribe_day, storage, transcriber, date_str, diarizer)
-    return {"queued": True, "date": date_str}
-
+def _enqueue(date_str: str, stage: str, priority: int, params: dict[str, object] | None = None) -> dict[str, object]:
+    job, created = job_queue.submit(date_str, stage, priority=priority, params=params)
+    return {"queued": True, "date": date_str, "deduplicated": not created, "job": job.to_dict()}
 
-@app.post("/api/day/{date_str}/summarize")
-def summarize(date_str: str, payload: SummarizeRequest, background_tasks: BackgroundTasks) -> dict[str, object]:
-    def _run() -> None:
-        summary = summarize_day(storage, summarizer, date_str)
-        if payload.send_to_openclaw:
-            text = summary.get("daily_summary", {}).get("overview") or "Daily summary ready."
-            send_hook_message(config, text)
 
+def _require_openclaw(payload: SummarizeRequest) -> None:
     if payload.send_to_openclaw and (not config.openclaw_hook_url or not config.openclaw_hook_token):
         raise HTTPException(status_code=400, detail="OpenClaw webhook not configured")
 
-    background_tasks.add_task(_run)
-    return {"queued": True, "date": date_str}
+
+@app.get("/api/search")
+def search(
+    q: str,
+    date_from: str | None = Query(default=None, alias="from"),
+    date_to: str | None = Query(default=None, alias="to"),
+    limit: int = Query(default=20, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+) -> dict[str, object]:
+    return search_index.search(q, date_from=date_from, date_to=date_to, limit=limit, offset=offset)
+
+
+@app.post("/api/search/reindex")
+def reindex_search() -> dict[str, object]:
+    indexed = {day: search_index.sync_day(storage, day, config.segment_seconds) for day in storage.list_days()}
+    merged = {day: merged_transcripts.sync(day) for day in storage.list_days()}
+    return {"indexed": indexed, "merged": merged}
+
+
+@app.get("/api/day/{date_str}/catalog")
+def get_day_catalog(date_str: str) -> dict[str, object]:
+    if date_str not in storage.list_days():
+        raise HTTPException(status_code=404, detail="day_not_found")
+    return storage.day_stats(date_str)
+
+
+@app.post("/api/catalog/rebuild")
+def rebuild_catalog() -> dict[str, object]:
+    return {"days": storage.rebuild_catalog()}
+
+
+@app.post("/api/day/{date_str}/transcribe")
+def transcribe(date_str: str, priority: int = 0) -> dict[str, object]:
+    return _enqueue(date_str, "transcribe", priority)
+
+
+@app.post("/api/day/{date_str}/summarize")
+def summarize(date_str: str, payload: SummarizeRequest, priority: int = 0) -> dict[str, object]:
+    _require_openclaw(payload)
+    return _enqueue(date_str, "summarize", priority, {"send_to_openclaw": payload.send_to_openclaw})
 
 
 @app.post("/api/day/{date_str}/pipeline")
-def pipeline(date_str: str, payload: SummarizeRequest, background_tasks: BackgroundTasks) -> dict[str, object]:
-    def _run() -> None:
-        transcribe_day(storage, transcriber, date_str, diarizer)
-        summary = summarize_day(storage, summarizer, date_str)
-        if payload.send_to_openclaw:
-            text = summary.get("daily_summary", {}).get("overview") or "Daily summary ready."
-            send_hook_message(config, text)
+def pipeline(date_str: str, payload: SummarizeRequest, priority: int = 0) -> dict[str, object]:
+    _require_openclaw(payload)
+    return _enqueue(date_str, "pipeline", priority, {"send_to_openclaw": payload.send_to_openclaw})
+
+
+@app.get("/api/jobs")
+def list_jobs(state: str | None = None, limit: int = 100) -> dict[str, object]:
+    return {"jobs": [job.to_dict() for job in job_queue.store.list(state=state, limit=limit)]}
+
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str) -> dict[str, object]:
+    job = job_queue.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job_not_found")
+    return {"job": job.to_dict()}
+
+
+@app.post("/api/jobs/{job_id}/cancel")
+def cancel_job(job_id: str) -> dict[str, object]:
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job_not_found")
+    return {"job": job.to_dict()}
+
+
+@app.get("/api/day/{date_str}/activity")
+def get_activity(date_str: str) -> dict[str, object]:
+    segments: list[dict[str, object]] = []
+    for path in storage.list_transcript_files(date_str):
+        meta, _ = read_transcript_meta(path)
+        segments.append(
+            {
+                "segment": path.stem,
+                "skipped": meta.get("skipped"),
+                "activity": meta.get("activity"),
+            }
+        )
+    return {"date": date_str, "segments": segments}
+
+
+@app.get("/api/day/{date_str}/transcript")
+def get_transcript(
+    date_str: str,
+    start: float | None = Query(default=None, alias="from", ge=0),
+    end: float | None = Query(default=None, alias="to", ge=0),
+) -> StreamingResponse:
+    # Read-only: the merged file is kept current by whatever writes transcripts.
+    if date_str not in storage.list_days():
+        raise HTTPException(status_code=404, detail="day_not_found")
+    if not storage.list_transcript_files(date_str):
+        raise HTTPException(status_code=404, detail="transcript_not_found")
+    return StreamingResponse(merged_transcripts.iter_lines(date_str, start, end), media_type="application/x-ndjson")
+
+
+@app.post("/api/range/{date_from}/{date_to}/summarize")
+def summarize_range_endpoint(date_from: str, date_to: str, priority: int = 0) -> dict[str, object]:
+    try:
+        date_from_value = date.fromisoformat(date_from)
+        date_to_value = date.fromisoformat(date_to)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid_date")
+    if date_to_value < date_from_value:
+        raise HTTPException(status_code=400, detail="invalid_range")
+    return _enqueue(f"{date_from}..{date_to}", "rollup", priority, {"date_from": date_from, "date_to": date_to})
+
+
+@app.get("/api/range/{date_from}/{date_to}/summary")
+def get_range_summary(date_from: str, date_to: str) -> dict[str, object]:
+    path = storage.rollup_path(date_from, date_to)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="summary_not_found")
+    return {"summary": read_json(path)}
 
-    if payload.send_to_openclaw and (not config.openclaw_hook_url or not config.openclaw_hook_token):
-        raise HTTPException(status_code=400, detail="OpenClaw webhook not configured")
 
-    background_tasks.add_task(_run)
-    return {"queued": True, "date": date_str}
+@app.get("/api/range/{date_from}/{date_to}/summary.md")
+def get_range_summary_markdown(date_from: str, date_to: str) -> FileResponse:
+    path = storage.rollup_markdown_path(date_from, date_to)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="summary_not_found")
+    return FileResponse(path)
 
 
 @app.get("/api/day/{date_str}/summary")
@@ -130,6 +671,14 @@ def get_summary(date_str: str) -> dict[str, object]:
     return {"summary": read_json(path)}
 
 
+@app.get("/api/day/{date_str}/trace.json")
+def get_trace(date_str: str) -> FileResponse:
+    path = storage.trace_path(date_str)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="trace_not_found")
+    return FileResponse(path, media_type="application/json")
+
+
 @app.get("/api/day/{date_str}/summary.md")
 def get_summary_markdown(date_str: str) -> FileResponse:
     path = storage.summary_markdown_path(date_str)
@@ -139,5 +688,5 @@ def get_summary_markdown(date_str: str) -> FileResponse:
 
 
 @app.post("/api/day/today/summarize")
-def summarize_today(payload: SummarizeRequest, background_tasks: BackgroundTasks) -> dict[str, object]:
-    return summarize(today_str(), payload, background_tasks)
+def summarize_today(payload: SummarizeRequest, priority: int = 0) -> dict[str, object]:
+    return summarize(today_str(), payload, priority)
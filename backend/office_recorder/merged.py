@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+import json
+import os
+import threading
+from typing import Any, Iterator
+
+import numpy as np
+
+from .storage import Storage
+from .transcript_store import load_columns
+from .utils import read_json, segment_index
+
+_INDEX_VERSION = 1
+# One seek point per source file plus one every N lines inside long files.
+_INDEX_EVERY = 64
+
+
+def _empty_index() -> dict[str, Any]:
+    return {"version": _INDEX_VERSION, "sources": [], "starts": [], "offsets": [], "size": 0, "max_span": 0.0}
+
+
+# The merged day transcript is an append-only NDJSON file of day-relative segments
+# in start order, plus a sparse (start, byte offset) index. Transcripts that land in
+# segment order are appended; anything else (a gap filled in later, a rewritten
+# segment) rebuilds the file into a temp path that replaces it atomically.
+class MergedTranscripts:
+    def __init__(self, storage: Storage, segment_seconds: int) -> None:
+        self._storage = storage
+        self._segment_seconds = segment_seconds
+        self._guard = threading.Lock()
+        self._locks: dict[str, threading.Lock] = {}
+
+    def _lock(self, date_str: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(date_str, threading.Lock())
+
+    def _load_index(self, date_str: str) -> dict[str, Any] | None:
+        path = self._storage.merged_index_path(date_str)
+        try:
+            index = read_json(path)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(index, dict) or index.get("version") != _INDEX_VERSION:
+            return None
+        return index
+
+    def sync(self, date_str: str) -> int:
+        with self._lock(date_str):
+            files = sorted(
+                self._storage.list_transcript_files(date_str),
+                key=lambda path: (segment_index(path.stem), path.name),
+            )
+            current: list[list[Any]] = []
+            for path in files:
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                current.append([path.name, stat.st_mtime_ns, stat.st_size])
+
+            data_path = self._storage.merged_transcript_path(date_str)
+            index = self._load_index(date_str)
+            appendable = (
+                index is not None
+                and index["sources"] == current[: len(index["sources"])]
+                and data_path.exists()
+                and data_path.stat().st_size >= index["size"]
+            )
+            if appendable:
+                assert index is not None
+                pending = current[len(index["sources"]) :]
+                if not pending:
+                    return 0
+                with data_path.open("r+b") as handle:
+                    # Drops any tail written after the last committed index.
+                    handle.truncate(index["size"])
+                    handle.seek(index["size"])
+                    self._append(handle, date_str, index, pending)
+            else:
+                index = _empty_index()
+                pending = current
+                tmp_path = data_path.with_name(data_path.name + ".tmp")
+                with tmp_path.open("wb") as handle:
+                    self._append(handle, date_str, index, pending)
+                os.replace(tmp_path, data_path)
+
+            index_path = self._storage.merged_index_path(date_str)
+            tmp_index = index_path.with_name(index_path.name + ".tmp")
+            tmp_index.write_text(json.dumps(index, separators=(",", ":")))
+            os.replace(tmp_index, index_path)
+            return len(pending)
+
+    def _append(self, handle: Any, date_str: str, index: dict[str, Any], sources: list[list[Any]]) -> None:
+        transcripts_dir = self._storage.get_day(date_str).transcripts_dir
+        position = index["size"]
+        for name, mtime_ns, size in sources:
+            path = transcripts_dir / name
+            columns = load_columns(path)
+            offset = max(0, segment_index(path.stem)) * self._segment_seconds
+            order = np.argsort(columns.starts, kind="stable")
+            starts = (columns.starts[order] + offset).tolist()
+            ends = (columns.ends[order] + offset).tolist()
+            written = 0
+            for row, original in enumerate(order.tolist()):
+                text = columns.text(original).strip()
+                if not text:
+                    continue
+                # Seek points must stay sorted for bisect even if files overlap slightly.
+                if written % _INDEX_EVERY == 0 and (not index["starts"] or starts[row] >= index["starts"][-1]):
+                    index["starts"].append(starts[row])
+                    index["offsets"].append(position)
+                written += 1
+                line = (
+                    json.dumps(
+                        {
+                            "start": starts[row],
+                            "end": ends[row],
+                            "speaker": columns.speaker(original),
+                            "text": text,
+                            "source": name,
+                        },
+                        separators=(",", ":"),
+                    )
+                    + "\n"
+                ).encode("utf-8")
+                handle.write(line)
+                position += len(line)
+                index["max_span"] = max(index["max_span"], ends[row] - starts[row])
+            index["sources"].append([name, mtime_ns, size])
+        index["size"] = position
+
+    def iter_lines(self, date_str: str, start: float | None = None, end: float | None = None) -> Iterator[bytes]:
+        index = self._load_index(date_str)
+        data_path = self._storage.merged_transcript_path(date_str)
+        if index is None or not data_path.exists():
+            return
+        position = 0
+        if start is not None and index["starts"]:
+            # Segments are ordered by start, so anything ending after `start` begins
+            # at most max_span earlier.
+            slot = bisect_right(index["starts"], start - index["max_span"]) - 1
+            position = index["offsets"][slot] if slot >= 0 else 0
+        remaining = index["size"] - position
+        with data_path.open("rb") as handle:
+            handle.seek(position)
+            while remaining > 0:
+                line = handle.readline()
+                if not line:
+                    break
+                remaining -= len(line)
+                if start is None and end is None:
+                    yield line
+                    continue
+                segment = json.loads(line)
+                if end is not None and segment["start"] >= end:
+                    break
+                if start is not None and segment["end"] <= start:
+                    continue
+                yield line
+
+    def window(self, date_str: str, start: float | None = None, end: float | None = None) -> list[dict[str, Any]]:
+        return [json.loads(line) for line in self.iter_lines(date_str, start, end)]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+import math
+import threading
+from typing import Callable, Iterable, TypeVar
+
+# (metric name, label values, value) as recorded in a pool worker and replayed in
+# the parent process.
+Sample = tuple[str, tuple[str, ...], float]
+
+_SECONDS_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144)
+_RATIO_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: Registry, name: str, help_text: str, labels: tuple[str, ...]) -> None:
+        self._registry = registry
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def _record(self, labels: tuple[str, ...], value: float) -> None:
+        buffer = self._registry._buffer
+        if buffer is not None:
+            buffer.append((self.name, labels, value))
+        else:
+            self.apply(labels, value)
+
+    def apply(self, labels: tuple[str, ...], value: float) -> None:
+        raise NotImplementedError
+
+    def lines(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.label_names, labels)} {_number(value)}" for labels, value in values]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._record(labels, amount)
+
+    def apply(self, labels: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self.apply(labels, value)
+
+    def apply(self, labels: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry: Registry, name: str, help_text: str, labels: tuple[str, ...], buckets: Iterable[float]) -> None:
+        super().__init__(registry, name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last slot is +Inf), sum, count.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        self._record(labels, value)
+
+    def apply(self, labels: tuple[str, ...], value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+            series[0][index] += 1
+            series[1][0] += value
+            series[1][1] += 1
+
+    def totals(self) -> dict[tuple[str, ...], tuple[float, int]]:
+        with self._lock:
+            return {labels: (totals[0], int(totals[1])) for labels, (_, totals) in self._series.items()}
+
+    def lines(self) -> list[str]:
+        with self._lock:
+            snapshot = sorted((labels, list(counts), list(totals)) for labels, (counts, totals) in self._series.items())
+        lines: list[str] = []
+        for labels, counts, (total, count) in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {_number(count)}")
+        return lines
+
+
+_M = TypeVar("_M", bound=_Metric)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._buffer: list[Sample] | None = None
+
+    def _add(self, metric: _M) -> _M:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(self, name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(self, name, help_text, labels))
+
+    def histogram(
+        self, name: str, help_text: str, buckets: Iterable[float], labels: tuple[str, ...] = ()
+    ) -> Histogram:
+        return self._add(Histogram(self, name, help_text, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        # Called on every scrape to refresh gauges that are cheaper to read than to track.
+        self._collectors.append(collector)
+
+    def buffer_samples(self) -> None:
+        # Pool workers keep their samples for the parent instead of a registry nobody scrapes.
+        self._buffer = []
+
+    def drain(self) -> list[Sample]:
+        if self._buffer is None:
+            return []
+        samples, self._buffer = self._buffer, []
+        return samples
+
+    def replay(self, samples: Iterable[Sample]) -> None:
+        for name, labels, value in samples:
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.apply(tuple(labels), value)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                continue
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.lines())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+TRANSCRIBE_SECONDS = REGISTRY.histogram(
+    "office_recorder_transcribe_seconds", "Wall time to transcribe one audio file.", _SECONDS_BUCKETS
+)
+TRANSCRIBE_REALTIME = REGISTRY.histogram(
+    "office_recorder_transcribe_realtime_factor", "Audio seconds transcribed per wall-clock second.", _RATIO_BUCKETS
+)
+TRANSCRIBE_FILES = REGISTRY.counter(
+    "office_recorder_transcribe_files_total", "Audio files processed by outcome.", ("outcome",)
+)
+DIARIZE_SECONDS = REGISTRY.histogram(
+    "office_recorder_diarize_seconds", "Wall time to diarize one audio file.", _SECONDS_BUCKETS
+)
+LLM_SECONDS = REGISTRY.histogram(
+    "office_recorder_llm_request_seconds", "Chat completion latency.", _SECONDS_BUCKETS, ("cache",)
+)
+LLM_PROMPT_CHARS = REGISTRY.histogram(
+    "office_recorder_llm_prompt_chars", "Prompt size in characters per chat call.", _SIZE_BUCKETS
+)
+LLM_RESPONSE_CHARS = REGISTRY.histogram(
+    "office_recorder_llm_response_chars", "Response size in characters per chat call.", _SIZE_BUCKETS
+)
+CONVERSATION_BLOCKS = REGISTRY.histogram(
+    "office_recorder_conversation_blocks", "Conversation blocks per grouping pass.", _COUNT_BUCKETS
+)
+RECORDER_RESTARTS = REGISTRY.counter(
+    "office_recorder_recorder_restarts_total", "Recorder starts that recovered from a crashed ffmpeg."
+)
+RECORDER_UPTIME = REGISTRY.gauge("office_recorder_recorder_uptime_seconds", "Seconds since the current recording started.")
+DISK_BYTES = REGISTRY.gauge("office_recorder_disk_bytes", "Bytes on disk per day and kind.", ("date", "kind"))
+QUEUE_DEPTH = REGISTRY.gauge("office_recorder_queue_depth", "Items waiting or in flight per queue.", ("queue", "state"))
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import gc
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator
+
+from . import tracing
+
+_MB = 1024 * 1024
+# Rough resident sizes used for budgeting until a model has been measured once.
+_WHISPER_ESTIMATES_MB = (("large", 5000), ("medium", 2600), ("small", 1000), ("base", 350), ("tiny", 200))
+DIARIZATION_ESTIMATE_BYTES = 1500 * _MB
+
+
+def whisper_estimate_bytes(model_name: str) -> int:
+    lowered = model_name.lower()
+    for marker, size_mb in _WHISPER_ESTIMATES_MB:
+        if marker in lowered:
+            return size_mb * _MB
+    return 1500 * _MB
+
+
+def _rss_bytes() -> int | None:
+    try:
+        import psutil  # type: ignore
+    except ImportError:
+        return None
+    return int(psutil.Process().memory_info().rss)
+
+
+@dataclass
+class _Entry:
+    name: str
+    loader: Callable[[], Any]
+    estimate_bytes: int
+    model: Any = None
+    refs: int = 0
+    loading: bool = False
+    load_seconds: float | None = None
+    resident_bytes: int | None = None
+    last_used: float = 0.0
+    loads: int = 0
+    unloads: int = 0
+
+    @property
+    def size(self) -> int:
+        return self.resident_bytes if self.resident_bytes is not None else self.estimate_bytes
+
+
+# Owns the in-process Whisper and diarization models. Callers hold a model only
+# for the duration of a `use()` block; an unreferenced model stays resident until
+# it has been idle for idle_seconds (0 keeps it forever). With a memory budget,
+# loading a model first evicts idle ones and otherwise waits for holders to
+# release theirs, unless nothing else is held.
+class ModelManager:
+    def __init__(self, budget_bytes: int = 0, idle_seconds: float = 0.0) -> None:
+        self._budget_bytes = budget_bytes
+        self._idle_seconds = idle_seconds
+        self._cond = threading.Condition()
+        self._entries: dict[str, _Entry] = {}
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self, name: str, loader: Callable[[], Any], estimate_bytes: int) -> None:
+        with self._cond:
+            if name not in self._entries:
+                self._entries[name] = _Entry(name=name, loader=loader, estimate_bytes=estimate_bytes)
+
+    def names(self) -> list[str]:
+        with self._cond:
+            return list(self._entries)
+
+    def fit_together(self, names: Iterable[str]) -> bool:
+        if not self._budget_bytes:
+            return True
+        with self._cond:
+            return sum(self._entries[name].size for name in names if name in self._entries) <= self._budget_bytes
+
+    def _fits(self, entry: _Entry) -> bool:
+        if not self._budget_bytes:
+            return True
+        resident = sum(
+            other.size for other in self._entries.values() if other is not entry and (other.model is not None or other.loading)
+        )
+        return resident + entry.size <= self._budget_bytes
+
+    def _evict_for(self, entry: _Entry) -> list[Any]:
+        # Least recently used idle models go first.
+        evicted: list[Any] = []
+        idle = sorted(
+            (other for other in self._entries.values() if other is not entry and other.model is not None and other.refs == 0),
+            key=lambda other: other.last_used,
+        )
+        for other in idle:
+            if self._fits(entry):
+                break
+            evicted.append(self._detach(other))
+        return evicted
+
+    def _detach(self, entry: _Entry) -> Any:
+        model, entry.model = entry.model, None
+        entry.unloads += 1
+        return model
+
+    def acquire(self, name: str) -> Any:
+        with self._cond:
+            entry = self._entries[name]
+            entry.refs += 1
+            evicted: list[Any] = []
+            while True:
+                if entry.model is not None:
+                    entry.last_used = time.time()
+                    return entry.model
+                if entry.loading:
+                    self._cond.wait()
+                    continue
+                evicted += self._evict_for(entry)
+                others_held = any(other.refs > 0 and other is not entry for other in self._entries.values())
+                if self._fits(entry) or not others_held:
+                    break
+                self._cond.wait(timeout=5.0)
+            entry.loading = True
+        del evicted
+        gc.collect()
+
+        before = _rss_bytes()
+        started = time.perf_counter()
+        try:
+            with tracing.span("model.load", model=name):
+                model = entry.loader()
+        except BaseException:
+            with self._cond:
+                entry.loading = False
+                entry.refs -= 1
+                self._cond.notify_all()
+            raise
+        elapsed = time.perf_counter() - started
+        after = _rss_bytes()
+        with self._cond:
+            entry.model = model
+            entry.loading = False
+            entry.loads += 1
+            entry.load_seconds = round(elapsed, 3)
+            if before is not None and after is not None and after > before:
+                entry.resident_bytes = after - before
+            entry.last_used = time.time()
+            self._cond.notify_all()
+        return model
+
+    def release(self, name: str) -> None:
+        with self._cond:
+            entry = self._entries[name]
+            entry.refs = max(0, entry.refs - 1)
+            entry.last_used = time.time()
+            self._cond.notify_all()
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        model = self.acquire(name)
+        try:
+            yield model
+        finally:
+            self.release(name)
+
+    def warm(self, names: Iterable[str] | None = None) -> threading.Thread:
+        targets = list(names) if names is not None else self.names()
+
+        def run() -> None:
+            for name in targets:
+                try:
+                    self.acquire(name)
+                except Exception:
+                    continue
+                self.release(name)
+
+        thread = threading.Thread(target=run, name="model-warm", daemon=True)
+        thread.start()
+        return thread
+
+    def unload(self, name: str) -> bool:
+        with self._cond:
+            entry = self._entries[name]
+            if entry.model is None or entry.refs > 0:
+                return False
+            model = self._detach(entry)
+            self._cond.notify_all()
+        del model
+        gc.collect()
+        return True
+
+    def unload_idle(self, now: float | None = None) -> list[str]:
+        if not self._idle_seconds:
+            return []
+        now = now if now is not None else time.time()
+        with self._cond:
+            expired = [
+                entry
+                for entry in self._entries.values()
+                if entry.model is not None and entry.refs == 0 and now - entry.last_used >= self._idle_seconds
+            ]
+            models = [self._detach(entry) for entry in expired]
+            if expired:
+                self._cond.notify_all()
+        if models:
+            del models
+            gc.collect()
+        return [entry.name for entry in expired]
+
+    def start(self) -> None:
+        if self._thread is not None or not self._idle_seconds:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="model-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        interval = min(60.0, max(1.0, self._idle_seconds / 4))
+        while not self._stop_event.wait(interval):
+            self.unload_idle()
+
+    def status(self) -> dict[str, Any]:
+        now = time.time()
+        with self._cond:
+            models = [
+                {
+                    "name": entry.name,
+                    "loaded": entry.model is not None,
+                    "loading": entry.loading,
+                    "refs": entry.refs,
+                    "load_seconds": entry.load_seconds,
+                    "resident_bytes": entry.resident_bytes,
+                    "estimate_bytes": entry.estimate_bytes,
+                    "idle_seconds": round(now - entry.last_used, 1) if entry.model is not None and entry.refs == 0 else None,
+                    "loads": entry.loads,
+                    "unloads": entry.unloads,
+                }
+                for entry in self._entries.values()
+            ]
+            resident = sum(entry.size for entry in self._entries.values() if entry.model is not None)
+        return {
+            "budget_bytes": self._budget_bytes or None,
+            "idle_timeout_seconds": self._idle_seconds or None,
+            "resident_bytes": resident,
+            "models": models,
+        }
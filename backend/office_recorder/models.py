@@ -10,3 +10,12 @@ class StartRecordingRequest(BaseModel):
 class SummarizeRequest(BaseModel):
     date: str | None = Field(default=None, description="YYYY-MM-DD")
     send_to_openclaw: bool = False
+
+
+class WorkerLeaseRequest(BaseModel):
+    worker: str
+    date: str | None = Field(default=None, description="YYYY-MM-DD")
+
+
+class WorkerFailRequest(BaseModel):
+    error: str = ""
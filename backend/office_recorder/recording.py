@@ -8,10 +8,12 @@ import platform
 import signal
 import subprocess
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from .config import AppConfig
+from .metrics import RECORDER_RESTARTS
 from .storage import Storage
+from .telemetry import CaptureTelemetry
 from .utils import now_local, today_str, write_json, read_json
 
 
@@ -30,6 +32,15 @@ class RecorderManager:
         self._config = config
         self._storage = storage
         self._process: subprocess.Popen[str] | None = None
+        self._start_listeners: list[Callable[[RecorderState], None]] = []
+        self._levels_supported: bool | None = None
+        self.telemetry = CaptureTelemetry(
+            dead_dbfs=config.capture_dead_dbfs,
+            alert_seconds=config.capture_alert_seconds,
+        )
+
+    def add_start_listener(self, listener: Callable[[RecorderState], None]) -> None:
+        self._start_listeners.append(listener)
 
     def _pid_is_running(self, pid: int) -> bool:
         if pid <= 0:
@@ -65,11 +76,55 @@ class RecorderManager:
         if path.exists():
             path.unlink()
 
-    def _build_ffmpeg_command(self, output_pattern: Path) -> list[str]:
+    def _progress_path(self, date_str: str) -> Path:
+        return self._storage.get_day(date_str).day_dir / "capture.progress"
+
+    def _level_filter(self) -> str:
+        # Pass-through filters: re-chunk to one frame per interval and log its
+        # overall RMS/peak level. Segment rotations are logged by the muxer.
+        samples = max(1, int(self._config.sample_rate * self._config.capture_level_interval))
+        return (
+            f"asetnsamples=n={samples}:p=0,"
+            "astats=metadata=1:reset=1:measure_perchannel=none:measure_overall=RMS_level+Peak_level,"
+            "ametadata=mode=print"
+        )
+
+    def levels_supported(self) -> bool:
+        # astats' measure_overall option needs ffmpeg 5.1+. Run the chain once over
+        # a generated silent input; if it fails to initialise, record without it.
+        if self._levels_supported is None:
+            cmd = [
+                self._config.ffmpeg_bin,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                f"anullsrc=r={self._config.sample_rate}:cl=mono",
+                "-t",
+                "0.1",
+                "-af",
+                self._level_filter(),
+                "-f",
+                "null",
+                "-",
+            ]
+            try:
+                result = subprocess.run(cmd, capture_output=True, timeout=15)
+                self._levels_supported = result.returncode == 0
+            except (OSError, subprocess.SubprocessError):
+                self._levels_supported = False
+        return self._levels_supported
+
+    def _build_ffmpeg_command(
+        self, output_pattern: Path, progress_path: Path | None = None, levels: bool = False
+    ) -> list[str]:
         cfg = self._config
-        cmd = [
-            cfg.ffmpeg_bin,
-            "-y",
+        cmd = [cfg.ffmpeg_bin, "-y"]
+        if progress_path is not None:
+            cmd += ["-nostats", "-progress", str(progress_path)]
+        cmd += [
             "-f",
             cfg.audio_backend,
             "-i",
@@ -79,6 +134,8 @@ class RecorderManager:
             "-ar",
             str(cfg.sample_rate),
         ]
+        if progress_path is not None and levels:
+            cmd += ["-af", self._level_filter()]
 
         if cfg.audio_format.lower() == "flac":
             cmd += ["-c:a", "flac"]
@@ -100,14 +157,24 @@ class RecorderManager:
         current = self._load_state()
         if current and self._pid_is_running(current.pid):
             return current
+        if current is not None:
+            # A state file left behind by an ffmpeg that exited on its own.
+            RECORDER_RESTARTS.inc()
 
         date_str = date_str or today_str()
         day = self._storage.get_day(date_str)
         output_pattern = day.audio_dir / f"segment_%05d.{self._config.audio_format}"
         log_path = day.day_dir / "recording.log"
         log_file = log_path.open("a", encoding="utf-8")
+        progress_path: Path | None = None
+        levels = False
+        if self._config.capture_telemetry_enabled:
+            progress_path = self._progress_path(date_str)
+            progress_path.unlink(missing_ok=True)
+            levels = self.levels_supported()
+            self.telemetry.attach(log_path, progress_path, log_offset=log_path.stat().st_size, levels=levels)
 
-        cmd = self._build_ffmpeg_command(output_pattern)
+        cmd = self._build_ffmpeg_command(output_pattern, progress_path, levels)
         process = subprocess.Popen(
             cmd,
             stdout=log_file,
@@ -137,6 +204,8 @@ class RecorderManager:
             "format": self._config.audio_format,
         }
         write_json(self._storage.session_path(date_str), session_payload)
+        for listener in self._start_listeners:
+            listener(state)
         return state
 
     def stop(self) -> dict[str, Any]:
@@ -162,8 +231,31 @@ class RecorderManager:
                     stopped = False
 
         self._clear_state()
+        self.telemetry.detach()
         return {"stopped": stopped}
 
+    def resume_telemetry(self) -> None:
+        # Reattach to a recording that outlived a previous server process.
+        state = self.active_state()
+        if state is None or not self._config.capture_telemetry_enabled:
+            return
+        day_dir = Path(state.audio_dir).parent
+        self.telemetry.attach(
+            day_dir / "recording.log", self._progress_path(state.date), levels="-af" in state.command
+        )
+
+    def crashed(self) -> bool:
+        # A stop clears the state file; a state file with a dead PID means ffmpeg
+        # exited on its own.
+        state = self._load_state()
+        return state is not None and not self._pid_is_running(state.pid)
+
+    def active_state(self) -> RecorderState | None:
+        state = self._load_state()
+        if state and self._pid_is_running(state.pid):
+            return state
+        return None
+
     def status(self) -> dict[str, Any]:
         state = self._load_state()
         if not state:
@@ -171,11 +263,11 @@ class RecorderManager:
 
         running = self._pid_is_running(state.pid)
         if not running:
-            self._clear_state()
-            return {"running": False}
+            # Keep the state file: it is how crashed() tells a dead ffmpeg from a
+            # stop, and the next start() or stop() clears it.
+            return {"running": False, "crashed": True, "date": state.date}
 
-        audio_dir = Path(state.audio_dir)
-        file_count = len(list(audio_dir.glob("*"))) if audio_dir.exists() else 0
+        file_count = len(self._storage.list_audio_files(state.date))
         return {
             "running": True,
             "pid": state.pid,
@@ -185,4 +277,5 @@ class RecorderManager:
             "format": state.format,
             "file_count": file_count,
             "command": state.command,
+            "telemetry": self.telemetry.snapshot(),
         }
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from pathlib import Path
+import platform
+import tempfile
+import threading
+import time
+from typing import Any
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import AppConfig
+from .diarization import Diarizer
+from .transcript_store import read_transcript
+from .transcription import Transcriber, transcribe_segment
+
+
+def _session(token: str | None, retry_posts: bool = True) -> requests.Session:
+    session = requests.Session()
+    # Heartbeats, audio downloads, commits and failures are safe to retry (commits
+    # are idempotent per segment). Acquiring a lease is not: a retried POST whose
+    # first attempt got through leaves an orphaned lease and burns an attempt, so
+    # that session only retries connection failures and the run loop polls again.
+    retry = Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=None if retry_posts else Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    session.mount("http://", HTTPAdapter(max_retries=retry))
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    if token:
+        session.headers["Authorization"] = f"Bearer {token}"
+    return session
+
+
+class RemoteWorker:
+    def __init__(
+        self,
+        config: AppConfig,
+        server: str,
+        worker_id: str | None = None,
+        token: str | None = None,
+        date_str: str | None = None,
+    ) -> None:
+        self._config = config
+        self._server = server.rstrip("/")
+        self._worker_id = worker_id or f"{platform.node()}-{uuid.uuid4().hex[:6]}"
+        self._date = date_str
+        self._session = _session(token)
+        self._lease_session = _session(token, retry_posts=False)
+        self._transcriber = Transcriber(config)
+        self._diarizer = Diarizer(config) if config.diarization_enabled else None
+        self.completed = 0
+
+    def _url(self, path: str) -> str:
+        return f"{self._server}/api/worker{path}"
+
+    def lease(self) -> dict[str, Any] | None:
+        response = self._lease_session.post(
+            self._url("/lease"),
+            json={"worker": self._worker_id, "date": self._date},
+            timeout=30,
+        )
+        if response.status_code == 204:
+            return None
+        response.raise_for_status()
+        return response.json()["lease"]
+
+    def _heartbeat(self, token: str, stop: threading.Event, interval: float) -> None:
+        while not stop.wait(interval):
+            try:
+                self._session.post(self._url(f"/lease/{token}/heartbeat"), timeout=30)
+            except requests.RequestException:
+                continue
+
+    def process(self, lease: dict[str, Any]) -> None:
+        token = lease["token"]
+        stop = threading.Event()
+        interval = max(5.0, (lease["expires_at"] - time.time()) / 3)
+        heartbeat = threading.Thread(target=self._heartbeat, args=(token, stop, interval), daemon=True)
+        heartbeat.start()
+        try:
+            with tempfile.TemporaryDirectory(prefix="office-recorder-worker-") as workdir:
+                audio_path = Path(workdir) / lease["audio_name"]
+                with self._session.get(self._url(f"/lease/{token}/audio"), stream=True, timeout=60) as response:
+                    response.raise_for_status()
+                    with audio_path.open("wb") as handle:
+                        for chunk in response.iter_content(chunk_size=1 << 20):
+                            handle.write(chunk)
+                transcript_path = Path(workdir) / f"{lease['segment']}.json"
+                transcribe_segment(self._transcriber, audio_path, transcript_path, self._diarizer)
+                payload = read_transcript(transcript_path)
+        except Exception as exc:
+            stop.set()
+            self._session.post(self._url(f"/lease/{token}/fail"), json={"error": str(exc)}, timeout=30)
+            raise
+        finally:
+            stop.set()
+            heartbeat.join(timeout=1)
+        response = self._session.post(self._url(f"/lease/{token}/commit"), json=payload, timeout=60)
+        response.raise_for_status()
+        self.completed += 1
+
+    def run(self, exit_when_idle: bool = False, poll_seconds: float = 30.0) -> int:
+        while True:
+            try:
+                lease = self.lease()
+            except requests.RequestException as exc:
+                print(f"[worker] lease failed: {exc}")
+                time.sleep(poll_seconds)
+                continue
+            if lease is None:
+                if exit_when_idle:
+                    return self.completed
+                time.sleep(poll_seconds)
+                continue
+            print(f"[worker] {lease['date']} {lease['segment']}")
+            try:
+                self.process(lease)
+            except Exception as exc:
+                print(f"[worker] {lease['segment']} failed: {exc}")
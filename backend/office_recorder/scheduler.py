@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, time
-from typing import Optional
+from datetime import datetime, time, timedelta
+from typing import Callable, Optional
 import threading
 
 try:
@@ -22,6 +22,7 @@ class ScheduleStatus:
     end: str
     days: list[int]
     timezone: str | None
+    next_change: str | None = None
 
 
 def _parse_time(value: str, fallback: time) -> time:
@@ -65,27 +66,101 @@ def is_schedule_active(config: AppConfig, now: datetime | None = None) -> bool:
     return previous_day in config.schedule_days and current_time <= end_t
 
 
+def next_transition(config: AppConfig, now: datetime | None = None) -> tuple[datetime, bool] | None:
+    # The next instant at which is_schedule_active flips, and the state after it.
+    # Candidates are built on wall-clock dates in the schedule zone, so DST shifts
+    # and cross-midnight windows fall out of datetime.combine.
+    if not config.schedule_enabled or not config.schedule_days:
+        return None
+    now = now or datetime.now(tz=_get_timezone(config.schedule_timezone))
+    start_t = _parse_time(config.schedule_start, time(9, 0))
+    end_t = _parse_time(config.schedule_end, time(18, 0))
+    candidates: list[datetime] = []
+    for offset in range(-1, 9):
+        day = now.date() + timedelta(days=offset)
+        if day.weekday() not in config.schedule_days:
+            continue
+        end_day = day if start_t <= end_t else day + timedelta(days=1)
+        candidates.append(datetime.combine(day, start_t, tzinfo=now.tzinfo))
+        # The end minute is inclusive, so the window closes just after it.
+        candidates.append(datetime.combine(end_day, end_t, tzinfo=now.tzinfo) + timedelta(seconds=1))
+
+    current = is_schedule_active(config, now)
+    for instant in sorted(candidate for candidate in candidates if candidate > now):
+        state = is_schedule_active(config, instant)
+        if state != current:
+            return instant, state
+    return None
+
+
+def _next_daily(at: time, now: datetime) -> datetime:
+    for offset in (0, 1, 2):
+        candidate = datetime.combine(now.date() + timedelta(days=offset), at, tzinfo=now.tzinfo)
+        if candidate > now:
+            return candidate
+    raise AssertionError("unreachable")
+
+
+def _seconds_until(instant: datetime, now: datetime) -> float:
+    return instant.timestamp() - now.timestamp()
+
+
+@dataclass
+class _TimedJob:
+    name: str
+    at: time
+    callback: Callable[[datetime], None]
+    next_run: datetime | None = None
+
+
+TransitionListener = Callable[[bool], None]
+
+# Cap on a single sleep. Event waits use the monotonic clock, which stops during
+# system sleep, so long waits are re-anchored against the wall clock.
+_MAX_SLEEP_SECONDS = 300.0
+# While a window is active, check at this interval that ffmpeg has not crashed.
+_WATCHDOG_SECONDS = 60.0
+
+
 class ScheduleRunner:
     def __init__(self, config: AppConfig, recorder: RecorderManager) -> None:
         self._config = config
         self._recorder = recorder
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
         self._thread: threading.Thread | None = None
+        self._jobs: list[_TimedJob] = []
+        self._listeners: list[TransitionListener] = []
+        self._next: tuple[datetime, bool] | None = None
+        self.last_error: str | None = None
+
+    def add_job(self, name: str, at: str, callback: Callable[[datetime], None]) -> None:
+        self._jobs.append(_TimedJob(name=name, at=_parse_time(at, time(2, 0)), callback=callback))
+        self.wake()
+
+    def add_transition_listener(self, listener: TransitionListener) -> None:
+        self._listeners.append(listener)
+
+    def wake(self) -> None:
+        self._wake_event.set()
 
     def start(self) -> None:
-        if not self._config.schedule_enabled:
+        if not self._config.schedule_enabled and not self._jobs:
             return
         if self._thread and self._thread.is_alive():
             return
-        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="schedule-runner", daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._wake_event.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=2)
 
     def status(self) -> ScheduleStatus:
+        upcoming = self._next if self._thread and self._thread.is_alive() else next_transition(self._config)
         return ScheduleStatus(
             enabled=self._config.schedule_enabled,
             active=is_schedule_active(self._config),
@@ -93,13 +168,60 @@ class ScheduleRunner:
             end=self._config.schedule_end,
             days=self._config.schedule_days,
             timezone=self._config.schedule_timezone,
+            next_change=upcoming[0].isoformat() if upcoming else None,
         )
 
+    def _now(self) -> datetime:
+        return datetime.now(tz=_get_timezone(self._config.schedule_timezone))
+
+    def _apply(self, active: bool, transition: bool) -> None:
+        if active:
+            self._recorder.start()
+        elif self._config.schedule_auto_stop:
+            self._recorder.stop()
+        if transition:
+            for listener in self._listeners:
+                try:
+                    listener(active)
+                except Exception as exc:
+                    self.last_error = f"transition listener: {exc}"
+
     def _loop(self) -> None:
+        # Enforce the current state once, then only act when it flips; manual
+        # starts and stops in between are left alone. Comparing against the
+        # applied state (rather than firing at the computed instant) also catches
+        # transitions missed while the machine was asleep.
+        enabled = self._config.schedule_enabled
+        active = is_schedule_active(self._config)
+        if enabled:
+            self._apply(active, transition=False)
+
         while not self._stop_event.is_set():
-            active = is_schedule_active(self._config)
-            if active:
-                self._recorder.start()
-            elif self._config.schedule_auto_stop:
-                self._recorder.stop()
-            self._stop_event.wait(30)
+            now = self._now()
+            if enabled:
+                current = is_schedule_active(self._config, now)
+                if current != active:
+                    active = current
+                    self._apply(active, transition=True)
+                elif active and self._recorder.crashed():
+                    self._recorder.start()
+
+            deadlines = [_MAX_SLEEP_SECONDS]
+            for job in self._jobs:
+                if job.next_run is None:
+                    job.next_run = _next_daily(job.at, now)
+                elif _seconds_until(job.next_run, now) <= 0:
+                    try:
+                        job.callback(job.next_run)
+                    except Exception as exc:
+                        self.last_error = f"{job.name}: {exc}"
+                    job.next_run = _next_daily(job.at, now)
+                deadlines.append(_seconds_until(job.next_run, now))
+
+            self._next = next_transition(self._config, now)
+            if self._next is not None:
+                deadlines.append(_seconds_until(self._next[0], now))
+            if enabled and active:
+                deadlines.append(_WATCHDOG_SECONDS)
+            self._wake_event.wait(max(0.0, min(deadlines)))
+            self._wake_event.clear()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any
+
+from .storage import Storage
+from .transcript_store import load_day_columns
+
+# Rows live in a plain table indexed by (day, source); the FTS table only holds
+# the text, keyed by the same rowid (external content), so per-file deletes and
+# day-range filters use the b-tree index instead of scanning the whole index.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segment_rows (
+    id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    speaker TEXT,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segment_rows_day_source ON segment_rows (day, source);
+CREATE VIRTUAL TABLE IF NOT EXISTS segment_text USING fts5(
+    text,
+    content = 'segment_rows',
+    content_rowid = 'id',
+    tokenize = 'porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS segment_rows_insert AFTER INSERT ON segment_rows BEGIN
+    INSERT INTO segment_text (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segment_rows_delete AFTER DELETE ON segment_rows BEGIN
+    INSERT INTO segment_text (segment_text, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TABLE IF NOT EXISTS indexed_files (
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (day, source)
+);
+"""
+
+
+def _fts_query(query: str) -> str:
+    # Quote every term so user input can never be parsed as FTS syntax; a trailing
+    # '*' keeps prefix search.
+    terms: list[str] = []
+    for raw in query.split():
+        prefix = raw.endswith("*")
+        term = raw.rstrip("*").replace('"', '""')
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class SearchIndex:
+    def __init__(self, path: Path) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        legacy = self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'segments'").fetchone()
+        if legacy is not None:
+            # Earlier layout kept day/source inside the FTS table; rebuild from scratch.
+            self._conn.executescript("DROP TABLE segments; DROP TABLE IF EXISTS indexed_files;")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def index_transcripts(self, date_str: str, paths: list[Path], segment_seconds: int) -> int:
+        # One bulk columnar load for every changed file; mtimes are taken first so
+        # a file rewritten mid-load is simply indexed again next time.
+        mtimes = [(date_str, path.name, path.stat().st_mtime_ns) for path in paths]
+        columns = load_day_columns(paths, segment_seconds)
+        speakers: list[str | None] = [*columns.speakers, None]
+        starts = columns.starts.tolist()
+        ends = columns.ends.tolist()
+        speaker_ids = columns.speaker_ids.tolist()
+        source_ids = columns.source_ids.tolist()
+        rows = []
+        for index in range(len(columns)):
+            text = columns.text(index).strip()
+            if text:
+                source = columns.sources[source_ids[index]]
+                rows.append((text, speakers[speaker_ids[index]], date_str, source, starts[index], ends[index]))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "DELETE FROM segment_rows WHERE day = ? AND source = ?", [(date_str, path.name) for path in paths]
+            )
+            self._conn.executemany(
+                "INSERT INTO segment_rows (text, speaker, day, source, start, end) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO indexed_files (day, source, mtime_ns) VALUES (?, ?, ?)",
+                mtimes,
+            )
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def sync_day(self, storage: Storage, date_str: str, segment_seconds: int) -> int:
+        with self._lock:
+            indexed = {
+                row["source"]: row["mtime_ns"]
+                for row in self._conn.execute("SELECT source, mtime_ns FROM indexed_files WHERE day = ?", (date_str,))
+            }
+        files = storage.list_transcript_files(date_str)
+        changed = [path for path in files if indexed.get(path.name) != path.stat().st_mtime_ns]
+        if changed:
+            self.index_transcripts(date_str, changed, segment_seconds)
+        stale = set(indexed) - {path.name for path in files}
+        if stale:
+            with self._lock:
+                for source in stale:
+                    self._conn.execute("DELETE FROM segment_rows WHERE day = ? AND source = ?", (date_str, source))
+                    self._conn.execute("DELETE FROM indexed_files WHERE day = ? AND source = ?", (date_str, source))
+        return len(changed)
+
+    def search(
+        self,
+        query: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> dict[str, Any]:
+        match = _fts_query(query)
+        if not match:
+            return {"query": query, "total": 0, "hits": []}
+        where = "segment_text MATCH ?"
+        args: list[Any] = [match]
+        if date_from:
+            where += " AND segment_rows.day >= ?"
+            args.append(date_from)
+        if date_to:
+            where += " AND segment_rows.day <= ?"
+            args.append(date_to)
+        # The match drives and the day range is checked on matched rows only; probing
+        # FTS per row of a day range measured an order of magnitude slower.
+        joined = "segment_text JOIN segment_rows ON segment_rows.id = segment_text.rowid"
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM {joined} WHERE {where}", args).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT segment_rows.day AS day, source, start, end, speaker, segment_rows.text AS text, "
+                "snippet(segment_text, 0, '[', ']', '…', 12) AS snippet, bm25(segment_text) AS score "
+                f"FROM {joined} WHERE {where} ORDER BY score, day, start LIMIT ? OFFSET ?",
+                args + [limit, offset],
+            ).fetchall()
+        hits = [
+            {
+                "day": row["day"],
+                "start": row["start"],
+                "end": row["end"],
+                "speaker": row["speaker"],
+                "source": row["source"],
+                "text": row["text"],
+                "snippet": row["snippet"],
+                "score": -row["score"],
+            }
+            for row in rows
+        ]
+        return {"query": query, "total": total, "limit": limit, "offset": offset, "hits": hits}
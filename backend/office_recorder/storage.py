@@ -2,10 +2,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+import re
+from typing import Any, Iterable
 
+from .catalog import Catalog, inspect_transcript
+from .transcript_store import find_transcript, read_transcript_meta
 from .utils import ensure_dir
 
+_DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
 
 @dataclass(frozen=True)
 class DayPaths:
@@ -15,34 +20,105 @@ class DayPaths:
     summaries_dir: Path
 
 
+def _inspect_audio(path: Path) -> tuple[float | None, str | None]:
+    from .audio import read_wav_info
+
+    if path.suffix.lower() != ".wav":
+        # Archived flac/opus segments; probing them would cost an ffprobe per file,
+        # so use the duration their transcript recorded (the archiver records the
+        # probed one as it transcodes).
+        transcript = find_transcript(path.parent.parent / "transcripts", path.stem)
+        if transcript is None:
+            return None, "recorded"
+        try:
+            meta, _ = read_transcript_meta(transcript)
+        except (OSError, ValueError, KeyError, RuntimeError):
+            return None, "recorded"
+        duration = meta.get("duration")
+        return (float(duration) if duration is not None else None), "recorded"
+    try:
+        info = read_wav_info(path)
+    except (OSError, ValueError):
+        return None, "recorded"
+    return (info.duration if info is not None else None), "recorded"
+
+
 class Storage:
     def __init__(self, base_dir: Path) -> None:
         self.base_dir = ensure_dir(base_dir)
+        self.catalog = Catalog(self.base_dir / "catalog.sqlite3")
+        self._days: dict[str, DayPaths] = {}
 
     def get_day(self, date_str: str) -> DayPaths:
+        cached = self._days.get(date_str)
+        if cached is not None:
+            return cached
         day_dir = ensure_dir(self.base_dir / date_str)
         audio_dir = ensure_dir(day_dir / "audio")
         transcripts_dir = ensure_dir(day_dir / "transcripts")
         summaries_dir = ensure_dir(day_dir / "summaries")
-        return DayPaths(
+        day = DayPaths(
             day_dir=day_dir,
             audio_dir=audio_dir,
             transcripts_dir=transcripts_dir,
             summaries_dir=summaries_dir,
         )
+        self._days[date_str] = day
+        if _DAY_RE.match(date_str):
+            self.catalog.add_day(date_str)
+        return day
 
     def list_days(self) -> list[str]:
         if not self.base_dir.exists():
             return []
-        return sorted([p.name for p in self.base_dir.iterdir() if p.is_dir()])
+        return self.catalog.days(self.base_dir, lambda name: bool(_DAY_RE.match(name)))
 
     def list_audio_files(self, date_str: str) -> list[Path]:
         day = self.get_day(date_str)
-        return sorted([p for p in day.audio_dir.iterdir() if p.is_file()])
+        return self.catalog.files(date_str, "audio", day.audio_dir, _inspect_audio)
 
     def list_transcript_files(self, date_str: str) -> list[Path]:
         day = self.get_day(date_str)
-        return sorted([p for p in day.transcripts_dir.iterdir() if p.is_file()])
+        return self.catalog.files(date_str, "transcript", day.transcripts_dir, inspect_transcript)
+
+    def day_stats(self, date_str: str) -> dict[str, Any]:
+        self.list_audio_files(date_str)
+        self.list_transcript_files(date_str)
+        summaries_dir = self.get_day(date_str).summaries_dir
+        self.catalog.files(date_str, "summary", summaries_dir)
+        return self.catalog.day_stats(date_str)
+
+    def pending_audio(self, date_str: str) -> list[Path]:
+        # Segments with no transcript yet, including one still being recorded.
+        # Only names matter here, so a settled day costs two directory stats.
+        day = self.get_day(date_str)
+        transcribed = {
+            path.stem
+            for path in self.catalog.files(date_str, "transcript", day.transcripts_dir, inspect_transcript, restat=False)
+        }
+        audio = self.catalog.files(date_str, "audio", day.audio_dir, _inspect_audio, restat=False)
+        return [path for path in audio if path.stem not in transcribed]
+
+    def summary_is_current(self, date_str: str) -> bool:
+        try:
+            written = self.summary_path(date_str).stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        for path in self.list_transcript_files(date_str):
+            try:
+                if path.stat().st_mtime_ns > written:
+                    return False
+            except FileNotFoundError:
+                continue
+        return True
+
+    def rebuild_catalog(self) -> list[str]:
+        self.catalog.reset()
+        self._days.clear()
+        days = self.list_days()
+        for date_str in days:
+            self.day_stats(date_str)
+        return days
 
     def summary_path(self, date_str: str) -> Path:
         return self.get_day(date_str).summaries_dir / "summary.json"
@@ -50,8 +126,38 @@ class Storage:
     def summary_markdown_path(self, date_str: str) -> Path:
         return self.get_day(date_str).summaries_dir / "summary.md"
 
+    def block_summaries_path(self, date_str: str) -> Path:
+        return self.get_day(date_str).summaries_dir / "blocks.json"
+
+    def rollup_path(self, date_from: str, date_to: str) -> Path:
+        return ensure_dir(self.base_dir / "rollups") / f"{date_from}_{date_to}.json"
+
+    def rollup_markdown_path(self, date_from: str, date_to: str) -> Path:
+        return ensure_dir(self.base_dir / "rollups") / f"{date_from}_{date_to}.md"
+
+    def merged_transcript_path(self, date_str: str) -> Path:
+        return self.get_day(date_str).day_dir / "transcript.jsonl"
+
+    def merged_index_path(self, date_str: str) -> Path:
+        return self.get_day(date_str).day_dir / "transcript.idx.json"
+
+    def trace_path(self, date_str: str) -> Path:
+        return self.get_day(date_str).day_dir / "trace.json"
+
     def session_path(self, date_str: str) -> Path:
         return self.get_day(date_str).day_dir / "session.json"
 
     def recorder_state_path(self) -> Path:
         return self.base_dir / "recorder_state.json"
+
+    def jobs_db_path(self) -> Path:
+        return self.base_dir / "jobs.sqlite3"
+
+    def leases_db_path(self) -> Path:
+        return self.base_dir / "leases.sqlite3"
+
+    def search_db_path(self) -> Path:
+        return self.base_dir / "search.sqlite3"
+
+    def cache_dir(self, name: str) -> Path:
+        return ensure_dir(self.base_dir / "_cache" / name)
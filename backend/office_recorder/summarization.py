@@ -1,15 +1,29 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import hashlib
+import heapq
+from itertools import groupby
+import json
+from operator import itemgetter
 from pathlib import Path
-import re
-from typing import Any
+import threading
+import time
+from typing import Any, Callable, ContextManager, Iterable, Iterator
 import requests
+from requests.adapters import HTTPAdapter
 
-from .batching import group_segments
+from . import tracing
+from .batching import BlockBuilder, ConversationBlock, iter_blocks
 from .config import AppConfig
+from .llm_cache import ResponseCache, cache_key
+from .metrics import LLM_PROMPT_CHARS, LLM_RESPONSE_CHARS, LLM_SECONDS
 from .storage import Storage
-from .utils import read_json, safe_json_load, write_json
+from .transcript_store import read_transcript
+from .utils import read_json, safe_json_load, segment_index, write_json
 
 
 @dataclass
@@ -18,8 +32,60 @@ class LLMClient:
     api_key: str | None
     model: str
     timeout_seconds: float
+    max_concurrency: int = 1
+    cache: ResponseCache | None = None
+    _session: requests.Session | None = field(default=None, init=False, repr=False)
+    _session_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _get_session(self) -> requests.Session:
+        with self._session_lock:
+            if self._session is None:
+                # Keep-alive pool sized to the in-flight limit so concurrent calls reuse connections.
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def chat(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+        validate: Callable[[str], Any] | None = None,
+    ) -> str:
+        # validate raises on a reply the caller cannot use; such replies are never
+        # cached, and a cached one that fails is dropped and fetched again.
+        prompt_chars = sum(len(message.get("content", "")) for message in messages)
+        with tracing.span("llm.chat", model=self.model, prompt_tokens_est=prompt_chars // 4 + 1) as span:
+            return self._chat(messages, temperature, max_tokens, prompt_chars, span, validate)
+
+    def _chat(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int | None,
+        prompt_chars: int,
+        span: tracing.Span | tracing.NullSpan,
+        validate: Callable[[str], Any] | None,
+    ) -> str:
+        key: str | None = None
+        started = time.perf_counter()
+        if self.cache is not None:
+            key = cache_key(self.model, messages, temperature, max_tokens)
+            cached = self.cache.get(key)
+            if cached is not None:
+                try:
+                    if validate is not None:
+                        validate(cached)
+                except ValueError:
+                    self.cache.delete(key)
+                else:
+                    LLM_SECONDS.observe(time.perf_counter() - started, "hit")
+                    span.set(cache="hit")
+                    return cached
 
-    def chat(self, messages: list[dict[str, str]], temperature: float = 0.2, max_tokens: int | None = None) -> str:
         url = self.base_url.rstrip("/") + "/v1/chat/completions"
         headers = {"Content-Type": "application/json"}
         if self.api_key:
@@ -31,34 +97,126 @@ class LLMClient:
         }
         if max_tokens is not None:
             payload["max_tokens"] = max_tokens
-        response = requests.post(url, json=payload, headers=headers, timeout=self.timeout_seconds)
+        response = self._get_session().post(url, json=payload, headers=headers, timeout=self.timeout_seconds)
         response.raise_for_status()
         data = response.json()
-        return data["choices"][0]["message"]["content"]
+        content = data["choices"][0]["message"]["content"]
+        cache_state = "miss" if self.cache is not None else "off"
+        LLM_SECONDS.observe(time.perf_counter() - started, cache_state)
+        LLM_PROMPT_CHARS.observe(prompt_chars)
+        LLM_RESPONSE_CHARS.observe(len(content))
+        usage = data.get("usage") or {}
+        span.set(
+            cache=cache_state,
+            response_tokens_est=len(content) // 4 + 1,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+        )
+        if validate is not None:
+            validate(content)
+        if self.cache is not None and key is not None:
+            self.cache.put(key, content, payload)
+        return content
+
+    def chat_many(
+        self,
+        conversations: list[list[dict[str, str]]],
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+        validate: Callable[[str], Any] | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> list[str]:
+        # progress runs on the calling thread after each reply; if it raises,
+        # requests not yet sent are dropped and only in-flight ones are awaited.
+        def run(messages: list[dict[str, str]]) -> str:
+            return self.chat(messages, temperature=temperature, max_tokens=max_tokens, validate=validate)
+
+        replies: list[str] = []
+        if len(conversations) <= 1 or self.max_concurrency <= 1:
+            for messages in conversations:
+                replies.append(run(messages))
+                if progress is not None:
+                    progress(len(replies), len(conversations))
+            return replies
+        executor = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(conversations)))
+        try:
+            for reply in executor.map(tracing.bind(run), conversations):
+                replies.append(reply)
+                if progress is not None:
+                    progress(len(replies), len(conversations))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return replies
 
 
 def _offset_from_stem(stem: str, segment_seconds: int) -> int:
-    match = re.search(r"(\d+)$", stem)
-    if not match:
-        return 0
-    return int(match.group(1)) * segment_seconds
+    return max(0, segment_index(stem)) * segment_seconds
 
 
-def load_segments(storage: Storage, date_str: str, segment_seconds: int) -> list[dict[str, Any]]:
+def _payload_segments(payload: dict[str, Any], source: str, offset: int) -> list[dict[str, Any]]:
     segments: list[dict[str, Any]] = []
-    for transcript_path in storage.list_transcript_files(date_str):
-        payload = read_json(transcript_path)
-        offset = _offset_from_stem(transcript_path.stem, segment_seconds)
-        for segment in payload.get("segments", []):
-            segments.append(
-                {
-                    "start": float(segment.get("start", 0.0)) + offset,
-                    "end": float(segment.get("end", 0.0)) + offset,
-                    "text": segment.get("text", "").strip(),
-                    "source": transcript_path.name,
-                }
-            )
-    return sorted(segments, key=lambda s: s.get("start", 0.0))
+    for segment in payload.get("segments", []):
+        segments.append(
+            {
+                "start": float(segment.get("start", 0.0)) + offset,
+                "end": float(segment.get("end", 0.0)) + offset,
+                "text": segment.get("text", "").strip(),
+                "source": source,
+            }
+        )
+    return segments
+
+
+def _file_segments(path: Path, segment_seconds: int) -> Iterator[dict[str, Any]]:
+    payload = read_transcript(path)
+    offset = _offset_from_stem(path.stem, segment_seconds)
+    yield from sorted(_payload_segments(payload, path.name, offset), key=lambda s: s["start"])
+
+
+def iter_segments(storage: Storage, date_str: str, segment_seconds: int) -> Iterator[dict[str, Any]]:
+    # Lazy k-way merge in start order. A file is only opened once the merge front
+    # reaches its offset (the earliest start it can hold), so only files that
+    # overlap in time are resident at once.
+    files = sorted(
+        storage.list_transcript_files(date_str),
+        key=lambda path: (_offset_from_stem(path.stem, segment_seconds), path.name),
+    )
+    heap: list[tuple[float, int, dict[str, Any], Iterator[dict[str, Any]]]] = []
+    opened = 0
+    while opened < len(files) or heap:
+        while opened < len(files) and (
+            not heap or _offset_from_stem(files[opened].stem, segment_seconds) <= heap[0][0]
+        ):
+            segments = _file_segments(files[opened], segment_seconds)
+            first = next(segments, None)
+            if first is not None:
+                heapq.heappush(heap, (first["start"], opened, first, segments))
+            opened += 1
+        if not heap:
+            continue
+        _, order, segment, segments = heapq.heappop(heap)
+        yield segment
+        following = next(segments, None)
+        if following is not None:
+            heapq.heappush(heap, (following["start"], order, following, segments))
+
+
+def iter_range_blocks(
+    storage: Storage,
+    dates: Iterable[str],
+    segment_seconds: int,
+    gap_seconds: int,
+    max_words: int,
+) -> Iterator[tuple[str, ConversationBlock]]:
+    # Segment times are day-relative, so blocks never span a day boundary.
+    for date_str in dates:
+        segments = iter_segments(storage, date_str, segment_seconds)
+        for block in iter_blocks(segments, gap_seconds=gap_seconds, max_words=max_words):
+            yield date_str, block
+
+
+def load_segments(storage: Storage, date_str: str, segment_seconds: int) -> list[dict[str, Any]]:
+    return list(iter_segments(storage, date_str, segment_seconds))
 
 
 def _block_prompt(block_text: str) -> list[dict[str, str]]:
@@ -73,20 +231,90 @@ def _block_prompt(block_text: str) -> list[dict[str, str]]:
     return [{"role": "system", "content": system}, {"role": "user", "content": user}]
 
 
-def _daily_prompt(block_summaries: list[dict[str, Any]]) -> list[dict[str, str]]:
+def _json_object(content: str) -> dict[str, Any]:
+    parsed = safe_json_load(content)
+    if not isinstance(parsed, dict):
+        raise ValueError(f"LLM reply is a JSON {type(parsed).__name__}, not an object")
+    return parsed
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _compact_json(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _fit_summary(summary: dict[str, Any], max_tokens: int) -> str:
+    compact = {key: value for key, value in summary.items() if value not in ("", [], {}, None)}
+    for key in ("start", "end"):
+        if isinstance(compact.get(key), float):
+            compact[key] = round(compact[key])
+    serialized = _compact_json(compact)
+    # Trim the longest list, then the longest string, until the entry fits.
+    while _estimate_tokens(serialized) > max_tokens:
+        lists = [key for key, value in compact.items() if isinstance(value, list) and value]
+        if lists:
+            key = max(lists, key=lambda k: len(_compact_json(compact[k])))
+            compact[key] = compact[key][:-1]
+        else:
+            strings = [key for key, value in compact.items() if isinstance(value, str) and value]
+            if strings:
+                key = max(strings, key=lambda k: len(compact[k]))
+                overflow = (_estimate_tokens(serialized) - max_tokens) * 4
+                compact[key] = compact[key][: max(0, len(compact[key]) - max(overflow, 16))]
+            else:
+                others = [key for key in compact if key not in ("start", "end")]
+                if not others:
+                    break
+                del compact[max(others, key=lambda k: len(_compact_json(compact[k])))]
+        serialized = _compact_json(compact)
+    return serialized
+
+
+def _pack_groups(entries: list[str], token_budget: int) -> list[list[str]]:
+    groups: list[list[str]] = []
+    current: list[str] = []
+    used = 0
+    for entry in entries:
+        tokens = _estimate_tokens(entry)
+        if current and used + tokens > token_budget:
+            groups.append(current)
+            current = []
+            used = 0
+        current.append(entry)
+        used += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _daily_prompt(entries: list[str]) -> list[dict[str, str]]:
     system = (
         "You produce a daily rollup from conversation summaries. Return STRICT JSON only. "
         "Schema: {overview, top_topics, decisions, action_items, questions, risks, follow_ups}. "
         "top_topics is a list of short strings. decisions/action_items/questions/risks/follow_ups are lists. "
         "Each action item: {item, owner, due}. Avoid duplication. Do not invent facts."
     )
-    user = "Block summaries JSON:\n" + str(block_summaries)
+    user = "Block summaries JSON:\n[" + ",".join(entries) + "]"
     return [{"role": "system", "content": system}, {"role": "user", "content": user}]
 
 
-def format_markdown(summary: dict[str, Any]) -> str:
+def _range_prompt(rollup: str, date_str: str, daily: str) -> list[dict[str, str]]:
+    system = (
+        "You extend a multi-day rollup with one more day's summary. Return STRICT JSON only. "
+        "Schema: {overview, top_topics, decisions, action_items, questions, risks, follow_ups}. "
+        "top_topics is a list of short strings. decisions/action_items/questions/risks/follow_ups are lists. "
+        "Each action item: {item, owner, due}. Merge duplicates, drop resolved items. Do not invent facts."
+    )
+    user = f"Rollup so far JSON:\n{rollup}\n\nSummary for {date_str} JSON:\n{daily}"
+    return [{"role": "system", "content": system}, {"role": "user", "content": user}]
+
+
+def format_markdown(summary: dict[str, Any], title: str = "Daily Summary") -> str:
     daily = summary.get("daily_summary", {})
-    lines = ["# Daily Summary", "", f"Date: {summary.get('date', '')}", ""]
+    lines = [f"# {title}", "", f"Date: {summary.get('date', '')}", ""]
 
     if daily.get("overview"):
         lines += ["## Overview", daily.get("overview", ""), ""]
@@ -131,37 +359,177 @@ def format_markdown(summary: dict[str, Any]) -> str:
     return "\n".join(lines).strip() + "\n"
 
 
+@dataclass
+class _RollingState:
+    builder: BlockBuilder
+    consumed: list[str] = field(default_factory=list)
+    horizon: float = 0.0
+
+
 class Summarizer:
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(self, config: AppConfig, cache: ResponseCache | None = None) -> None:
         self._config = config
         self._llm = LLMClient(
             base_url=config.llm_base_url,
             api_key=config.llm_api_key,
             model=config.llm_model,
             timeout_seconds=config.llm_timeout_seconds,
+            max_concurrency=config.llm_max_concurrency,
+            cache=cache,
         )
+        self._blocks_lock = threading.Lock()
+        self._rolling_lock = threading.Lock()
+        self._rolling: dict[str, _RollingState] = {}
 
-    def summarize_day(self, storage: Storage, date_str: str) -> dict[str, Any]:
-        segments = load_segments(storage, date_str, self._config.segment_seconds)
-        if not segments:
-            return {"date": date_str, "blocks": [], "daily_summary": {"overview": "No speech detected."}}
+    @property
+    def config(self) -> AppConfig:
+        return self._config
 
-        blocks = group_segments(
-            segments,
-            gap_seconds=self._config.conversation_gap_seconds,
-            max_words=self._config.conversation_max_words,
-        )
+    def _block_key(self, block: ConversationBlock) -> str:
+        # Keyed by prompt as well as span so prompt or model changes invalidate persisted summaries.
+        raw = json.dumps([self._llm.model, block.start, block.end, _block_prompt(block.text)], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+    def _load_block_summaries(self, storage: Storage, date_str: str) -> dict[str, dict[str, Any]]:
+        path = storage.block_summaries_path(date_str)
+        if not path.exists():
+            return {}
+        try:
+            return read_json(path).get("blocks", {})
+        except Exception:
+            return {}
 
-        block_summaries: list[dict[str, Any]] = []
-        for block in blocks:
-            content = self._llm.chat(_block_prompt(block.text), temperature=0.2)
-            parsed = safe_json_load(content)
+    def _summarize_blocks(
+        self,
+        storage: Storage,
+        date_str: str,
+        blocks: list[ConversationBlock],
+        prune: bool = False,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> list[dict[str, Any]]:
+        keys = [self._block_key(block) for block in blocks]
+        with self._blocks_lock:
+            persisted = self._load_block_summaries(storage, date_str)
+
+        missing: dict[str, ConversationBlock] = {}
+        for key, block in zip(keys, blocks):
+            if key not in persisted:
+                missing[key] = block
+
+        cached = len(blocks) - len(missing)
+
+        def block_progress(done: int, total: int) -> None:
+            if progress is not None:
+                progress(cached + done, len(blocks))
+
+        block_progress(0, len(missing))
+        with tracing.span("summarize.blocks", blocks=len(blocks), cached=cached):
+            contents = self._llm.chat_many(
+                [_block_prompt(block.text) for block in missing.values()],
+                temperature=0.2,
+                validate=_json_object,
+                progress=block_progress,
+            )
+        fresh: dict[str, dict[str, Any]] = {}
+        for (key, block), content in zip(missing.items(), contents):
+            parsed = _json_object(content)
             parsed["start"] = block.start
             parsed["end"] = block.end
-            block_summaries.append(parsed)
+            fresh[key] = parsed
+
+        if fresh or prune:
+            with self._blocks_lock:
+                current = self._load_block_summaries(storage, date_str)
+                current.update(fresh)
+                if prune:
+                    current = {key: current[key] for key in keys if key in current}
+                with tracing.span("artifact.write", file="blocks.json"):
+                    write_json(storage.block_summaries_path(date_str), {"blocks": current})
+        persisted.update(fresh)
+        return [dict(persisted[key]) for key in keys]
+
+    def summarize_closed_blocks(self, storage: Storage, date_str: str) -> int:
+        segment_seconds = self._config.segment_seconds
+        with self._rolling_lock:
+            files = storage.list_transcript_files(date_str)
+            state = self._rolling.get(date_str)
+            if state is None or [path.stem for path in files[: len(state.consumed)]] != state.consumed:
+                state = _RollingState(
+                    builder=BlockBuilder(
+                        gap_seconds=self._config.conversation_gap_seconds,
+                        max_words=self._config.conversation_max_words,
+                    )
+                )
+                self._rolling[date_str] = state
+
+            # Only extend over a contiguous run of segments; a missing transcript
+            # would otherwise look like silence and close a block early.
+            for transcript_path in files[len(state.consumed) :]:
+                if segment_index(transcript_path.stem) != len(state.consumed):
+                    break
+                payload = read_transcript(transcript_path)
+                offset = _offset_from_stem(transcript_path.stem, segment_seconds)
+                segments = _payload_segments(payload, transcript_path.name, offset)
+                state.builder.extend(sorted(segments, key=lambda s: s["start"]))
+                state.horizon = offset + float(payload.get("duration") or segment_seconds)
+                state.consumed.append(transcript_path.stem)
+
+            closed = state.builder.closed_blocks(state.horizon)
+
+        return len(self._summarize_blocks(storage, date_str, closed))
+
+    def _rollup(self, summaries: list[dict[str, Any]], check: Callable[[], None] | None = None) -> dict[str, Any]:
+        # Map-reduce: pack compact summaries into budget-sized groups, reduce each
+        # group to an intermediate rollup and repeat until a single group remains.
+        # Capping every entry at half the budget guarantees at least two entries
+        # per group, so each level at least halves the count.
+        budget = self._config.llm_rollup_token_budget
+        level = summaries
+        depth = 0
+        while True:
+            if check is not None:
+                check()
+            entries = [_fit_summary(summary, budget // 2) for summary in level]
+            groups = _pack_groups(entries, budget)
+            with tracing.span("summarize.rollup", level=depth, entries=len(entries), groups=len(groups)):
+                if len(groups) == 1:
+                    content = self._llm.chat(_daily_prompt(groups[0]), temperature=0.2, validate=_json_object)
+                    return _json_object(content)
+                contents = self._llm.chat_many(
+                    [_daily_prompt(group) for group in groups], temperature=0.2, validate=_json_object
+                )
+            level = [_json_object(content) for content in contents]
+            depth += 1
+
+    def summarize_day(
+        self, storage: Storage, date_str: str, progress: Callable[[int, int], None] | None = None
+    ) -> dict[str, Any]:
+        with tracing.span("group_segments", date=date_str) as span:
+            blocks = list(
+                iter_blocks(
+                    iter_segments(storage, date_str, self._config.segment_seconds),
+                    gap_seconds=self._config.conversation_gap_seconds,
+                    max_words=self._config.conversation_max_words,
+                )
+            )
+            span.set(blocks=len(blocks))
+        return self.summarize_blocks(storage, date_str, blocks, progress=progress)
+
+    def summarize_blocks(
+        self,
+        storage: Storage,
+        date_str: str,
+        blocks: list[ConversationBlock],
+        progress: Callable[[int, int], None] | None = None,
+        prune: bool = True,
+    ) -> dict[str, Any]:
+        if not blocks:
+            return {"date": date_str, "blocks": [], "daily_summary": {"overview": "No speech detected."}}
+
+        block_summaries = self._summarize_blocks(storage, date_str, blocks, prune=prune, progress=progress)
 
-        daily_content = self._llm.chat(_daily_prompt(block_summaries), temperature=0.2)
-        daily_summary = safe_json_load(daily_content)
+        check = (lambda: progress(len(blocks), len(blocks))) if progress is not None else None
+        daily_summary = self._rollup(block_summaries, check=check)
 
         summary = {
             "date": date_str,
@@ -170,11 +538,149 @@ class Summarizer:
         }
         return summary
 
+    def rollup_fingerprint(self) -> str:
+        # Seeds the range rollup cache chain so a model or prompt change starts a new chain.
+        raw = json.dumps([self._llm.model, _range_prompt("", "", "")], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def fold_day(self, rollup: dict[str, Any], date_str: str, daily: dict[str, Any]) -> dict[str, Any]:
+        budget = self._config.llm_rollup_token_budget // 2
+        prompt = _range_prompt(_fit_summary(rollup, budget), date_str, _fit_summary(daily, budget))
+        return _json_object(self._llm.chat(prompt, temperature=0.2, validate=_json_object))
+
+
+# Runs rolling block summaries off the caller's thread, coalescing bursts of
+# notifications into at most one queued pass per day.
+class RollingSummarizer:
+    def __init__(self, storage: Storage, summarizer: Summarizer) -> None:
+        self._storage = storage
+        self._summarizer = summarizer
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._lock = threading.Lock()
+        self._queued: dict[str, Future[int]] = {}
+        self.last_error: str | None = None
 
-def summarize_day(storage: Storage, summarizer: Summarizer, date_str: str) -> dict[str, Any]:
-    summary = summarizer.summarize_day(storage, date_str)
-    summary_path = storage.summary_path(date_str)
-    markdown_path = storage.summary_markdown_path(date_str)
-    write_json(summary_path, summary)
-    markdown_path.write_text(format_markdown(summary), encoding="utf-8")
+    def notify(self, date_str: str) -> None:
+        with self._lock:
+            queued = self._queued.get(date_str)
+            if queued is not None and not queued.running() and not queued.done():
+                return
+            self._queued[date_str] = self._executor.submit(self._run, date_str)
+
+    def _run(self, date_str: str) -> int:
+        try:
+            return self._summarizer.summarize_closed_blocks(self._storage, date_str)
+        except Exception as exc:
+            self.last_error = f"{date_str}: {exc}"
+            return 0
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def summarize_day(
+    storage: Storage,
+    summarizer: Summarizer,
+    date_str: str,
+    progress: Callable[[int, int], None] | None = None,
+) -> dict[str, Any]:
+    summary = summarizer.summarize_day(storage, date_str, progress=progress)
+    _write_day_summary(storage, date_str, summary)
     return summary
+
+
+def _write_day_summary(storage: Storage, date_str: str, summary: dict[str, Any]) -> None:
+    with tracing.span("artifact.write", file="summary.json"):
+        write_json(storage.summary_path(date_str), summary)
+        storage.summary_markdown_path(date_str).write_text(format_markdown(summary), encoding="utf-8")
+
+
+def _date_range(date_from: str, date_to: str) -> list[str]:
+    start = date.fromisoformat(date_from)
+    end = date.fromisoformat(date_to)
+    if end < start:
+        raise ValueError("date_to is before date_from")
+    return [(start + timedelta(days=offset)).isoformat() for offset in range((end - start).days + 1)]
+
+
+def summarize_range(
+    storage: Storage,
+    summarizer: Summarizer,
+    date_from: str,
+    date_to: str,
+    progress: Callable[[int, int], None] | None = None,
+    hold_day: Callable[[str], ContextManager[bool]] | None = None,
+) -> dict[str, Any]:
+    # Left fold over daily summaries. Each step is cached under a hash chained
+    # from the previous step and the day's summary, so any range sharing a prefix
+    # (e.g. the same week plus one day) reuses every earlier reduction. Days with
+    # no up-to-date summary are grouped straight from their transcripts, one day's
+    # blocks at a time, so memory stays bounded by a day rather than the range.
+    # Such a summary is only saved if the day has no untranscribed audio left
+    # and hold_day grants the day (no pipeline or summarize job is writing it);
+    # otherwise (e.g. today, still recording) it is used for this rollup only.
+    dates = _date_range(date_from, date_to)
+    known = set(storage.list_days())
+    missing = [
+        date_str
+        for date_str in dates
+        if date_str in known and not storage.summary_is_current(date_str) and storage.list_transcript_files(date_str)
+    ]
+    config = summarizer.config
+    day_blocks = groupby(
+        iter_range_blocks(
+            storage, missing, config.segment_seconds, config.conversation_gap_seconds, config.conversation_max_words
+        ),
+        key=itemgetter(0),
+    )
+    upcoming = next(day_blocks, None)
+    cache_dir = storage.cache_dir("rollups")
+    chain = summarizer.rollup_fingerprint()
+    rollup: dict[str, Any] | None = None
+    included: list[str] = []
+    for done, date_str in enumerate(dates):
+        if progress is not None:
+            progress(done, len(dates))
+        if upcoming is not None and upcoming[0] == date_str:
+            blocks = [block for _, block in upcoming[1]]
+            upcoming = next(day_blocks, None)
+            with hold_day(date_str) if hold_day is not None else nullcontext(True) as held:
+                save = held and not storage.pending_audio(date_str)
+                summary = summarizer.summarize_blocks(storage, date_str, blocks, prune=save)
+                if save:
+                    _write_day_summary(storage, date_str, summary)
+        elif date_str in known and storage.summary_path(date_str).exists():
+            summary = read_json(storage.summary_path(date_str))
+        else:
+            continue
+        daily = summary.get("daily_summary") or {}
+        if not summary.get("blocks"):
+            continue
+
+        day_key = json.dumps(daily, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        chain = hashlib.sha256(f"{chain}|{date_str}|{day_key}".encode("utf-8")).hexdigest()
+        cached = cache_dir / f"{chain}.json"
+        if rollup is None:
+            rollup = daily
+        elif cached.exists():
+            rollup = read_json(cached)
+        else:
+            rollup = summarizer.fold_day(rollup, date_str, daily)
+            write_json(cached, rollup)
+        included.append(date_str)
+
+    result = {
+        "date": f"{date_from}..{date_to}",
+        "date_from": date_from,
+        "date_to": date_to,
+        "days": included,
+        "blocks": [],
+        "daily_summary": rollup or {"overview": "No summaries in range."},
+    }
+    write_json(storage.rollup_path(date_from, date_to), result)
+    storage.rollup_markdown_path(date_from, date_to).write_text(
+        format_markdown(result, title="Range Summary"), encoding="utf-8"
+    )
+    if progress is not None:
+        progress(len(dates), len(dates))
+    return result
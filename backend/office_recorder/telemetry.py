@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass
+import math
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Any
+
+_LEVEL_RE = re.compile(r"lavfi\.astats\.Overall\.(RMS|Peak)_level=(\S+)")
+_OPENING_RE = re.compile(r"Opening '([^']+)' for writing")
+_POLL_SECONDS = 0.25
+
+
+@dataclass
+class CaptureSample:
+    at: float
+    total_bytes: int | None
+    out_seconds: float | None
+    speed: float | None
+    drop_frames: int
+    rms_dbfs: float | None
+    peak_dbfs: float | None
+    segment: str | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _parse_int(value: str | None) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_level(value: str) -> float | None:
+    try:
+        level = float(value)
+    except ValueError:
+        return None
+    # Digital silence reports -inf; clamp so the value stays JSON-serializable.
+    return max(level, -120.0) if not math.isnan(level) else None
+
+
+class _Tail:
+    def __init__(self, path: Path, position: int | None) -> None:
+        self.path = path
+        self.position = position
+        self._partial = b""
+
+    def read_lines(self) -> list[str]:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return []
+        if self.position is None:
+            self.position = size
+        if size < self.position:
+            # Truncated (ffmpeg reopened the file); start over.
+            self.position = 0
+            self._partial = b""
+        if size == self.position:
+            return []
+        with self.path.open("rb") as handle:
+            handle.seek(self.position)
+            data = handle.read(size - self.position)
+        self.position += len(data)
+        chunks = (self._partial + data).split(b"\n")
+        self._partial = chunks.pop()
+        return [chunk.decode("utf-8", errors="replace").rstrip("\r") for chunk in chunks]
+
+
+# ffmpeg writes `-progress` key=value blocks to one file and astats levels plus
+# segment-muxer messages to its log. A thread polls both files every
+# _POLL_SECONDS (250 ms) for appended lines and feeds a bounded ring buffer, so
+# telemetry survives an API restart the same way the recording does.
+class CaptureTelemetry:
+    def __init__(self, capacity: int = 600, dead_dbfs: float = -80.0, alert_seconds: float = 10.0) -> None:
+        self._samples: deque[CaptureSample] = deque(maxlen=capacity)
+        self._rotations = 0
+        self._dead_dbfs = dead_dbfs
+        self._alert_seconds = alert_seconds
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._progress: dict[str, str] = {}
+        self._rms: float | None = None
+        self._peak: float | None = None
+        self._segment: str | None = None
+        self._last_audible: float | None = None
+        self._levels = True
+        self._attached_at: float | None = None
+        self._tails: list[tuple[_Tail, Any]] = []
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def attach(self, log_path: Path, progress_path: Path, log_offset: int | None = None, levels: bool = True) -> None:
+        # levels=False when ffmpeg runs without the astats chain: progress is still
+        # tracked but there is no input level to raise a "silent" alert from.
+        self.detach()
+        with self._lock:
+            self._levels = levels
+            self._progress = {}
+            self._rms = self._peak = None
+            self._last_audible = None
+            self._attached_at = time.time()
+        self._tails = [
+            (_Tail(log_path, log_offset), self.feed_log),
+            (_Tail(progress_path, 0 if not progress_path.exists() else None), self.feed_progress),
+        ]
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="capture-telemetry", daemon=True)
+        self._thread.start()
+
+    def detach(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self._thread = None
+        self._tails = []
+        with self._lock:
+            self._attached_at = None
+            self._bump()
+
+    def _loop(self) -> None:
+        while not self._stop_event.is_set():
+            for tail, feed in self._tails:
+                for line in tail.read_lines():
+                    feed(line)
+            self._stop_event.wait(_POLL_SECONDS)
+
+    def _bump(self) -> None:
+        self._seq += 1
+
+    def feed_log(self, line: str) -> None:
+        level = _LEVEL_RE.search(line)
+        if level is not None:
+            value = _parse_level(level.group(2))
+            with self._lock:
+                if level.group(1) == "RMS":
+                    self._rms = value
+                    if value is not None and value > self._dead_dbfs:
+                        self._last_audible = time.time()
+                else:
+                    self._peak = value
+            return
+        opening = _OPENING_RE.search(line)
+        if opening is not None:
+            with self._lock:
+                self._segment = Path(opening.group(1)).name
+                self._rotations += 1
+                self._bump()
+
+    def feed_progress(self, line: str) -> None:
+        key, _, value = line.partition("=")
+        key = key.strip()
+        if not key:
+            return
+        with self._lock:
+            self._progress[key] = value.strip()
+            if key != "progress":
+                return
+            out_us = _parse_int(self._progress.get("out_time_us"))
+            speed = self._progress.get("speed", "").rstrip("x")
+            try:
+                speed_value: float | None = float(speed)
+            except ValueError:
+                speed_value = None
+            self._samples.append(
+                CaptureSample(
+                    at=time.time(),
+                    total_bytes=_parse_int(self._progress.get("total_size")),
+                    out_seconds=out_us / 1_000_000 if out_us is not None else None,
+                    speed=speed_value,
+                    drop_frames=_parse_int(self._progress.get("drop_frames")) or 0,
+                    rms_dbfs=self._rms,
+                    peak_dbfs=self._peak,
+                    segment=self._segment,
+                )
+            )
+            self._progress = {}
+            self._bump()
+
+    @property
+    def seq(self) -> int:
+        with self._lock:
+            return self._seq
+
+    def _alerts(self, now: float) -> list[str]:
+        if self._attached_at is None or now - self._attached_at < self._alert_seconds:
+            return []
+        alerts: list[str] = []
+        last = self._samples[-1] if self._samples else None
+        if last is None or now - last.at > self._alert_seconds:
+            alerts.append("stalled")
+        if self._levels and (self._last_audible is None or now - self._last_audible > self._alert_seconds):
+            alerts.append("silent")
+        if len(self._samples) >= 2 and last is not None:
+            window = [sample for sample in self._samples if now - sample.at <= self._alert_seconds]
+            if window and last.drop_frames > window[0].drop_frames:
+                alerts.append("dropping")
+        return alerts
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            last = self._samples[-1] if self._samples else None
+            return {
+                "attached": self._attached_at is not None,
+                "levels": self._levels,
+                "seq": self._seq,
+                "sample": last.to_dict() if last is not None else None,
+                "rms_dbfs": self._rms,
+                "peak_dbfs": self._peak,
+                "segment": self._segment,
+                "rotations": self._rotations,
+                "alerts": self._alerts(now),
+            }
+
+    def history(self, seconds: float) -> list[dict[str, Any]]:
+        cutoff = time.time() - seconds
+        with self._lock:
+            return [sample.to_dict() for sample in self._samples if sample.at >= cutoff]
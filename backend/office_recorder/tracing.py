@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import json
+import os
+from pathlib import Path
+import random
+import threading
+import time
+from typing import Any, Callable, Iterator, TypeVar
+
+_T = TypeVar("_T")
+
+# Older events are dropped first once a day's trace.json reaches this size.
+MAX_EVENTS = 200_000
+
+
+class _Collector:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.events: list[dict[str, Any]] = []
+
+    def add(self, event: dict[str, Any]) -> None:
+        with self._lock:
+            if len(self.events) < MAX_EVENTS:
+                self.events.append(event)
+
+    def extend(self, events: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self.events.extend(events[: max(0, MAX_EVENTS - len(self.events))])
+
+    def drain(self) -> list[dict[str, Any]]:
+        with self._lock:
+            events, self.events = self.events, []
+        return events
+
+
+_current: ContextVar[_Collector | None] = ContextVar("office_recorder_trace", default=None)
+# Set in pool workers: spans are buffered here and shipped back with each result.
+_process_buffer: _Collector | None = None
+
+
+class Span:
+    __slots__ = ("_collector", "_name", "_args", "_start_us", "_start_ns")
+
+    def __init__(self, collector: _Collector, name: str, args: dict[str, Any]) -> None:
+        self._collector = collector
+        self._name = name
+        self._args = args
+        self._start_us = 0
+        self._start_ns = 0
+
+    def set(self, **attrs: Any) -> None:
+        self._args.update(attrs)
+
+    def __enter__(self) -> Span:
+        # Wall-clock start so spans from pool workers line up with the parent's.
+        self._start_us = time.time_ns() // 1000
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is not None:
+            self._args["error"] = exc_type.__name__
+        self._collector.add(
+            {
+                "name": self._name,
+                "cat": self._name.split(".", 1)[0],
+                "ph": "X",
+                "ts": self._start_us,
+                "dur": (time.perf_counter_ns() - self._start_ns) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_native_id(),
+                "args": self._args,
+            }
+        )
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        return None
+
+    def __enter__(self) -> NullSpan:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        return None
+
+
+_NULL_SPAN = NullSpan()
+
+
+def span(name: str, **attrs: Any) -> Span | NullSpan:
+    collector = _current.get() or _process_buffer
+    if collector is None:
+        return _NULL_SPAN
+    return Span(collector, name, attrs)
+
+
+def active() -> bool:
+    return (_current.get() or _process_buffer) is not None
+
+
+def bind(fn: Callable[..., _T]) -> Callable[..., _T]:
+    # Thread pools do not inherit context variables; carry the trace across.
+    collector = _current.get()
+    if collector is None:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> _T:
+        token = _current.set(collector)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return wrapper
+
+
+def buffer_spans() -> None:
+    global _process_buffer
+    _process_buffer = _Collector()
+
+
+def drain() -> list[dict[str, Any]]:
+    return _process_buffer.drain() if _process_buffer is not None else []
+
+
+def merge(events: list[dict[str, Any]]) -> None:
+    collector = _current.get()
+    if collector is not None and events:
+        collector.extend(events)
+
+
+_write_lock = threading.Lock()
+
+
+def _write(path: Path, events: list[dict[str, Any]]) -> None:
+    with _write_lock:
+        existing: list[dict[str, Any]] = []
+        if path.exists():
+            try:
+                existing = [event for event in json.loads(path.read_text())["traceEvents"] if event.get("ph") != "M"]
+            except (OSError, ValueError, KeyError, TypeError):
+                existing = []
+        _write_events(path, (existing + events)[-MAX_EVENTS:])
+
+
+def _write_events(path: Path, merged: list[dict[str, Any]]) -> None:
+    parent = os.getpid()
+    pids = sorted({event["pid"] for event in merged})
+    names = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": 0,
+            "args": {"name": "office_recorder" if pid == parent else f"worker {pid}"},
+        }
+        for pid in pids
+    ]
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps({"traceEvents": names + merged, "displayTimeUnit": "ms"}), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def trace_run(path: Path, name: str, enabled: bool = True, sample_rate: float = 1.0, **attrs: Any) -> Iterator[bool]:
+    # One sampling decision per run keeps every kept trace complete.
+    if not enabled or random.random() >= sample_rate:
+        yield False
+        return
+    collector = _Collector()
+    token = _current.set(collector)
+    try:
+        with Span(collector, name, attrs):
+            yield True
+    finally:
+        _current.reset(token)
+        try:
+            _write(path, collector.drain())
+        except OSError:
+            pass
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import struct
+from typing import Any, Iterable
+
+import numpy as np
+
+from .utils import read_json, segment_index, write_json
+
+JSON_SUFFIX = ".json"
+COLUMNAR_SUFFIX = ".tcol"
+TRANSCRIPT_SUFFIXES = (JSON_SUFFIX, COLUMNAR_SUFFIX)
+
+# Columnar layout: magic, u32 header length, JSON header, then one body holding
+# starts (f8), ends (f8), speaker ids (i4, -1 = none), text offsets (u4, n+1) and
+# the UTF-8 text blob. The body is optionally zstd-compressed.
+_MAGIC = b"ORTC1\n"
+
+
+@dataclass
+class TranscriptColumns:
+    starts: np.ndarray
+    ends: np.ndarray
+    speaker_ids: np.ndarray
+    speakers: list[str]
+    text_offsets: np.ndarray
+    text_blob: bytes
+    meta: dict[str, Any]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text(self, index: int) -> str:
+        return self.text_blob[self.text_offsets[index] : self.text_offsets[index + 1]].decode("utf-8")
+
+    def speaker(self, index: int) -> str | None:
+        speaker_id = int(self.speaker_ids[index])
+        return self.speakers[speaker_id] if speaker_id >= 0 else None
+
+
+def transcript_path_for(transcripts_dir: Path, stem: str, fmt: str) -> Path:
+    return transcripts_dir / f"{stem}{COLUMNAR_SUFFIX if fmt == 'columnar' else JSON_SUFFIX}"
+
+
+def find_transcript(transcripts_dir: Path, stem: str) -> Path | None:
+    for suffix in TRANSCRIPT_SUFFIXES:
+        path = transcripts_dir / f"{stem}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def _zstd() -> Any:
+    try:
+        import zstandard  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError("zstandard is not installed") from exc
+    return zstandard
+
+
+def _encode_columns(payload: dict[str, Any], compression: str) -> bytes:
+    segments = payload.get("segments", [])
+    speakers: list[str] = []
+    speaker_lookup: dict[str, int] = {}
+    speaker_ids = np.full(len(segments), -1, dtype="<i4")
+    texts: list[bytes] = []
+    for index, segment in enumerate(segments):
+        speaker = segment.get("speaker")
+        if speaker is not None:
+            if speaker not in speaker_lookup:
+                speaker_lookup[speaker] = len(speakers)
+                speakers.append(speaker)
+            speaker_ids[index] = speaker_lookup[speaker]
+        texts.append(str(segment.get("text", "")).encode("utf-8"))
+
+    starts = np.array([float(seg.get("start", 0.0)) for seg in segments], dtype="<f8")
+    ends = np.array([float(seg.get("end", 0.0)) for seg in segments], dtype="<f8")
+    offsets = np.zeros(len(segments) + 1, dtype="<u4")
+    if texts:
+        offsets[1:] = np.cumsum([len(text) for text in texts])
+    body = starts.tobytes() + ends.tobytes() + speaker_ids.tobytes() + offsets.tobytes() + b"".join(texts)
+    if compression == "zstd":
+        body = _zstd().ZstdCompressor(level=3).compress(body)
+
+    meta = {key: value for key, value in payload.items() if key not in ("segments", "text")}
+    header = json.dumps(
+        {"meta": meta, "count": len(segments), "speakers": speakers, "compression": compression},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return _MAGIC + struct.pack("<I", len(header)) + header + body
+
+
+def _read_header(raw: bytes) -> tuple[dict[str, Any], int]:
+    if not raw.startswith(_MAGIC):
+        raise ValueError("Not a columnar transcript")
+    (header_len,) = struct.unpack_from("<I", raw, len(_MAGIC))
+    header_end = len(_MAGIC) + 4 + header_len
+    return json.loads(raw[len(_MAGIC) + 4 : header_end]), header_end
+
+
+def _decode_columns(raw: bytes) -> TranscriptColumns:
+    header, header_end = _read_header(raw)
+    body: bytes | memoryview = memoryview(raw)[header_end:]
+    if header.get("compression") == "zstd":
+        body = _zstd().ZstdDecompressor().decompress(bytes(body))
+
+    count = header["count"]
+    position = 0
+
+    def take(dtype: str, items: int) -> np.ndarray:
+        nonlocal position
+        array = np.frombuffer(body, dtype=dtype, count=items, offset=position)
+        position += array.nbytes
+        return array
+
+    starts = take("<f8", count)
+    ends = take("<f8", count)
+    speaker_ids = take("<i4", count)
+    offsets = take("<u4", count + 1)
+    return TranscriptColumns(
+        starts=starts,
+        ends=ends,
+        speaker_ids=speaker_ids,
+        speakers=header.get("speakers", []),
+        text_offsets=offsets,
+        text_blob=bytes(body[position:]),
+        meta=header.get("meta", {}),
+    )
+
+
+def load_columns(path: Path) -> TranscriptColumns:
+    if path.suffix == COLUMNAR_SUFFIX:
+        return _decode_columns(path.read_bytes())
+    # Legacy JSON transcripts are converted on the fly.
+    return _decode_columns(_encode_columns(read_json(path), "none"))
+
+
+def write_transcript(path: Path, payload: dict[str, Any], compression: str = "none") -> Path:
+    if path.suffix == COLUMNAR_SUFFIX:
+        path.write_bytes(_encode_columns(payload, compression))
+    else:
+        write_json(path, payload)
+    return path
+
+
+def read_transcript(path: Path) -> dict[str, Any]:
+    if path.suffix != COLUMNAR_SUFFIX:
+        return read_json(path)
+    columns = load_columns(path)
+    segments: list[dict[str, Any]] = []
+    for index in range(len(columns)):
+        segment: dict[str, Any] = {
+            "start": float(columns.starts[index]),
+            "end": float(columns.ends[index]),
+            "text": columns.text(index),
+        }
+        speaker = columns.speaker(index)
+        if speaker is not None:
+            segment["speaker"] = speaker
+        segments.append(segment)
+    return {**columns.meta, "segments": segments, "text": " ".join(seg["text"] for seg in segments).strip()}
+
+
+def read_transcript_meta(path: Path) -> tuple[dict[str, Any], int]:
+    # Metadata and segment count without decoding segments (columnar files only
+    # read the header).
+    if path.suffix != COLUMNAR_SUFFIX:
+        payload = read_json(path)
+        return {key: value for key, value in payload.items() if key not in ("segments", "text")}, len(
+            payload.get("segments", [])
+        )
+    with path.open("rb") as handle:
+        prefix = handle.read(len(_MAGIC) + 4)
+        if len(prefix) < len(_MAGIC) + 4:
+            raise ValueError("Not a columnar transcript")
+        (header_len,) = struct.unpack_from("<I", prefix, len(_MAGIC))
+        header, _ = _read_header(prefix + handle.read(header_len))
+    return header.get("meta", {}), int(header["count"])
+
+
+@dataclass
+class DayColumns:
+    starts: np.ndarray
+    ends: np.ndarray
+    speaker_ids: np.ndarray
+    speakers: list[str]
+    source_ids: np.ndarray
+    sources: list[str]
+    text_starts: np.ndarray
+    text_ends: np.ndarray
+    text_blob: bytes
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text(self, index: int) -> str:
+        return self.text_blob[self.text_starts[index] : self.text_ends[index]].decode("utf-8")
+
+
+def load_day_columns(paths: Iterable[Path], segment_seconds: int) -> DayColumns:
+    # Concatenates per-file columns with day offsets applied and rows in start order.
+    # Text stays in one blob (in file order) so no per-segment objects are created.
+    starts: list[np.ndarray] = []
+    ends: list[np.ndarray] = []
+    speaker_ids: list[np.ndarray] = []
+    source_ids: list[np.ndarray] = []
+    text_starts: list[np.ndarray] = []
+    text_ends: list[np.ndarray] = []
+    blobs: list[bytes] = []
+    speaker_lookup: dict[str, int] = {}
+    sources: list[str] = []
+    blob_size = 0
+    for path in paths:
+        columns = load_columns(path)
+        offset = max(0, segment_index(path.stem)) * segment_seconds
+        remap = np.array(
+            [speaker_lookup.setdefault(name, len(speaker_lookup)) for name in columns.speakers] + [-1],
+            dtype="<i4",
+        )
+        text_offsets = columns.text_offsets.astype(np.int64) + blob_size
+        starts.append(columns.starts + offset)
+        ends.append(columns.ends + offset)
+        speaker_ids.append(remap[columns.speaker_ids])
+        source_ids.append(np.full(len(columns), len(sources), dtype="<i4"))
+        text_starts.append(text_offsets[:-1])
+        text_ends.append(text_offsets[1:])
+        blobs.append(columns.text_blob)
+        blob_size += len(columns.text_blob)
+        sources.append(path.name)
+
+    if not sources:
+        empty_f = np.zeros(0, dtype="<f8")
+        empty_i = np.zeros(0, dtype=np.int64)
+        return DayColumns(empty_f, empty_f, empty_i, [], empty_i, [], empty_i, empty_i, b"")
+
+    all_starts = np.concatenate(starts)
+    order = np.argsort(all_starts, kind="stable")
+    return DayColumns(
+        starts=all_starts[order],
+        ends=np.concatenate(ends)[order],
+        speaker_ids=np.concatenate(speaker_ids)[order],
+        speakers=list(speaker_lookup),
+        source_ids=np.concatenate(source_ids)[order],
+        sources=sources,
+        text_starts=np.concatenate(text_starts)[order],
+        text_ends=np.concatenate(text_ends)[order],
+        text_blob=b"".join(blobs),
+    )
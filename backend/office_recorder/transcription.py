@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
+import multiprocessing
+import os
 from pathlib import Path
-from typing import Any
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator
 
+from .audio import WHISPER_SAMPLE_RATE, ActivityScan, crop_regions, load_audio, scan_activity, uncrop_time
 from .config import AppConfig
 from .storage import Storage
-from .diarization import Diarizer
-from .utils import write_json
+from .diarization import DIARIZATION_MODEL, Diarizer
+from . import tracing
+from .model_manager import ModelManager, whisper_estimate_bytes
+from .metrics import REGISTRY, TRANSCRIBE_FILES, TRANSCRIBE_REALTIME, TRANSCRIBE_SECONDS, Sample
+from .transcript_store import find_transcript, read_transcript, read_transcript_meta, transcript_path_for, write_transcript
+from .utils import lower_io_priority
 
 
 @dataclass
@@ -20,46 +32,91 @@ class TranscriptResult:
 
 
 class Transcriber:
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(self, config: AppConfig, models: ModelManager | None = None) -> None:
         self._config = config
         self._model = None
+        # Without a manager (pool workers, remote workers) the model is loaded on
+        # first use and kept for the life of the process.
+        self._models = models
+        if models is not None:
+            models.register(self.model_key, self._create_model, whisper_estimate_bytes(config.transcribe_model))
 
-    def _load_model(self) -> None:
-        if self._model is not None:
+    @property
+    def config(self) -> AppConfig:
+        return self._config
+
+    @property
+    def model_key(self) -> str:
+        return f"whisper:{self._config.transcribe_model}"
+
+    @property
+    def models(self) -> ModelManager | None:
+        return self._models
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        # Keeps the model loaded across several transcribe_file() calls.
+        if self._models is not None:
+            with self._models.use(self.model_key):
+                yield
             return
+        self._load_model()
+        yield
+
+    def warm(self) -> None:
+        if self._models is not None:
+            self._models.warm([self.model_key]).join()
+            return
+        self._load_model()
+
+    def _create_model(self) -> Any:
         try:
             from faster_whisper import WhisperModel  # type: ignore
         except ImportError as exc:
             raise RuntimeError("faster-whisper is not installed") from exc
 
-        self._model = WhisperModel(
+        return WhisperModel(
             self._config.transcribe_model,
             device=self._config.transcribe_device,
             compute_type=self._config.transcribe_compute,
+            cpu_threads=self._config.transcribe_cpu_threads,
         )
 
-    def transcribe_file(self, audio_path: Path) -> TranscriptResult:
-        self._load_model()
-        assert self._model is not None
+    def _load_model(self) -> None:
+        if self._model is not None:
+            return
+        with tracing.span("model.load", model=self.model_key):
+            self._model = self._create_model()
 
-        segments_iter, info = self._model.transcribe(
-            str(audio_path),
-            vad_filter=self._config.vad_filter,
-            language=self._config.language,
-        )
+    def transcribe_file(self, audio_path: Path, audio: Any | None = None) -> TranscriptResult:
+        if self._models is not None:
+            with self._models.use(self.model_key) as model:
+                return self._transcribe(model, audio_path, audio)
+        self._load_model()
+        return self._transcribe(self._model, audio_path, audio)
 
-        segments: list[dict[str, Any]] = []
-        texts: list[str] = []
-        for segment in segments_iter:
-            text = segment.text.strip()
-            segments.append(
-                {
-                    "start": float(segment.start),
-                    "end": float(segment.end),
-                    "text": text,
-                }
+    def _transcribe(self, model: Any, audio_path: Path, audio: Any | None) -> TranscriptResult:
+        with tracing.span("whisper.transcribe", file=audio_path.name) as span:
+            segments_iter, info = model.transcribe(
+                audio if audio is not None else str(audio_path),
+                vad_filter=self._config.vad_filter,
+                language=self._config.language,
             )
-            texts.append(text)
+
+            # faster-whisper decodes lazily, so the loop is where the time goes.
+            segments: list[dict[str, Any]] = []
+            texts: list[str] = []
+            for segment in segments_iter:
+                text = segment.text.strip()
+                segments.append(
+                    {
+                        "start": float(segment.start),
+                        "end": float(segment.end),
+                        "text": text,
+                    }
+                )
+                texts.append(text)
+            span.set(segments=len(segments), audio_seconds=getattr(info, "duration", None))
 
         return TranscriptResult(
             audio_path=str(audio_path),
@@ -70,44 +127,332 @@ class Transcriber:
         )
 
 
+def transcribe_segment(
+    transcriber: Transcriber,
+    audio_file: Path,
+    transcript_path: Path,
+    diarizer: Diarizer | None = None,
+    defer_diarization: bool = False,
+) -> Path:
+    # defer_diarization writes the transcript marked as pending for a later
+    # diarize_transcript() pass instead of diarizing it here.
+    with tracing.span("transcribe.segment", file=audio_file.name):
+        return _transcribe_segment(transcriber, audio_file, transcript_path, diarizer, defer_diarization)
+
+
+def _diarize_segments(
+    diarizer: Diarizer, audio_file: Path, segments: list[dict[str, Any]], audio: Any
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    try:
+        diarization = diarizer.diarize(str(audio_file), segments, audio=audio)
+    except Exception as exc:
+        return segments, {"enabled": True, "status": "error", "detail": str(exc)}
+    return diarization.segments, diarization.meta
+
+
+def _transcribe_segment(
+    transcriber: Transcriber,
+    audio_file: Path,
+    transcript_path: Path,
+    diarizer: Diarizer | None,
+    defer_diarization: bool = False,
+) -> Path:
+    config = transcriber.config
+    # Decode once; the same buffer feeds the energy scan, Whisper and diarization.
+    with tracing.span("audio.decode", file=audio_file.name):
+        audio = load_audio(audio_file, ffmpeg_bin=config.ffmpeg_bin)
+
+    scan: ActivityScan | None = None
+    activity: dict[str, Any] | None = None
+    if config.silence_skip_enabled:
+        with tracing.span("vad.scan", file=audio_file.name) as span:
+            scan = scan_activity(
+                audio,
+                WHISPER_SAMPLE_RATE,
+                threshold_dbfs=config.silence_threshold_dbfs,
+                min_active_seconds=config.silence_min_active_seconds,
+            )
+            span.set(active=scan.active, active_seconds=round(scan.active_seconds, 2))
+        activity = scan.to_dict()
+        if not scan.active:
+            write_transcript(
+                transcript_path,
+                {
+                    "audio_path": str(audio_file),
+                    "language": None,
+                    "duration": scan.duration,
+                    "segments": [],
+                    "text": "",
+                    "skipped": "silent",
+                    "activity": activity,
+                },
+                config.transcript_compression,
+            )
+            TRANSCRIBE_FILES.inc("silent")
+            return transcript_path
+
+    started = time.perf_counter()
+    covered = sum(end - start for start, end in scan.regions) if scan is not None else 0.0
+    if scan is not None and covered < 0.9 * scan.duration:
+        cropped, spans = crop_regions(audio, scan.regions, WHISPER_SAMPLE_RATE)
+        result = transcriber.transcribe_file(audio_file, audio=cropped)
+        for segment in result.segments:
+            segment["start"] = uncrop_time(segment["start"], spans)
+            segment["end"] = uncrop_time(segment["end"], spans)
+        result.duration = scan.duration
+    else:
+        result = transcriber.transcribe_file(audio_file, audio=audio)
+    elapsed = time.perf_counter() - started
+    TRANSCRIBE_SECONDS.observe(elapsed)
+    if result.duration and elapsed > 0:
+        TRANSCRIBE_REALTIME.observe(result.duration / elapsed)
+    TRANSCRIBE_FILES.inc("transcribed")
+    diarization_meta: dict[str, Any] | None = None
+    segments = result.segments
+    if defer_diarization:
+        diarization_meta = {"enabled": True, "status": "pending"}
+    elif diarizer is not None:
+        segments, diarization_meta = _diarize_segments(diarizer, audio_file, segments, audio)
+    payload = {
+        "audio_path": result.audio_path,
+        "language": result.language,
+        "duration": result.duration,
+        "segments": segments,
+        "text": result.text,
+    }
+    if diarization_meta is not None:
+        payload["diarization"] = diarization_meta
+    if activity is not None:
+        payload["activity"] = activity
+    with tracing.span("transcript.write", file=transcript_path.name):
+        write_transcript(transcript_path, payload, config.transcript_compression)
+    return transcript_path
+
+
+def diarize_transcript(diarizer: Diarizer, audio_file: Path, transcript_path: Path, config: AppConfig) -> Path:
+    with tracing.span("diarize.segment", file=audio_file.name):
+        with tracing.span("audio.decode", file=audio_file.name):
+            audio = load_audio(audio_file, ffmpeg_bin=config.ffmpeg_bin)
+        payload = read_transcript(transcript_path)
+        segments, meta = _diarize_segments(diarizer, audio_file, payload.get("segments", []), audio)
+        with tracing.span("transcript.write", file=transcript_path.name):
+            write_transcript(
+                transcript_path, {**payload, "segments": segments, "diarization": meta}, config.transcript_compression
+            )
+    return transcript_path
+
+
+def _awaiting_diarization(path: Path) -> bool:
+    try:
+        meta, _ = read_transcript_meta(path)
+    except (OSError, ValueError, KeyError, RuntimeError):
+        return False
+    diarization = meta.get("diarization")
+    return isinstance(diarization, dict) and diarization.get("status") == "pending"
+
+
+# Transcript path, metric samples and trace spans recorded in the worker.
+WorkerResult = tuple[Path, list[Sample], list[dict[str, Any]]]
+
+# Per-process state for pool workers. Each worker warms exactly one model, so the
+# pool size is also the cap on resident Whisper models.
+_worker_transcriber: Transcriber | None = None
+_worker_diarizer: Diarizer | None = None
+
+
+def init_transcribe_worker(config: AppConfig, diarize: bool, niceness: int = 0, low_io: bool = False) -> None:
+    global _worker_transcriber, _worker_diarizer
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+    if low_io:
+        lower_io_priority()
+    REGISTRY.buffer_samples()
+    if config.trace_enabled:
+        tracing.buffer_spans()
+    _worker_transcriber = Transcriber(config)
+    _worker_transcriber.warm()
+    _worker_diarizer = Diarizer(config) if diarize else None
+
+
+def transcribe_in_worker(audio_file: Path, transcript_path: Path) -> WorkerResult:
+    assert _worker_transcriber is not None
+    path = transcribe_segment(_worker_transcriber, audio_file, transcript_path, _worker_diarizer)
+    return path, REGISTRY.drain(), tracing.drain()
+
+
+def worker_result(result: WorkerResult) -> Path:
+    # Fold a worker's timings and spans into this process's metrics and trace.
+    path, samples, spans = result
+    REGISTRY.replay(samples)
+    tracing.merge(spans)
+    return path
+
+
+# How often a throttled pool re-checks its limit while segments are in flight.
+_THROTTLE_POLL_SECONDS = 15.0
+
+# Audio files a local transcription job has taken on, so remote worker leases
+# skip them.
+_in_flight: Counter[Path] = Counter()
+_in_flight_lock = threading.Lock()
+
+
+def claimed_audio() -> set[Path]:
+    with _in_flight_lock:
+        return set(_in_flight)
+
+
+@contextmanager
+def _claimed(jobs: list[tuple[Path, Path]]) -> Iterator[None]:
+    paths = [audio_file for audio_file, _ in jobs]
+    with _in_flight_lock:
+        _in_flight.update(paths)
+    try:
+        yield
+    finally:
+        with _in_flight_lock:
+            _in_flight.subtract(paths)
+            for path in paths:
+                if _in_flight[path] <= 0:
+                    del _in_flight[path]
+
+
+def pending_transcripts(
+    storage: Storage, date_str: str, transcript_format: str, skip: Iterable[Path] = ()
+) -> list[tuple[Path, Path]]:
+    # (audio, transcript path) for every segment of the day not yet transcribed,
+    # leaving out audio another local job has claimed and anything in skip (the
+    # live worker's queue, the segment still being recorded).
+    day = storage.get_day(date_str)
+    busy = claimed_audio() | set(skip)
+    return [
+        (audio_file, transcript_path_for(day.transcripts_dir, audio_file.stem, transcript_format))
+        for audio_file in storage.list_audio_files(date_str)
+        if audio_file not in busy and find_transcript(day.transcripts_dir, audio_file.stem) is None
+    ]
+
+
+def transcribe_pool(
+    config: AppConfig,
+    jobs: list[tuple[Path, Path]],
+    workers: int,
+    diarize: bool,
+    progress: Callable[[int, int], None] | None = None,
+    limit: Callable[[int], int] | None = None,
+    paused: Callable[[int, int], None] | None = None,
+    niceness: int = 0,
+    low_io: bool = False,
+) -> list[Path]:
+    # limit(running) caps how many segments may be in flight right now; 0 pauses.
+    # Once a paused pool drains, its workers are shut down to free their models
+    # and paused(done, total) is called, which should block until work may resume.
+    pending = list(reversed(jobs))
+    inflight: dict[Future[WorkerResult], Path] = {}
+    written: list[Path] = []
+    executor: ProcessPoolExecutor | None = None
+    with _claimed(jobs):
+        try:
+            while pending or inflight:
+                allowed = limit(len(inflight)) if limit is not None else workers
+                if allowed <= 0 and not inflight:
+                    if executor is not None:
+                        executor.shutdown(wait=True)
+                        executor = None
+                    if paused is not None:
+                        paused(len(written), len(jobs))
+                    else:
+                        time.sleep(_THROTTLE_POLL_SECONDS)
+                    continue
+                while pending and len(inflight) < allowed:
+                    if executor is None:
+                        # spawn: CTranslate2 and torch thread pools are not fork-safe.
+                        executor = ProcessPoolExecutor(
+                            max_workers=workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                            initializer=init_transcribe_worker,
+                            initargs=(config, diarize, niceness, low_io),
+                        )
+                    audio_file, transcript_path = pending.pop()
+                    inflight[executor.submit(transcribe_in_worker, audio_file, transcript_path)] = audio_file
+
+                timeout = _THROTTLE_POLL_SECONDS if limit is not None else None
+                finished, _ = wait(list(inflight), timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    inflight.pop(future)
+                    written.append(worker_result(future.result()))
+                if progress is not None:
+                    progress(len(written), len(jobs))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+    return sorted(written)
+
+
 def transcribe_day(
     storage: Storage,
     transcriber: Transcriber,
     date_str: str,
     diarizer: Diarizer | None = None,
+    workers: int = 1,
+    progress: Callable[[int, int], None] | None = None,
+    skip: Iterable[Path] = (),
 ) -> list[Path]:
-    day = storage.get_day(date_str)
-    audio_files = storage.list_audio_files(date_str)
-    written: list[Path] = []
+    jobs = pending_transcripts(storage, date_str, transcriber.config.transcript_format, skip)
+    # Transcripts left pending by an interrupted two-pass run.
+    undiarized = (
+        [path for path in storage.list_transcript_files(date_str) if _awaiting_diarization(path)]
+        if diarizer is not None
+        else []
+    )
+    workers = min(workers, len(jobs))
+    # When the memory budget cannot hold Whisper and the diarization model at
+    # once, run one pass per model so each stays loaded for the whole day rather
+    # than evicting the other on every segment.
+    two_pass = (
+        diarizer is not None
+        and workers <= 1
+        and transcriber.models is not None
+        and not transcriber.models.fit_together([transcriber.model_key, DIARIZATION_MODEL])
+    )
+    total = len(jobs) * (2 if two_pass else 1) + len(undiarized)
+    done = 0
 
-    for audio_file in audio_files:
-        transcript_path = day.transcripts_dir / f"{audio_file.stem}.json"
-        if transcript_path.exists():
-            continue
-        result = transcriber.transcribe_file(audio_file)
-        diarization_meta: dict[str, Any] | None = None
-        segments = result.segments
-        if diarizer is not None:
-            try:
-                diarization = diarizer.diarize(str(audio_file), segments)
-                segments = diarization.segments
-                diarization_meta = diarization.meta
-            except Exception as exc:
-                diarization_meta = {
-                    "enabled": True,
-                    "status": "error",
-                    "detail": str(exc),
-                }
-        payload = {
-            "audio_path": result.audio_path,
-            "language": result.language,
-            "duration": result.duration,
-            "segments": segments,
-            "text": result.text,
-        }
-        if diarization_meta is not None:
-            payload["diarization"] = diarization_meta
-        write_json(transcript_path, payload)
-        written.append(transcript_path)
+    def advance(count: int = 1) -> None:
+        nonlocal done
+        done += count
+        if progress is not None:
+            progress(done, total)
+
+    advance(0)
+    if workers > 1:
+        written = transcribe_pool(
+            transcriber.config,
+            jobs,
+            workers,
+            diarize=diarizer is not None,
+            progress=lambda finished, _: advance(finished - done),
+        )
+    else:
+        written = []
+        with _claimed(jobs), (transcriber.hold() if two_pass else nullcontext()):
+            for audio_file, transcript_path in jobs:
+                written.append(
+                    transcribe_segment(transcriber, audio_file, transcript_path, diarizer, defer_diarization=two_pass)
+                )
+                advance()
 
+    second_pass = list(undiarized)
+    if two_pass:
+        deferred = [path for path in written if _awaiting_diarization(path)]
+        # Silent segments are never diarized.
+        advance(len(written) - len(deferred))
+        second_pass += deferred
+    if diarizer is not None and second_pass:
+        audio_files = {path.stem: path for path in storage.list_audio_files(date_str)}
+        with diarizer.hold():
+            for transcript_path in second_pass:
+                audio_file = audio_files.get(transcript_path.stem)
+                if audio_file is not None:
+                    diarize_transcript(diarizer, audio_file, transcript_path, transcriber.config)
+                advance()
     return written
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import ctypes
 import json
+import platform
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -19,6 +22,13 @@ def today_str() -> str:
     return now_local().date().isoformat()
 
 
+def segment_index(stem: str) -> int:
+    match = re.search(r"(\d+)$", stem)
+    if not match:
+        return -1
+    return int(match.group(1))
+
+
 def safe_json_load(payload: str) -> dict[str, Any]:
     try:
         return json.loads(payload)
@@ -36,3 +46,21 @@ def write_json(path: Path, payload: Any) -> None:
 
 def read_json(path: Path) -> Any:
     return json.loads(path.read_text())
+
+
+def lower_io_priority() -> bool:
+    # Best effort: throttled disk I/O for the current process.
+    system = platform.system()
+    try:
+        if system == "Darwin":
+            libc = ctypes.CDLL("libc.dylib", use_errno=True)
+            # setiopolicy_np(IOPOL_TYPE_DISK, IOPOL_SCOPE_PROCESS, IOPOL_THROTTLE)
+            return libc.setiopolicy_np(0, 0, 3) == 0
+        if system == "Linux":
+            import psutil  # type: ignore
+
+            psutil.Process().ionice(psutil.IOPRIO_CLASS_IDLE)
+            return True
+    except Exception:
+        return False
+    return False
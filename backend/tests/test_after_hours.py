@@ -0,0 +1,31 @@
+import os
+
+from office_recorder import after_hours
+from office_recorder.after_hours import load_aware_workers
+
+
+def test_load_aware_workers_discounts_own_load(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 16)
+
+    monkeypatch.setattr(os, "getloadavg", lambda: (2.0, 2.0, 2.0))
+    assert load_aware_workers(max_workers=3, threads_per_worker=4) == 3
+
+    monkeypatch.setattr(os, "getloadavg", lambda: (13.0, 13.0, 13.0))
+    assert load_aware_workers(max_workers=3, threads_per_worker=4) == 1
+    # Two of our own 4-thread workers account for 8 of that load.
+    assert load_aware_workers(max_workers=3, threads_per_worker=4, running=2) == 2
+
+
+def test_wait_while_recording_reports_pause(monkeypatch):
+    states = [object(), object(), None]
+
+    class Recorder:
+        def active_state(self):
+            return states.pop(0)
+
+    monkeypatch.setattr(after_hours.time, "sleep", lambda seconds: None)
+    processor = after_hours.AfterHoursProcessor(config=None, storage=None, recorder=Recorder())
+    messages = []
+    processor.wait_while_recording(lambda done, total, message: messages.append(message), 3, 10)
+    assert messages == ["paused: recording active"] * 2
+    assert states == []
@@ -0,0 +1,77 @@
+from dataclasses import replace
+from datetime import date
+import shutil
+import wave
+
+import pytest
+
+from office_recorder.archive import Archiver, transcode_segment
+from office_recorder.audio import load_audio
+from office_recorder.config import load_config
+from office_recorder.storage import Storage
+from office_recorder.transcript_store import read_transcript
+
+
+def _write_wav(path, seconds=1.0, rate=16000):
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(rate)
+        handle.writeframes(b"\x00\x00" * int(seconds * rate))
+
+
+def _day(storage, date_str, transcribed):
+    day = storage.get_day(date_str)
+    for index in range(2):
+        _write_wav(day.audio_dir / f"segment_{index:05d}.wav")
+    for index in range(transcribed):
+        (day.transcripts_dir / f"segment_{index:05d}.json").write_text('{"segments": []}')
+    (day.summaries_dir / "summary.json").write_text("{}")
+
+
+def test_retention_tiers(tmp_path):
+    storage = Storage(tmp_path)
+    _day(storage, "2026-01-01", transcribed=2)  # 31 days old
+    _day(storage, "2026-01-25", transcribed=1)  # 7 days old
+    _day(storage, "2026-01-31", transcribed=2)  # 1 day old
+    config = replace(load_config(), retain_audio_days=5, retain_transcripts_days=30, retain_summaries_days=0)
+
+    removed = Archiver(config, storage).apply_retention(today=date(2026, 2, 1))
+
+    assert removed["days"] == ["2026-01-01"]
+    assert storage.list_audio_files("2026-01-01") == []
+    assert storage.list_transcript_files("2026-01-01") == []
+    # Only the transcribed segment's audio expires.
+    assert [path.name for path in storage.list_audio_files("2026-01-25")] == ["segment_00001.wav"]
+    assert len(storage.list_audio_files("2026-01-31")) == 2
+    assert storage.summary_path("2026-01-01").exists()
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None, reason="ffmpeg not installed")
+def test_transcode_segment_replaces_wav(tmp_path):
+    audio_file = tmp_path / "segment_00000.wav"
+    _write_wav(audio_file, seconds=2.0)
+    transcode_segment(audio_file, "flac")
+    assert not audio_file.exists()
+    assert load_audio(tmp_path / "segment_00000.flac").shape[0] == 32000
+
+
+def test_archived_segments_keep_duration_and_transcript_points_at_them(tmp_path):
+    storage = Storage(tmp_path)
+    day = storage.get_day("2026-01-31")
+    flac = day.audio_dir / "segment_00000.flac"
+    flac.write_bytes(b"fLaC")
+    transcript = day.transcripts_dir / "segment_00000.json"
+    transcript.write_text(
+        '{"audio_path": "%s", "duration": 300.0, "segments": []}' % (day.audio_dir / "segment_00000.wav")
+    )
+    # A rebuilt catalog falls back to the transcript's duration.
+    assert storage.day_stats("2026-01-31")["audio"]["duration"] == 300.0
+
+    storage.catalog.record("2026-01-31", "audio", flac, 299.5, "recorded")
+    assert storage.day_stats("2026-01-31")["audio"]["duration"] == 299.5
+
+    mtime_ns = transcript.stat().st_mtime_ns
+    Archiver(load_config(), storage)._repoint_transcript("2026-01-31", flac)
+    assert read_transcript(transcript)["audio_path"] == str(flac)
+    assert transcript.stat().st_mtime_ns == mtime_ns
@@ -0,0 +1,40 @@
+import wave
+
+import numpy as np
+
+from office_recorder.audio import crop_regions, load_audio, read_wav_info, scan_activity, uncrop_time
+
+
+def test_load_audio_maps_pcm16_wav(tmp_path):
+    path = tmp_path / "segment_00000.wav"
+    pcm = (np.sin(np.linspace(0, 100, 16000)) * 16000).astype("<i2")
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(16000)
+        handle.writeframes(pcm.tobytes())
+
+    info = read_wav_info(path)
+    assert info is not None
+    assert info.duration == 1.0
+
+    samples = load_audio(path)
+    assert samples.dtype == np.float32
+    assert samples.shape == (16000,)
+    assert np.allclose(samples, pcm / 32768.0)
+
+
+def test_scan_activity_detects_silence_and_regions():
+    sample_rate = 16000
+    quiet = np.full(sample_rate * 10, 1e-4, dtype=np.float32)
+    assert not scan_activity(quiet, sample_rate, threshold_dbfs=-45.0, min_active_seconds=1.0).active
+
+    speech = quiet.copy()
+    speech[sample_rate * 4 : sample_rate * 6] = 0.2
+    scan = scan_activity(speech, sample_rate, threshold_dbfs=-45.0, min_active_seconds=1.0)
+    assert scan.active
+    assert scan.regions == [(3.5, 6.5)]
+
+    cropped, spans = crop_regions(speech, scan.regions, sample_rate)
+    assert len(cropped) == sample_rate * 3
+    assert uncrop_time(1.0, spans) == 4.5
@@ -1,4 +1,4 @@
-from office_recorder.batching import group_segments
+from office_recorder.batching import BlockBuilder, group_segments, iter_blocks
 
 
 def test_grouping_by_gap():
@@ -22,3 +22,25 @@ def test_grouping_by_max_words():
 
     blocks = group_segments(segments, gap_seconds=300, max_words=3)
     assert len(blocks) == 2
+
+
+def test_block_builder_closes_blocks_past_gap():
+    builder = BlockBuilder(gap_seconds=300, max_words=200)
+    builder.extend(
+        [
+            {"start": 0.0, "end": 10.0, "text": "hello"},
+            {"start": 400.0, "end": 410.0, "text": "new topic"},
+        ]
+    )
+    assert [block.text for block in builder.closed_blocks(horizon=600.0)] == ["hello"]
+    assert [block.text for block in builder.closed_blocks(horizon=710.0)] == ["hello", "new topic"]
+    assert len(builder.finish()) == 2
+
+
+def test_iter_blocks_yields_before_input_is_exhausted():
+    def segments():
+        yield {"start": 0.0, "end": 10.0, "text": "hello"}
+        yield {"start": 400.0, "end": 410.0, "text": "new topic"}
+        raise AssertionError("consumed past the first flushed block")
+
+    assert next(iter_blocks(segments(), gap_seconds=300, max_words=200)).text == "hello"
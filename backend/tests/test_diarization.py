@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from office_recorder.diarization import _assign_speakers, _assign_speakers_numpy, _speaker_turns
+
+
+def test_assign_speakers_picks_max_overlap():
+    segments = [
+        {"start": 0.0, "end": 4.0, "text": "hello there"},
+        {"start": 5.0, "end": 9.0, "text": "hi"},
+        {"start": 20.0, "end": 21.0, "text": "silence"},
+    ]
+    turns = [
+        {"start": 0.0, "end": 3.0, "speaker": "A"},
+        {"start": 3.0, "end": 10.0, "speaker": "B"},
+    ]
+    labeled = _assign_speakers(segments, turns)
+    assert [seg["speaker"] for seg in labeled] == ["A", "B", "unknown"]
+    assert labeled[0]["text"] == "hello there"
+
+
+def test_assign_speakers_splits_on_speaker_change():
+    segments = [{"start": 0.0, "end": 4.0, "text": "one two three four"}]
+    turns = [
+        {"start": 0.0, "end": 2.0, "speaker": "A"},
+        {"start": 2.0, "end": 4.0, "speaker": "B"},
+    ]
+    labeled = _assign_speakers(segments, turns, split=True)
+    assert [(seg["speaker"], seg["text"]) for seg in labeled] == [("A", "one two"), ("B", "three four")]
+    assert labeled[1]["start"] == 2.0
+
+
+def test_numpy_path_matches_sweep():
+    pytest.importorskip("numpy")
+    rng = random.Random(7)
+    segments = []
+    cursor = 0.0
+    for _ in range(300):
+        length = rng.uniform(0.5, 8.0)
+        segments.append({"start": cursor, "end": cursor + length, "text": "x"})
+        cursor += length + rng.uniform(0.0, 2.0)
+    turns = []
+    cursor = 0.0
+    while cursor < segments[-1]["end"]:
+        length = rng.uniform(0.5, 15.0)
+        turns.append({"start": cursor, "end": cursor + length, "speaker": rng.choice("ABC")})
+        cursor += length + rng.uniform(0.0, 1.0)
+
+    expected = _assign_speakers(segments, turns)
+    vectorized = _assign_speakers_numpy(segments, _speaker_turns(turns))
+    assert [seg["speaker"] for seg in vectorized] == [seg["speaker"] for seg in expected]
@@ -0,0 +1,93 @@
+from office_recorder.jobs import JobContext, JobQueue, JobStore
+
+
+def test_job_store_dedupes_and_orders_by_priority(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    first, created = store.create("2026-01-30", "transcribe", 0, {})
+    again, created_again = store.create("2026-01-30", "transcribe", 0, {})
+    urgent, _ = store.create("2026-01-31", "summarize", 5, {})
+
+    assert created and not created_again
+    assert again.id == first.id
+    assert store.claim_next().id == urgent.id
+    assert store.claim_next().id == first.id
+    assert store.claim_next() is None
+
+
+def test_job_store_cancel_and_resume(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    store = JobStore(path)
+    running, _ = store.create("2026-01-30", "transcribe", 0, {})
+    queued, _ = store.create("2026-01-30", "summarize", 0, {})
+    assert store.claim_next().id == running.id
+
+    assert store.request_cancel(queued.id).state == "cancelled"
+    store.close()
+
+    reopened = JobStore(path)
+    assert reopened.requeue_interrupted() == 1
+    assert reopened.get(running.id).state == "queued"
+
+
+def test_job_store_merges_params_into_duplicates(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    queued, _ = store.create("2026-01-30", "summarize", 0, {"send_to_openclaw": False})
+    merged, created = store.create("2026-01-30", "summarize", 0, {"send_to_openclaw": True})
+    assert not created and merged.id == queued.id
+    assert merged.params == {"send_to_openclaw": True}
+    assert store.create("2026-01-30", "summarize", 0, {"send_to_openclaw": False})[0].params == {"send_to_openclaw": True}
+
+    # A running job without the flag cannot pick it up any more, so it gets a follow-up job.
+    running, _ = store.create("2026-01-31", "summarize", 0, {"send_to_openclaw": False})
+    store.claim_next()
+    store.claim_next()
+    assert store.create("2026-01-31", "summarize", 0, {"send_to_openclaw": False})[0].id == running.id
+    follow_up, created = store.create("2026-01-31", "summarize", 0, {"send_to_openclaw": True})
+    assert created and follow_up.id != running.id
+
+
+def test_job_store_holds_exclusive_stages_per_day(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    exclusive = ("transcribe", "pipeline")
+    transcribe, _ = store.create("2026-01-30", "transcribe", 0, {})
+    pipeline, _ = store.create("2026-01-30", "pipeline", 5, {})
+    other_day, _ = store.create("2026-01-31", "pipeline", 0, {})
+    rollup, _ = store.create("2026-01-30", "rollup", 0, {})
+
+    assert store.claim_next(exclusive).id == pipeline.id
+    assert store.claim_next(exclusive).id == other_day.id
+    assert store.claim_next(exclusive).id == rollup.id
+    assert store.claim_next(exclusive) is None
+    store.finish(pipeline.id, "succeeded")
+    assert store.claim_next(exclusive).id == transcribe.id
+
+
+def test_rollup_day_hold_excludes_exclusive_jobs(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    exclusive = ("summarize", "pipeline")
+    pipeline, _ = store.create("2026-01-30", "pipeline", 0, {})
+    rollup, _ = store.create("2026-01-29..2026-01-30", "rollup", 0, {})
+    assert store.claim_next(exclusive).id == pipeline.id
+    assert store.claim_next(exclusive).id == rollup.id
+    context = JobContext(store, rollup, exclusive)
+    with context.hold_day("2026-01-30") as held:
+        assert not held
+
+    summarize, _ = store.create("2026-01-29", "summarize", 0, {})
+    with context.hold_day("2026-01-29") as held:
+        assert held
+        assert store.claim_next(exclusive) is None
+    assert store.claim_next(exclusive).id == summarize.id
+
+
+def test_equivalent_stages_dedupe_against_each_other(tmp_path):
+    queue = JobQueue(
+        JobStore(tmp_path / "jobs.sqlite3"),
+        handlers={"pipeline": lambda job, context: None, "after_hours": lambda job, context: None},
+        equivalent_stages=(("pipeline", "after_hours"),),
+    )
+    after_hours, _ = queue.submit("2026-01-30", "after_hours", priority=-10, params={"send_to_openclaw": False})
+    pipeline, created = queue.submit("2026-01-30", "pipeline", params={"send_to_openclaw": False})
+    assert not created and pipeline.id == after_hours.id
+    assert pipeline.priority == 0
+    assert queue.submit("2026-01-31", "pipeline")[1]
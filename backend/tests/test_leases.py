@@ -0,0 +1,81 @@
+import pytest
+
+from office_recorder import leases as leases_module
+from office_recorder.leases import LeaseError, LeaseManager
+from office_recorder.storage import Storage
+from office_recorder.transcript_store import find_transcript
+
+DAY = "2026-03-02"
+
+
+def _manager(tmp_path, **kwargs):
+    storage = Storage(tmp_path / "data")
+    audio_dir = storage.get_day(DAY).audio_dir
+    for index in range(3):
+        (audio_dir / f"segment_{index:05d}.wav").write_bytes(b"RIFF")
+    return storage, LeaseManager(tmp_path / "leases.sqlite3", storage, **kwargs)
+
+
+def _payload(name):
+    return {"audio_path": f"/worker/tmp/{name}", "language": "en", "segments": [], "text": ""}
+
+
+def test_leases_are_exclusive_and_skip_open_segment(tmp_path):
+    _, manager = _manager(tmp_path, open_segment=lambda day: "segment_00002")
+    first = manager.acquire("a", DAY)
+    second = manager.acquire("b", DAY)
+    assert {first.segment, second.segment} == {"segment_00000", "segment_00001"}
+    assert manager.acquire("c", DAY) is None
+    assert manager.audio_path(first.token).name == first.audio_name
+
+
+def test_expired_lease_is_released_and_late_commit_is_idempotent(tmp_path, monkeypatch):
+    storage, manager = _manager(tmp_path, lease_seconds=60, open_segment=lambda day: "segment_00001")
+    clock = [1000.0]
+    monkeypatch.setattr(leases_module.time, "time", lambda: clock[0])
+    stale = manager.acquire("a", DAY)
+    other = manager.acquire("x", DAY)
+    assert manager.acquire("b", DAY) is None
+
+    clock[0] += 61
+    fresh = manager.acquire("b", DAY)
+    assert fresh.segment == stale.segment
+    with pytest.raises(LeaseError):
+        manager.renew(stale.token)
+
+    assert manager.commit(fresh.token, _payload(fresh.audio_name), "json", "none") == (DAY, True)
+    assert manager.commit(stale.token, _payload(stale.audio_name), "json", "none") == (DAY, False)
+    manager.commit(other.token, _payload(other.audio_name), "json", "none")
+    transcripts_dir = storage.get_day(DAY).transcripts_dir
+    assert find_transcript(transcripts_dir, fresh.segment) is not None
+    assert manager.acquire("c", DAY) is None
+
+
+def test_failed_segment_stops_after_max_attempts(tmp_path):
+    _, manager = _manager(tmp_path, max_attempts=2, open_segment=lambda day: None)
+    for _ in range(2):
+        lease = manager.acquire("a", DAY)
+        assert lease.segment == "segment_00000"
+        manager.fail(lease.token, "boom")
+    assert manager.acquire("a", DAY).segment == "segment_00001"
+    entry = manager.status()["segments"][0]
+    assert (entry["state"], entry["attempts"], entry["error"]) == ("failed", 2, "boom")
+
+
+def test_segments_transcribing_locally_are_not_leased(tmp_path):
+    storage = Storage(tmp_path / "data")
+    audio_dir = storage.get_day(DAY).audio_dir
+    busy = {audio_dir / "segment_00000.wav", audio_dir / "segment_00002.wav"}
+    _, manager = _manager(tmp_path, open_segment=lambda day: None, local_in_flight=lambda: busy)
+    assert manager.acquire("a", DAY).segment == "segment_00001"
+    assert manager.acquire("b", DAY) is None
+
+
+def test_undated_lease_skips_days_with_nothing_pending(tmp_path):
+    storage, manager = _manager(tmp_path, open_segment=lambda day: None)
+    done = storage.get_day("2026-03-01")
+    (done.audio_dir / "segment_00000.wav").write_bytes(b"RIFF")
+    (done.transcripts_dir / "segment_00000.json").write_text("{}", encoding="utf-8")
+    leased = [manager.acquire("a") for _ in range(4)]
+    assert [lease.date for lease in leased[:3]] == [DAY] * 3
+    assert leased[3] is None
@@ -0,0 +1,58 @@
+from concurrent.futures import Future
+from dataclasses import replace
+
+from office_recorder.config import load_config
+from office_recorder.live import LiveTranscriber
+from office_recorder.storage import Storage
+
+DAY = "2026-03-02"
+
+
+class _Executor:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, audio_file, transcript_path):
+        self.submitted.append(audio_file.name)
+        return Future()
+
+
+def _live(tmp_path, count):
+    config = replace(load_config(), data_dir=tmp_path, live_transcribe_enabled=True)
+    storage = Storage(tmp_path)
+    audio_dir = storage.get_day(DAY).audio_dir
+    for index in range(count):
+        (audio_dir / f"segment_{index:05d}.wav").write_bytes(b"RIFF")
+    live = LiveTranscriber(config, storage, recorder=None, diarize=False)
+    executor = _Executor()
+    live._get_executor = lambda: executor
+    return storage, live, executor
+
+
+def test_queues_all_but_the_open_segment(tmp_path):
+    storage, live, executor = _live(tmp_path, 3)
+    live._queue_closed(DAY, include_last=False)
+    assert executor.submitted == ["segment_00000.wav", "segment_00001.wav"]
+
+    # Nothing is queued twice while in flight, and rotation closes the next one.
+    (storage.get_day(DAY).audio_dir / "segment_00003.wav").write_bytes(b"RIFF")
+    live._queue_closed(DAY, include_last=False)
+    assert executor.submitted[2:] == ["segment_00002.wav"]
+    assert live.status()["pending"] == ["segment_00000.wav", "segment_00001.wav", "segment_00002.wav"]
+
+
+def test_stop_queues_last_segment_and_skips_transcribed(tmp_path):
+    storage, live, executor = _live(tmp_path, 2)
+    (storage.get_day(DAY).transcripts_dir / "segment_00000.json").write_text("{}")
+    live._queue_closed(DAY, include_last=True)
+    assert executor.submitted == ["segment_00001.wav"]
+
+
+def test_skips_segments_a_local_job_has_claimed(tmp_path):
+    from office_recorder import transcription
+
+    storage, live, executor = _live(tmp_path, 3)
+    claimed = storage.get_day(DAY).audio_dir / "segment_00000.wav"
+    with transcription._claimed([(claimed, tmp_path / "unused.json")]):
+        live._queue_closed(DAY, include_last=False)
+    assert executor.submitted == ["segment_00001.wav"]
@@ -0,0 +1,80 @@
+import os
+import time
+
+import pytest
+
+from office_recorder.llm_cache import ResponseCache, cache_key
+from office_recorder.summarization import LLMClient
+from office_recorder.utils import safe_json_load
+
+
+def test_cache_hit_and_miss(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=0, max_age_seconds=0)
+    key = cache_key("m", [{"role": "user", "content": "hi"}], 0.2, None)
+    assert cache.get(key) is None
+    cache.put(key, "hello", {"model": "m"})
+    assert cache.get(key) == "hello"
+    assert cache_key("m", [{"role": "user", "content": "hi"}], 0.3, None) != key
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=0, max_age_seconds=0)
+    keys = [cache_key("m", [{"role": "user", "content": str(i)}], 0.2, None) for i in range(3)]
+    for offset, key in enumerate(keys):
+        cache.put(key, "x" * 100, {"model": "m"})
+        path = tmp_path / key[:2] / f"{key}.json"
+        stamp = time.time() - 100 + offset
+        os.utime(path, (stamp, stamp))
+    # Entry sizes differ by a few bytes (created_at), so budget for exactly the newest two.
+    sizes = [(tmp_path / key[:2] / f"{key}.json").stat().st_size for key in keys]
+
+    bounded = ResponseCache(tmp_path, max_bytes=sizes[1] + sizes[2], max_age_seconds=0)
+    assert bounded.evict() == 1
+    assert bounded.get(keys[0]) is None
+    assert bounded.get(keys[2]) == "x" * 100
+
+
+class _Session:
+    def __init__(self, replies):
+        self.replies = replies
+
+    def post(self, url, json, headers, timeout):
+        content = self.replies.pop(0)
+
+        class Response:
+            def raise_for_status(self):
+                return None
+
+            def json(self):
+                return {"choices": [{"message": {"content": content}}]}
+
+        return Response()
+
+
+def test_unparseable_replies_are_not_cached(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=0, max_age_seconds=0)
+    client = LLMClient(base_url="http://localhost", api_key=None, model="m", timeout_seconds=1, cache=cache)
+    client._session = _Session(['{"summary": "trunc', '{"summary": "ok"}'])
+    messages = [{"role": "user", "content": "hi"}]
+
+    with pytest.raises(ValueError):
+        client.chat(messages, validate=safe_json_load)
+    assert cache.stats()["writes"] == 0
+    assert client.chat(messages, validate=safe_json_load) == '{"summary": "ok"}'
+    assert client.chat(messages, validate=safe_json_load) == '{"summary": "ok"}'
+    assert cache.stats()["hits"] == 1
+
+
+def test_cached_reply_failing_validation_is_dropped(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=0, max_age_seconds=0)
+    client = LLMClient(base_url="http://localhost", api_key=None, model="m", timeout_seconds=1, cache=cache)
+    messages = [{"role": "user", "content": "hi"}]
+    key = cache_key("m", messages, 0.2, None)
+    cache.put(key, "not json", {"model": "m"})
+    client._session = _Session(['{"summary": "ok"}'])
+
+    assert client.chat(messages, validate=safe_json_load) == '{"summary": "ok"}'
+    assert cache.get(key) == '{"summary": "ok"}'
@@ -0,0 +1,32 @@
+import json
+
+from office_recorder.merged import MergedTranscripts
+from office_recorder.storage import Storage
+from office_recorder.transcript_store import write_transcript
+
+
+def _write(storage, index, segments, suffix=".json"):
+    path = storage.get_day("2026-02-02").transcripts_dir / f"segment_{index:05d}{suffix}"
+    write_transcript(path, {"segments": segments})
+
+
+def test_merged_transcript_appends_rebuilds_and_seeks(tmp_path):
+    storage = Storage(tmp_path)
+    merged = MergedTranscripts(storage, segment_seconds=100)
+    _write(storage, 0, [{"start": 50, "end": 60, "text": "b"}, {"start": 10, "end": 20, "text": "a", "speaker": "S1"}])
+    _write(storage, 2, [{"start": 0, "end": 5, "text": "d"}], suffix=".tcol")
+
+    assert merged.sync("2026-02-02") == 2
+    assert [seg["text"] for seg in merged.window("2026-02-02")] == ["a", "b", "d"]
+    assert merged.sync("2026-02-02") == 0
+
+    # A gap filled in later forces a rebuild; a later segment is appended.
+    _write(storage, 1, [{"start": 30, "end": 40, "text": "c"}])
+    assert merged.sync("2026-02-02") == 3
+    _write(storage, 3, [{"start": 1, "end": 2, "text": "e"}])
+    assert merged.sync("2026-02-02") == 1
+
+    window = merged.window("2026-02-02", start=55, end=201)
+    assert [(seg["text"], seg["start"]) for seg in window] == [("b", 50), ("c", 130), ("d", 200)]
+    first = json.loads(next(merged.iter_lines("2026-02-02")))
+    assert first == {"start": 10, "end": 20, "speaker": "S1", "text": "a", "source": "segment_00000.json"}
@@ -0,0 +1,32 @@
+from office_recorder.metrics import Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", (1.0, 5.0), ("cache",))
+    for value in (0.5, 2.0, 9.0):
+        latency.observe(value, "miss")
+
+    text = registry.render()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{cache="miss",le="1"} 1' in text
+    assert 'demo_seconds_bucket{cache="miss",le="5"} 2' in text
+    assert 'demo_seconds_bucket{cache="miss",le="+Inf"} 3' in text
+    assert 'demo_seconds_sum{cache="miss"} 11.5' in text
+    assert 'demo_seconds_count{cache="miss"} 3' in text
+
+
+def test_buffered_samples_replay_into_parent_registry():
+    worker = Registry()
+    worker_files = worker.counter("demo_files_total", "Files.", ("outcome",))
+    worker.buffer_samples()
+    worker_files.inc("silent")
+    worker_files.inc("silent")
+    samples = worker.drain()
+    assert 'outcome="silent"' not in worker.render()
+
+    parent = Registry()
+    parent.counter("demo_files_total", "Files.", ("outcome",))
+    parent.replay(samples)
+    assert 'demo_files_total{outcome="silent"} 2' in parent.render()
+    assert worker.drain() == []
@@ -0,0 +1,71 @@
+import threading
+
+from office_recorder import model_manager as model_manager_module
+from office_recorder.model_manager import ModelManager
+
+
+class _Loader:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return object()
+
+
+def test_concurrent_users_share_one_load():
+    manager = ModelManager()
+    loader = _Loader("whisper")
+    manager.register("whisper", loader, estimate_bytes=100)
+
+    with manager.use("whisper") as first, manager.use("whisper") as second:
+        assert first is second
+        assert manager.status()["models"][0]["refs"] == 2
+    assert loader.calls == 1
+    status = manager.status()["models"][0]
+    assert status["loaded"] and status["refs"] == 0
+    assert status["load_seconds"] is not None
+
+
+def test_idle_models_unload_after_timeout():
+    manager = ModelManager(idle_seconds=60)
+    loader = _Loader("whisper")
+    manager.register("whisper", loader, estimate_bytes=100)
+    with manager.use("whisper"):
+        assert manager.unload_idle(now=10**12) == []
+
+    assert manager.status()["models"][0]["loaded"]
+    assert manager.unload_idle(now=0) == []
+    assert manager.unload_idle(now=10**12) == ["whisper"]
+    assert not manager.status()["models"][0]["loaded"]
+
+    with manager.use("whisper"):
+        pass
+    assert loader.calls == 2
+
+
+def test_budget_evicts_least_recently_used_idle_model(monkeypatch):
+    monkeypatch.setattr(model_manager_module, "_rss_bytes", lambda: None)
+    manager = ModelManager(budget_bytes=150)
+    whisper, diarization = _Loader("whisper"), _Loader("diarization")
+    manager.register("whisper", whisper, estimate_bytes=100)
+    manager.register("diarization", diarization, estimate_bytes=100)
+
+    with manager.use("whisper"):
+        pass
+    with manager.use("diarization"):
+        pass
+    loaded = {model["name"]: model["loaded"] for model in manager.status()["models"]}
+    assert loaded == {"whisper": False, "diarization": True}
+
+
+def test_warm_loads_registered_models_in_background():
+    manager = ModelManager()
+    loader = _Loader("whisper")
+    manager.register("whisper", loader, estimate_bytes=100)
+    thread = manager.warm()
+    assert isinstance(thread, threading.Thread)
+    thread.join(timeout=5)
+    assert loader.calls == 1
+    assert manager.status()["models"][0]["loaded"]
@@ -0,0 +1,90 @@
+import importlib
+import socket
+import sys
+import threading
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from office_recorder.config import load_config
+from office_recorder.remote_worker import RemoteWorker
+from office_recorder.transcript_store import find_transcript
+
+uvicorn = pytest.importorskip("uvicorn")
+
+DAY = "2026-03-02"
+
+_STUB_WHISPER = '''
+class _Segment:
+    start, end, text = 0.0, 1.0, " remote"
+
+
+class _Info:
+    language = "en"
+    duration = 1.0
+
+
+class WhisperModel:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def transcribe(self, audio, **kwargs):
+        return iter([_Segment()]), _Info()
+'''
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_two_workers_share_a_day_over_http(tmp_path, monkeypatch):
+    (tmp_path / "faster_whisper.py").write_text(_STUB_WHISPER)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("OFFICE_RECORDER_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("OFFICE_RECORDER_WORKER_TOKEN", "secret")
+    monkeypatch.setenv("OFFICE_RECORDER_SILENCE_SKIP", "false")
+    monkeypatch.setenv("OFFICE_RECORDER_TRACE", "false")
+    monkeypatch.delitem(sys.modules, "office_recorder.main", raising=False)
+    main = importlib.import_module("office_recorder.main")
+
+    audio_dir = main.storage.get_day(DAY).audio_dir
+    tone = (np.sin(np.linspace(0, 400, 16000)) * 8000).astype("<i2")
+    for index in range(6):
+        with wave.open(str(audio_dir / f"segment_{index:05d}.wav"), "wb") as handle:
+            handle.setnchannels(1)
+            handle.setsampwidth(2)
+            handle.setframerate(16000)
+            handle.writeframes(tone.tobytes())
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        deadline = time.time() + 10
+        while not server.started and time.time() < deadline:
+            time.sleep(0.05)
+        assert server.started
+
+        url = f"http://127.0.0.1:{port}"
+        workers = [
+            RemoteWorker(load_config(), url, worker_id=name, token="secret", date_str=DAY) for name in ("a", "b")
+        ]
+        runners = [threading.Thread(target=worker.run, kwargs={"exit_when_idle": True}) for worker in workers]
+        for runner in runners:
+            runner.start()
+        for runner in runners:
+            runner.join(timeout=60)
+
+        assert sum(worker.completed for worker in workers) == 6
+        transcripts_dir = main.storage.get_day(DAY).transcripts_dir
+        assert all(find_transcript(transcripts_dir, f"segment_{index:05d}") for index in range(6))
+        assert main.leases.status()["segments"] == []
+        assert RemoteWorker(load_config(), url, token="secret", date_str=DAY).lease() is None
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
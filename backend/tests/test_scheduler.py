@@ -0,0 +1,60 @@
+from dataclasses import replace
+from datetime import datetime
+
+import pytest
+
+from office_recorder.config import load_config
+from office_recorder.scheduler import next_transition
+
+
+def _config(start, end, days, tz=None):
+    return replace(
+        load_config(),
+        schedule_enabled=True,
+        schedule_start=start,
+        schedule_end=end,
+        schedule_days=days,
+        schedule_timezone=tz,
+    )
+
+
+def test_next_transition_same_day_window():
+    config = _config("09:00", "18:00", [0, 1, 2, 3, 4])
+    assert next_transition(config, datetime(2026, 2, 2, 8, 0)) == (datetime(2026, 2, 2, 9, 0), True)
+    assert next_transition(config, datetime(2026, 2, 2, 12, 0)) == (datetime(2026, 2, 2, 18, 0, 1), False)
+    # Friday evening skips the weekend.
+    assert next_transition(config, datetime(2026, 2, 6, 19, 0)) == (datetime(2026, 2, 9, 9, 0), True)
+
+
+def test_next_transition_cross_midnight_window():
+    config = _config("22:00", "06:00", [4])  # Friday night into Saturday
+    assert next_transition(config, datetime(2026, 2, 7, 1, 0)) == (datetime(2026, 2, 7, 6, 0, 1), False)
+    assert next_transition(config, datetime(2026, 2, 7, 7, 0)) == (datetime(2026, 2, 13, 22, 0), True)
+
+
+def test_next_transition_across_dst_change():
+    zoneinfo = pytest.importorskip("zoneinfo")
+    tz = zoneinfo.ZoneInfo("America/New_York")
+    config = _config("09:00", "18:00", [0, 1, 2, 3, 4], tz="America/New_York")
+    now = datetime(2026, 3, 6, 19, 0, tzinfo=tz)  # Friday before clocks spring forward
+
+    instant, active = next_transition(config, now)
+    assert active is True
+    assert (instant.year, instant.month, instant.day, instant.hour) == (2026, 3, 9, 9)
+    # 62 wall-clock hours, one of which is skipped by DST.
+    assert instant.timestamp() - now.timestamp() == 61 * 3600
+
+
+def test_status_keeps_crashed_state_for_the_watchdog(tmp_path):
+    from office_recorder.recording import RecorderManager, RecorderState
+    from office_recorder.storage import Storage
+
+    recorder = RecorderManager(replace(load_config(), data_dir=tmp_path), Storage(tmp_path))
+    state = RecorderState(pid=2**22 + 7, started_at="", date="2026-03-02", audio_dir="", command=[], format="wav")
+    recorder._save_state(state)
+    assert recorder.status() == {"running": False, "crashed": True, "date": "2026-03-02"}
+    assert recorder.active_state() is None
+    assert recorder.crashed()
+
+    recorder.stop()
+    assert not recorder.crashed()
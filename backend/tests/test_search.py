@@ -0,0 +1,50 @@
+import json
+import os
+
+from office_recorder.search import SearchIndex
+from office_recorder.storage import Storage
+
+
+def test_search_index_ranks_and_filters(tmp_path):
+    storage = Storage(tmp_path)
+    for date_str, text in [("2026-01-29", "call Acme about the invoice"), ("2026-01-30", "Acme renewal, Acme pricing")]:
+        day = storage.get_day(date_str)
+        (day.transcripts_dir / "segment_00002.json").write_text(
+            json.dumps({"segments": [{"start": 5, "end": 9, "text": text, "speaker": "A"}]}),
+            encoding="utf-8",
+        )
+
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    assert index.sync_day(storage, "2026-01-29", segment_seconds=300) == 1
+    assert index.sync_day(storage, "2026-01-30", segment_seconds=300) == 1
+    assert index.sync_day(storage, "2026-01-30", segment_seconds=300) == 0
+
+    result = index.search("acme")
+    assert result["total"] == 2
+    assert result["hits"][0]["day"] == "2026-01-30"
+    assert result["hits"][0]["start"] == 605
+    assert result["hits"][0]["speaker"] == "A"
+    assert result["hits"][0]["source"] == "segment_00002.json"
+
+    filtered = index.search('acme "invoice', date_from="2026-01-29", date_to="2026-01-29")
+    assert [hit["day"] for hit in filtered["hits"]] == ["2026-01-29"]
+
+
+def test_reindexing_a_file_replaces_only_its_rows(tmp_path):
+    storage = Storage(tmp_path)
+    day = storage.get_day("2026-01-30")
+    paths = [day.transcripts_dir / f"segment_0000{index}.json" for index in range(2)]
+    for path, text in zip(paths, ["acme kickoff", "acme budget"]):
+        path.write_text(json.dumps({"segments": [{"start": 0, "end": 1, "text": text}]}), encoding="utf-8")
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    index.sync_day(storage, "2026-01-30", segment_seconds=300)
+
+    paths[0].write_text(json.dumps({"segments": [{"start": 0, "end": 1, "text": "widget kickoff"}]}), encoding="utf-8")
+    os.utime(paths[0], ns=(0, paths[0].stat().st_mtime_ns + 10**9))
+    assert index.sync_day(storage, "2026-01-30", segment_seconds=300) == 1
+    assert [hit["source"] for hit in index.search("acme")["hits"]] == ["segment_00001.json"]
+    assert index.search("widget")["total"] == 1
+
+    paths[1].unlink()
+    index.sync_day(storage, "2026-01-30", segment_seconds=300)
+    assert index.search("acme")["total"] == 0
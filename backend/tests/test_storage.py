@@ -8,3 +8,60 @@ def test_storage_creates_day_dirs(tmp_path):
     assert day.audio_dir.exists()
     assert day.transcripts_dir.exists()
     assert day.summaries_dir.exists()
+
+
+def test_list_days_ignores_internal_dirs(tmp_path):
+    storage = Storage(tmp_path)
+    storage.get_day("2026-01-30")
+    storage.cache_dir("llm")
+    assert storage.list_days() == ["2026-01-30"]
+
+
+def test_catalog_tracks_files_and_rebuilds(tmp_path):
+    import json
+
+    storage = Storage(tmp_path)
+    day = storage.get_day("2026-01-30")
+    (day.audio_dir / "segment_00000.wav").write_bytes(b"")
+    (day.transcripts_dir / "segment_00000.json").write_text(
+        json.dumps({"duration": 300.0, "segments": [], "skipped": "silent"}),
+        encoding="utf-8",
+    )
+
+    assert [p.name for p in storage.list_audio_files("2026-01-30")] == ["segment_00000.wav"]
+    stats = storage.day_stats("2026-01-30")
+    assert stats["transcript"]["duration"] == 300.0
+    assert stats["transcript_states"] == {"silent": 1}
+
+    (day.audio_dir / "segment_00000.wav").unlink()
+    assert storage.list_audio_files("2026-01-30") == []
+
+    reopened = Storage(tmp_path)
+    assert reopened.rebuild_catalog() == ["2026-01-30"]
+    assert reopened.day_stats("2026-01-30")["transcript"]["count"] == 1
+
+
+def test_catalog_sees_files_rewritten_in_place(tmp_path):
+    import json
+    import os
+
+    storage = Storage(tmp_path)
+    day = storage.get_day("2026-01-30")
+    audio = day.audio_dir / "segment_00000.wav"
+    transcript = day.transcripts_dir / "segment_00000.json"
+    audio.write_bytes(b"x" * 100)
+    transcript.write_text(json.dumps({"duration": 1.0, "segments": [], "skipped": "silent"}), encoding="utf-8")
+    # Settle the directory mtimes so only the per-file stat can notice changes.
+    settled = 1_000_000_000
+    for directory in (day.audio_dir, day.transcripts_dir):
+        os.utime(directory, ns=(settled, settled))
+    assert storage.day_stats("2026-01-30")["audio"]["bytes"] == 100
+
+    with audio.open("ab") as handle:
+        handle.write(b"x" * 100_000)
+    transcript.write_text(json.dumps({"duration": 300.0, "segments": [{"text": "hi"}]}), encoding="utf-8")
+    os.utime(transcript, ns=(settled + 1, settled + 1))
+    stats = storage.day_stats("2026-01-30")
+    assert stats["audio"]["bytes"] == 100_100
+    assert stats["transcript"]["duration"] == 300.0
+    assert stats["transcript_states"] == {"transcribed": 1}
@@ -1,7 +1,7 @@
 import json
 
 from office_recorder.storage import Storage
-from office_recorder.summarization import load_segments
+from office_recorder.summarization import iter_segments, load_segments
 
 
 def test_load_segments_applies_offsets(tmp_path):
@@ -25,3 +25,234 @@ def test_load_segments_applies_offsets(tmp_path):
     assert segments[0]["text"] == "first"
     assert segments[1]["start"] == 300
     assert segments[1]["text"] == "second"
+
+
+def test_iter_segments_merges_overlapping_files(tmp_path):
+    storage = Storage(tmp_path)
+    day = storage.get_day("2026-01-30")
+    (day.transcripts_dir / "segment_00000.json").write_text(
+        json.dumps({"segments": [{"start": 302, "end": 304, "text": "late"}, {"start": 5, "end": 6, "text": "early"}]}),
+        encoding="utf-8",
+    )
+    (day.transcripts_dir / "segment_00001.json").write_text(
+        json.dumps({"segments": [{"start": 1, "end": 2, "text": "next"}]}),
+        encoding="utf-8",
+    )
+
+    merged = [(s["start"], s["text"]) for s in iter_segments(storage, "2026-01-30", 300)]
+    assert merged == [(5.0, "early"), (301.0, "next"), (302.0, "late")]
+
+
+def test_chat_many_preserves_order(monkeypatch):
+    import time
+
+    from office_recorder.summarization import LLMClient
+
+    def fake_chat(self, messages, temperature=0.2, max_tokens=None, validate=None):
+        index = int(messages[0]["content"])
+        time.sleep(0.01 * (5 - index))
+        return f"reply-{index}"
+
+    monkeypatch.setattr(LLMClient, "chat", fake_chat)
+    client = LLMClient(base_url="http://localhost", api_key=None, model="m", timeout_seconds=1, max_concurrency=4)
+    replies = client.chat_many([[{"role": "user", "content": str(i)}] for i in range(5)])
+    assert replies == [f"reply-{i}" for i in range(5)]
+
+
+def test_rolling_block_summaries_are_reused(tmp_path, monkeypatch):
+    from dataclasses import replace
+
+    from office_recorder.config import load_config
+    from office_recorder.summarization import LLMClient, Summarizer
+
+    prompts = []
+
+    def fake_chat(self, messages, temperature=0.2, max_tokens=None, validate=None):
+        prompts.append(messages[-1]["content"])
+        return json.dumps({"summary": "ok", "overview": "day"})
+
+    monkeypatch.setattr(LLMClient, "chat", fake_chat)
+    config = replace(load_config(), data_dir=tmp_path, segment_seconds=300, conversation_gap_seconds=120)
+    storage = Storage(tmp_path)
+    day = storage.get_day("2026-01-30")
+    (day.transcripts_dir / "segment_00000.json").write_text(
+        json.dumps({"duration": 300, "segments": [{"start": 0, "end": 5, "text": "morning"}]}),
+        encoding="utf-8",
+    )
+    (day.transcripts_dir / "segment_00001.json").write_text(
+        json.dumps({"duration": 300, "segments": [{"start": 10, "end": 20, "text": "standup"}]}),
+        encoding="utf-8",
+    )
+
+    summarizer = Summarizer(config)
+    assert summarizer.summarize_closed_blocks(storage, "2026-01-30") == 2
+    assert len(prompts) == 2
+
+    summary = summarizer.summarize_day(storage, "2026-01-30")
+    assert len(summary["blocks"]) == 2
+    assert summary["blocks"][1]["start"] == 310
+    assert len(prompts) == 3
+
+
+def test_rollup_reduces_hierarchically_within_budget(tmp_path, monkeypatch):
+    from dataclasses import replace
+
+    from office_recorder.config import load_config
+    from office_recorder.summarization import LLMClient, Summarizer
+
+    prompt_sizes = []
+
+    def fake_chat(self, messages, temperature=0.2, max_tokens=None, validate=None):
+        prompt_sizes.append(len(messages[-1]["content"]))
+        return json.dumps({"overview": "x" * 400, "decisions": ["d"] * 20})
+
+    monkeypatch.setattr(LLMClient, "chat", fake_chat)
+    config = replace(load_config(), data_dir=tmp_path, llm_rollup_token_budget=600)
+    summarizer = Summarizer(config)
+
+    blocks = [{"summary": "s" * 800, "topics": ["t"] * 50, "start": i * 60.0, "end": i * 60.0 + 30} for i in range(40)]
+    daily = summarizer._rollup(blocks)
+    assert daily["overview"]
+    assert 1 < len(prompt_sizes) < 40
+    assert max(prompt_sizes) < 600 * 4 + 200
+
+
+def test_non_object_replies_are_rejected(tmp_path, monkeypatch):
+    from dataclasses import replace
+
+    import pytest
+
+    from office_recorder.config import load_config
+    from office_recorder.summarization import LLMClient, Summarizer
+
+    def fake_chat(self, messages, temperature=0.2, max_tokens=None, validate=None):
+        content = json.dumps(["not", "a", "summary"])
+        if validate is not None:
+            validate(content)
+        return content
+
+    monkeypatch.setattr(LLMClient, "chat", fake_chat)
+    summarizer = Summarizer(replace(load_config(), data_dir=tmp_path))
+    with pytest.raises(ValueError, match="not an object"):
+        summarizer._rollup([{"summary": "s", "start": 0.0, "end": 30.0}])
+
+
+def test_range_rollup_reuses_cached_prefix(tmp_path, monkeypatch):
+    from dataclasses import replace
+
+    from office_recorder.config import load_config
+    from office_recorder.summarization import LLMClient, Summarizer, summarize_range
+    from office_recorder.utils import write_json
+
+    calls = []
+
+    def fake_chat(self, messages, temperature=0.2, max_tokens=None, validate=None):
+        calls.append(messages[-1]["content"])
+        return json.dumps({"overview": f"rollup {len(calls)}"})
+
+    monkeypatch.setattr(LLMClient, "chat", fake_chat)
+    storage = Storage(tmp_path)
+    summarizer = Summarizer(replace(load_config(), data_dir=tmp_path))
+    for date_str in ("2026-02-02", "2026-02-03", "2026-02-05"):
+        storage.get_day(date_str)
+        write_json(
+            storage.summary_path(date_str),
+            {"date": date_str, "blocks": [{"summary": "x"}], "daily_summary": {"overview": date_str}},
+        )
+
+    week = summarize_range(storage, summarizer, "2026-02-02", "2026-02-04")
+    assert week["days"] == ["2026-02-02", "2026-02-03"]
+    assert len(calls) == 1
+
+    extended = summarize_range(storage, summarizer, "2026-02-02", "2026-02-05")
+    assert len(calls) == 2
+    assert extended["daily_summary"] == {"overview": "rollup 2"}
+    assert storage.rollup_markdown_path("2026-02-02", "2026-02-05").read_text().startswith("# Range Summary")
+
+
+def test_chat_many_stops_sending_when_progress_raises(monkeypatch):
+    import pytest
+
+    from office_recorder.summarization import LLMClient
+
+    sent = []
+
+    def fake_chat(self, messages, temperature=0.2, max_tokens=None, validate=None):
+        sent.append(messages[0]["content"])
+        return "{}"
+
+    def progress(done, total):
+        if done == 2:
+            raise RuntimeError("cancelled")
+
+    monkeypatch.setattr(LLMClient, "chat", fake_chat)
+    client = LLMClient(base_url="http://localhost", api_key=None, model="m", timeout_seconds=1, max_concurrency=1)
+    with pytest.raises(RuntimeError):
+        client.chat_many([[{"role": "user", "content": str(i)}] for i in range(5)], progress=progress)
+    assert sent == ["0", "1"]
+
+
+def test_range_rollup_summarizes_days_from_transcripts(tmp_path, monkeypatch):
+    from dataclasses import replace
+
+    from office_recorder.config import load_config
+    from office_recorder.summarization import LLMClient, Summarizer, summarize_range
+
+    def fake_chat(self, messages, temperature=0.2, max_tokens=None, validate=None):
+        return json.dumps({"summary": "talked", "overview": "a day"})
+
+    monkeypatch.setattr(LLMClient, "chat", fake_chat)
+    storage = Storage(tmp_path)
+    summarizer = Summarizer(replace(load_config(), data_dir=tmp_path))
+    for date_str in ("2026-02-02", "2026-02-04"):
+        (storage.get_day(date_str).transcripts_dir / "segment_00000.json").write_text(
+            json.dumps({"segments": [{"start": 0, "end": 5, "text": "hello there"}]}), encoding="utf-8"
+        )
+    storage.get_day("2026-02-03")
+
+    result = summarize_range(storage, summarizer, "2026-02-01", "2026-02-04")
+    assert result["days"] == ["2026-02-02", "2026-02-04"]
+    assert storage.summary_path("2026-02-04").exists()
+    assert not storage.summary_path("2026-02-03").exists()
+
+
+def test_range_rollup_keeps_incomplete_days_in_memory(tmp_path, monkeypatch):
+    from dataclasses import replace
+    import os
+
+    from office_recorder.config import load_config
+    from office_recorder.summarization import LLMClient, Summarizer, summarize_range
+    from office_recorder.utils import write_json
+
+    calls = []
+
+    def fake_chat(self, messages, temperature=0.2, max_tokens=None, validate=None):
+        if "multi-day rollup" in messages[0]["content"]:
+            calls.append(self.model)
+        return json.dumps({"summary": "talked", "overview": "a day"})
+
+    monkeypatch.setattr(LLMClient, "chat", fake_chat)
+    storage = Storage(tmp_path)
+    for date_str in ("2026-02-02", "2026-02-03"):
+        day = storage.get_day(date_str)
+        (day.transcripts_dir / "segment_00000.json").write_text(
+            json.dumps({"segments": [{"start": 0, "end": 5, "text": "hello there"}]}), encoding="utf-8"
+        )
+    # 02-02 has a summary from before its transcript changed; 02-03 is still recording.
+    stale = storage.summary_path("2026-02-02")
+    write_json(stale, {"date": "2026-02-02", "blocks": [{"summary": "old"}], "daily_summary": {"overview": "old"}})
+    os.utime(stale, ns=(1, 1))
+    (storage.get_day("2026-02-03").audio_dir / "segment_00001.wav").write_bytes(b"RIFF")
+
+    config = replace(load_config(), data_dir=tmp_path)
+    result = summarize_range(storage, Summarizer(config), "2026-02-02", "2026-02-03")
+    assert result["days"] == ["2026-02-02", "2026-02-03"]
+    assert storage.summary_is_current("2026-02-02")
+    assert not storage.summary_path("2026-02-03").exists()
+
+    # The fold is cached for the same model and redone for a different one.
+    assert len(calls) == 1
+    summarize_range(storage, Summarizer(config), "2026-02-02", "2026-02-03")
+    assert len(calls) == 1
+    summarize_range(storage, Summarizer(replace(config, llm_model="other")), "2026-02-02", "2026-02-03")
+    assert calls[1:] == ["other"]
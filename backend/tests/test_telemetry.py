@@ -0,0 +1,64 @@
+import time
+
+from office_recorder.telemetry import CaptureTelemetry
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_telemetry_tails_progress_and_levels(tmp_path):
+    log_path = tmp_path / "recording.log"
+    progress_path = tmp_path / "capture.progress"
+    log_path.write_text("old session noise\n")
+    telemetry = CaptureTelemetry(alert_seconds=2.0)
+    telemetry.attach(log_path, progress_path, log_offset=log_path.stat().st_size)
+    try:
+        with log_path.open("a") as log:
+            log.write("[segment @ 0x1] Opening '/data/audio/segment_00003.wav' for writing\n")
+            log.write("[Parsed_ametadata_2 @ 0x2] lavfi.astats.Overall.RMS_level=-31.5\n")
+            log.write("[Parsed_ametadata_2 @ 0x2] lavfi.astats.Overall.Peak_level=-inf\n")
+        progress_path.write_text("total_size=4096\nout_time_us=2500000\ndrop_frames=0\nspeed=1.01x\nprogress=continue\n")
+
+        assert _wait_for(lambda: telemetry.snapshot()["sample"] is not None)
+        snapshot = telemetry.snapshot()
+        assert snapshot["sample"]["total_bytes"] == 4096
+        assert snapshot["sample"]["out_seconds"] == 2.5
+        assert snapshot["sample"]["rms_dbfs"] == -31.5
+        assert snapshot["sample"]["peak_dbfs"] == -120.0
+        assert snapshot["segment"] == "segment_00003.wav"
+        assert snapshot["alerts"] == []
+
+        # No further progress and no audible input past the alert window.
+        assert _wait_for(lambda: set(telemetry.snapshot()["alerts"]) == {"stalled", "silent"}, timeout=4.0)
+    finally:
+        telemetry.detach()
+    assert telemetry.snapshot()["attached"] is False
+
+
+def test_recorder_drops_level_filter_when_ffmpeg_lacks_it(tmp_path):
+    from dataclasses import replace
+
+    from office_recorder.config import load_config
+    from office_recorder.recording import RecorderManager
+    from office_recorder.storage import Storage
+
+    config = replace(load_config(), data_dir=tmp_path, ffmpeg_bin=str(tmp_path / "missing-ffmpeg"))
+    recorder = RecorderManager(config, Storage(tmp_path))
+    assert recorder.levels_supported() is False
+    progress_path = tmp_path / "capture.progress"
+    cmd = recorder._build_ffmpeg_command(tmp_path / "segment_%05d.wav", progress_path, levels=False)
+    assert "-progress" in cmd and "-af" not in cmd
+
+    telemetry = CaptureTelemetry(alert_seconds=0.5)
+    telemetry.attach(tmp_path / "recording.log", progress_path, levels=False)
+    try:
+        assert _wait_for(lambda: telemetry.snapshot()["alerts"] == ["stalled"], timeout=3.0)
+        assert telemetry.snapshot()["levels"] is False
+    finally:
+        telemetry.detach()
@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+from office_recorder import tracing
+
+
+def _events(path):
+    return [event for event in json.loads(path.read_text())["traceEvents"] if event["ph"] == "X"]
+
+
+def _traced_call():
+    with tracing.span("llm.chat"):
+        pass
+
+
+def test_trace_run_writes_nested_chrome_events(tmp_path):
+    path = tmp_path / "trace.json"
+    with tracing.trace_run(path, "job.pipeline", date="2026-01-05") as traced:
+        assert traced
+        with tracing.span("transcribe.segment", file="segment_00000.wav"):
+            with tracing.span("audio.decode") as span:
+                span.set(samples=16000)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(tracing.bind(_traced_call)).result()
+
+    events = {event["name"]: event for event in _events(path)}
+    assert set(events) == {"job.pipeline", "transcribe.segment", "audio.decode", "llm.chat"}
+    root, child, leaf = events["job.pipeline"], events["transcribe.segment"], events["audio.decode"]
+    assert root["ts"] <= child["ts"] <= leaf["ts"]
+    assert leaf["ts"] + leaf["dur"] <= child["ts"] + child["dur"] + 1
+    assert leaf["args"] == {"samples": 16000}
+    assert events["llm.chat"]["tid"] != root["tid"]
+
+    # A second run appends to the same day's file.
+    with tracing.trace_run(path, "job.summarize"):
+        pass
+    assert [event["name"] for event in _events(path)].count("job.pipeline") == 1
+    assert len(_events(path)) == 5
+
+
+def test_trace_run_off_and_sampled_out(tmp_path):
+    path = tmp_path / "trace.json"
+    for kwargs in ({"enabled": False}, {"sample_rate": 0.0}):
+        with tracing.trace_run(path, "job.pipeline", **kwargs) as traced:
+            assert not traced
+            assert not tracing.active()
+    assert not path.exists()
@@ -0,0 +1,60 @@
+import json
+
+from office_recorder.catalog import inspect_transcript
+from office_recorder.transcript_store import (
+    load_day_columns,
+    read_transcript,
+    read_transcript_meta,
+    write_transcript,
+)
+
+
+def test_columnar_roundtrip_keeps_segments_and_meta(tmp_path):
+    payload = {
+        "audio_path": "segment_00000.wav",
+        "duration": 300.0,
+        "language": "en",
+        "segments": [
+            {"start": 1.5, "end": 3.0, "text": "héllo there", "speaker": "SPEAKER_01"},
+            {"start": 4.0, "end": 5.0, "text": "no speaker"},
+            {"start": 6.0, "end": 7.0, "text": "again", "speaker": "SPEAKER_01"},
+        ],
+        "text": "héllo there no speaker again",
+    }
+    path = write_transcript(tmp_path / "segment_00000.tcol", payload)
+
+    assert read_transcript(path) == payload
+    meta, count = read_transcript_meta(path)
+    assert meta["duration"] == 300.0 and count == 3
+    assert inspect_transcript(path) == (300.0, "transcribed")
+
+
+def test_load_day_columns_merges_json_and_columnar(tmp_path):
+    (tmp_path / "segment_00000.json").write_text(
+        json.dumps({"segments": [{"start": 10, "end": 12, "text": "first", "speaker": "B"}]}),
+        encoding="utf-8",
+    )
+    write_transcript(
+        tmp_path / "segment_00001.tcol",
+        {"segments": [{"start": 2, "end": 3, "text": "third", "speaker": "A"}, {"start": 0, "end": 1, "text": "second"}]},
+    )
+
+    day = load_day_columns([tmp_path / "segment_00001.tcol", tmp_path / "segment_00000.json"], segment_seconds=60)
+
+    assert day.starts.tolist() == [10.0, 60.0, 62.0]
+    assert [day.text(i) for i in range(len(day))] == ["first", "second", "third"]
+    assert [day.speakers[i] if i >= 0 else None for i in day.speaker_ids.tolist()] == ["B", None, "A"]
+    assert [day.sources[i] for i in day.source_ids.tolist()] == ["segment_00000.json", "segment_00001.tcol", "segment_00001.tcol"]
+
+
+def test_zstd_without_zstandard_fails_at_config_load(monkeypatch):
+    import importlib.util
+
+    import pytest
+
+    from office_recorder import config as config_module
+
+    monkeypatch.setenv("OFFICE_RECORDER_TRANSCRIPT_COMPRESSION", "zstd")
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(RuntimeError, match="zstandard"):
+        config_module.load_config()
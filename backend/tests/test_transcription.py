@@ -0,0 +1,154 @@
+from dataclasses import replace
+import wave
+
+import numpy as np
+
+from office_recorder.config import load_config
+from office_recorder.storage import Storage
+from office_recorder.transcript_store import read_transcript
+from office_recorder.transcription import Transcriber, pending_transcripts, transcribe_day, transcribe_pool
+
+DAY = "2026-03-02"
+
+# Stands in for faster-whisper in this process and in spawned pool workers.
+_STUB_WHISPER = '''
+import os
+
+
+class _Segment:
+    def __init__(self, text):
+        self.start, self.end, self.text = 0.0, 1.0, text
+
+
+class _Info:
+    language = "en"
+    duration = 1.0
+
+
+class WhisperModel:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def transcribe(self, audio, **kwargs):
+        return iter([_Segment(f" worker {os.getpid()}")]), _Info()
+'''
+
+
+def _write_segments(storage, count):
+    audio_dir = storage.get_day(DAY).audio_dir
+    tone = (np.sin(np.linspace(0, 400, 16000)) * 8000).astype("<i2")
+    for index in range(count):
+        with wave.open(str(audio_dir / f"segment_{index:05d}.wav"), "wb") as handle:
+            handle.setnchannels(1)
+            handle.setsampwidth(2)
+            handle.setframerate(16000)
+            handle.writeframes(tone.tobytes())
+
+
+def test_pool_writes_one_transcript_per_file(tmp_path, monkeypatch):
+    (tmp_path / "faster_whisper.py").write_text(_STUB_WHISPER)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    config = replace(load_config(), data_dir=tmp_path / "data", silence_skip_enabled=False, trace_enabled=False)
+    storage = Storage(config.data_dir)
+    _write_segments(storage, 4)
+
+    progress = []
+    written = transcribe_day(
+        storage, Transcriber(config), DAY, workers=2, progress=lambda done, total: progress.append((done, total))
+    )
+
+    assert [path.stem for path in written] == [f"segment_{index:05d}" for index in range(4)]
+    assert progress[0] == (0, 4) and progress[-1] == (4, 4)
+    texts = {read_transcript(path)["text"] for path in written}
+    assert all(text.startswith("worker ") for text in texts)
+    # A second run finds every transcript in place and does nothing.
+    assert transcribe_day(storage, Transcriber(config), DAY, workers=2) == []
+
+
+def test_throttled_pool_pauses_and_respects_limit(tmp_path, monkeypatch):
+    (tmp_path / "faster_whisper.py").write_text(_STUB_WHISPER)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    config = replace(load_config(), data_dir=tmp_path / "data", silence_skip_enabled=False, trace_enabled=False)
+    storage = Storage(config.data_dir)
+    _write_segments(storage, 3)
+
+    recording = [True]
+    running_seen = []
+    pauses = []
+
+    def limit(running):
+        running_seen.append(running)
+        return 0 if recording[0] else 1
+
+    def paused(done, total):
+        pauses.append((done, total))
+        recording[0] = False
+
+    jobs = pending_transcripts(storage, DAY, config.transcript_format)
+    written = transcribe_pool(config, jobs, workers=2, diarize=False, limit=limit, paused=paused)
+
+    assert [path.stem for path in written] == [f"segment_{index:05d}" for index in range(3)]
+    assert pauses == [(0, 3)]
+    # With a limit of one, a segment is only submitted once the previous one is done.
+    assert max(running_seen) == 0
+
+
+_STUB_WHISPERX = '''
+class DiarizationPipeline:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, audio):
+        return [{"start": 0.0, "end": 1.0, "speaker": "SPEAKER_00"}]
+'''
+
+
+def test_tight_budget_transcribes_then_diarizes_without_reloading(tmp_path, monkeypatch):
+    from office_recorder import model_manager
+    from office_recorder.diarization import Diarizer
+    from office_recorder.model_manager import ModelManager
+
+    (tmp_path / "faster_whisper.py").write_text(_STUB_WHISPER)
+    (tmp_path / "whisperx.py").write_text(_STUB_WHISPERX)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(model_manager, "_rss_bytes", lambda: None)
+    config = replace(
+        load_config(),
+        data_dir=tmp_path / "data",
+        silence_skip_enabled=False,
+        trace_enabled=False,
+        transcribe_model="small",
+        diarization_enabled=True,
+        diarization_backend="whisperx",
+    )
+    storage = Storage(config.data_dir)
+    _write_segments(storage, 3)
+    # Room for either model (~1000 MB Whisper, ~1500 MB diarization) but not both.
+    models = ModelManager(budget_bytes=2000 * 1024 * 1024)
+    transcriber = Transcriber(config, models=models)
+    diarizer = Diarizer(config, models=models)
+
+    progress = []
+    written = transcribe_day(
+        storage, transcriber, DAY, diarizer, progress=lambda done, total: progress.append((done, total))
+    )
+
+    assert len(written) == 3 and progress[-1] == (6, 6)
+    loads = {entry["name"]: entry["loads"] for entry in models.status()["models"]}
+    assert loads == {transcriber.model_key: 1, "diarization": 1}
+    for path in written:
+        transcript = read_transcript(path)
+        assert transcript["diarization"]["enabled"] and transcript["diarization"].get("status") != "pending"
+        assert transcript["segments"][0]["speaker"] == "SPEAKER_00"
+
+
+def test_pending_transcripts_leave_out_claimed_and_skipped_audio(tmp_path):
+    from office_recorder import transcription
+
+    storage = Storage(tmp_path)
+    _write_segments(storage, 3)
+    first, second, last = storage.list_audio_files(DAY)
+    with transcription._claimed([(first, tmp_path / "unused.json")]):
+        pending = pending_transcripts(storage, DAY, "json", skip={last})
+    assert [audio for audio, _ in pending] == [second]
+    assert len(pending_transcripts(storage, DAY, "json")) == 3
@@ -33,13 +33,16 @@ case "$CMD" in
       -H "Content-Type: application/json" \
       -d '{"send_to_openclaw": false}'
     ;;
+  jobs)
+    curl -sS "$BASE_URL/api/jobs"
+    ;;
   send-summary)
     curl -sS -X POST "$BASE_URL/api/day/$DATE/summarize" \
       -H "Content-Type: application/json" \
       -d '{"send_to_openclaw": true}'
     ;;
   *)
-    echo "Usage: office_recorder_ctl.sh {start|stop|status|schedule-status|transcribe|summarize|pipeline|send-summary} [YYYY-MM-DD]" >&2
+    echo "Usage: office_recorder_ctl.sh {start|stop|status|schedule-status|transcribe|summarize|pipeline|jobs|send-summary} [YYYY-MM-DD]" >&2
     exit 1
     ;;
 esac